@@ -7,12 +7,24 @@ from datetime import datetime
 from os import makedirs
 from os.path import join, exists
 
+from data.dataset_catalog import DatasetCatalog, use_dataset_catalog
+from data.entity_registry import EntityRegistry, use_entity_registry
+from data.misuse_version_index import MisuseVersionIndex, use_misuse_version_index
+from data.snippet_cache import SnippetCache, use_snippet_cache
+from data.snippets import use_java_method_index
 from requirements import RequirementsCheck
-from tasks.configurations.configurations import get_task_configuration
+from tasks.configurations.configurations import get_task_configuration, get_pipeline_stages, get_expected_runtime
+from tasks.run_journal import RunJournal, get_journal_file_name
+from tasks.run_progress import RunProgress
+from tasks.staged_task_runner import StagedTaskRunner
+from tasks.task_profiler import TaskProfiler
 from tasks.task_runner import TaskRunner
 from utils import config_util, logging_colorization
 from utils.data_entity_lists import DataEntityLists
+from utils.data_filter import DataFilter
 from utils.dataset_util import get_white_list
+from utils.io import yaml_cache
+from utils.misuse_query import MisuseQuery, select_misuse_ids
 
 
 class Benchmark:
@@ -30,14 +42,76 @@ class Benchmark:
             for dataset in config.datasets:
                 white_list.extend(get_white_list(config.datasets_file_path, dataset))
 
+        self.white_list = white_list
+        self.black_list = black_list
         self.data_entity_lists = DataEntityLists(white_list, black_list)
 
     def run(self) -> None:
         RequirementsCheck()
+        catalog = DatasetCatalog(self.config.data_path, join(self.config.checkouts_path, "dataset-catalog.sqlite"))
+        use_dataset_catalog(catalog.open())
+        use_entity_registry(EntityRegistry())
+        use_misuse_version_index(MisuseVersionIndex())
+        snippet_cache = None
+        if 'no_snippet_cache' in self.config and not self.config.no_snippet_cache:
+            snippet_cache = SnippetCache(join(self.config.checkouts_path, "snippet-cache.sqlite"))
+        use_snippet_cache(snippet_cache)
+        use_java_method_index('java_method_index' in self.config and self.config.java_method_index)
+        if 'where' in self.config and self.config.where is not None:
+            if not self.__select_misuses(self.config.where):
+                return
+
         task_configuration = get_task_configuration(self.config)
         initial_parameters = [self.data_entity_lists]
-        runner = TaskRunner(task_configuration)
+        profiler = None
+        if 'profile' in self.config and self.config.profile is not None:
+            report_path = join(LOG_DIR, datetime.now().strftime("profile_%Y%m%d_%H%M%S"))
+            profiler = TaskProfiler(report_path, self.config.profile)
+
+        if 'plan' in self.config and self.config.plan:
+            # planning only stats files, and it collects the plan in this process
+            TaskRunner(task_configuration).run(*initial_parameters)
+            return
+
+        journal = None
+        if 'resume' in self.config:
+            journal_path = join(LOG_DIR, "journals", get_journal_file_name(sys.argv[1:]))
+            journal = RunJournal(journal_path, self.config.resume)
+
+        progress = None
+        if 'progress' in self.config and (self.config.progress or self.config.status_file):
+            progress = RunProgress(task_configuration, self.config.status_file, self.config.progress,
+                                   get_expected_runtime(self.config), self.__get_parallelism())
+
+        if 'pipeline' in self.config and self.config.pipeline is not None:
+            stages = get_pipeline_stages(dict(self.config.pipeline))
+            runner = StagedTaskRunner(task_configuration, stages, profiler=profiler, journal=journal, progress=progress)
+        else:
+            jobs = self.config.jobs if 'jobs' in self.config else 1
+            runner = TaskRunner(task_configuration, jobs, profiler, journal, progress)
         runner.run(*initial_parameters)
+        logging.getLogger("benchmark").debug("YAML cache: %d hit(s), %d miss(es)", yaml_cache.hits, yaml_cache.misses)
+        if snippet_cache is not None:
+            snippet_cache.flush()
+            logging.getLogger("benchmark").debug("Snippet cache: %d hit(s), %d miss(es)", snippet_cache.hits,
+                                                 snippet_cache.misses)
+
+    def __select_misuses(self, query: MisuseQuery) -> bool:
+        data_filter = DataFilter(self.white_list, self.black_list)
+        misuse_ids = [misuse_id for misuse_id in select_misuse_ids(query, self.config.data_path)
+                      if not data_filter.is_filtered(misuse_id)]
+        if not misuse_ids:
+            logging.getLogger("benchmark").warning("No misuse matches `%s`.", query)
+            return False
+
+        logging.getLogger("benchmark").info("Selected %d misuse(s) matching `%s`.", len(misuse_ids), query)
+        self.data_entity_lists = DataEntityLists(misuse_ids, self.black_list)
+        return True
+
+    def __get_parallelism(self) -> int:
+        if 'pipeline' in self.config and self.config.pipeline:
+            return max(concurrency for _, concurrency in self.config.pipeline)
+        return self.config.jobs if 'jobs' in self.config else 1
 
 
 config = config_util.get_config(sys.argv)
@@ -1,13 +1,22 @@
 from os.path import join, dirname, basename, splitext
+from sys import intern
 
 
 class CorrectUsage:
+    __slots__ = ["basepath", "__relative_correct_usage_path", "path"]
+
     def __init__(self, basepath: str, relative_correct_usage_path: str):
-        self.basepath = basepath
+        self.basepath = intern(basepath)
         self.__relative_correct_usage_path = relative_correct_usage_path
         self.path = join(basepath, relative_correct_usage_path)
-        self.orig_dir = dirname(self.path)
-        self.name = splitext(basename(self.__relative_correct_usage_path))[0]
+
+    @property
+    def orig_dir(self) -> str:
+        return dirname(self.path)
+
+    @property
+    def name(self) -> str:
+        return splitext(basename(self.__relative_correct_usage_path))[0]
 
     def __hash__(self):
         return hash(self.path)
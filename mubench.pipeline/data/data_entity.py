@@ -0,0 +1,35 @@
+from os import stat
+from typing import List, Optional, Union
+
+from data.misuse import Misuse
+from data.project import Project
+from data.project_version import ProjectVersion
+
+DataEntity = Union[Project, ProjectVersion, Misuse]
+
+
+def find_data_entity(results: List) -> Optional[DataEntity]:
+    """
+    Returns the most specific project, version, or misuse among the given results.
+    """
+    for result in reversed(results):
+        if isinstance(result, (Misuse, ProjectVersion, Project)):
+            return result
+    return None
+
+
+def get_data_entity_file(entity: DataEntity) -> str:
+    if isinstance(entity, Misuse):
+        return entity.misuse_file
+    if isinstance(entity, ProjectVersion):
+        return entity.version_file
+    # noinspection PyProtectedMember
+    return entity._project_file
+
+
+def get_data_entity_file_stat(entity: DataEntity) -> str:
+    try:
+        file_stat = stat(get_data_entity_file(entity))
+        return "{}:{}".format(file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        return "-"
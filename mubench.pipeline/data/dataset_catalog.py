@@ -0,0 +1,191 @@
+import logging
+import pickle
+import sqlite3
+from contextlib import closing
+from os import scandir, sep, stat
+from os.path import abspath, join, relpath, exists, isdir
+from sys import intern
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+from utils.io import read_yaml, create_file_path
+
+# the modification time and size of a file, which identify its content without reading it
+FileStamp = Tuple[int, int]
+
+_active_catalog = None  # type: Optional[DatasetCatalog]
+
+
+class DatasetCatalog:
+    """
+    Keeps the parsed content of all `project.yml`, `version.yml`, and `misuse.yml` files of the dataset in a single
+    SQLite file, such that runs load the metadata at once instead of parsing each YAML file. On opening, the catalog
+    compares the modification time and size of every metadata file with the ones recorded when the file was parsed,
+    parses only the files that were added or changed, and drops the files that were deleted. The same traversal of the
+    dataset indexes the correct usages of all misuses.
+    """
+
+    __PROJECT_FILE = "project.yml"
+    __VERSION_FILE = "version.yml"
+    __MISUSE_FILE = "misuse.yml"
+    __CORRECT_USAGES_DIR = "correct-usages"
+
+    def __init__(self, data_path: str, catalog_file_path: str):
+        self.data_path = abspath(data_path)
+        self.catalog_file_path = catalog_file_path
+        self.logger = logging.getLogger("data.catalog")
+        self.__entries = {}  # type: Dict[str, Tuple[FileStamp, bytes]]
+        self.__correct_usage_files = {}  # type: Dict[str, List[str]]
+
+    def open(self) -> 'DatasetCatalog':
+        self.__entries = self.__load()
+
+        self.__correct_usage_files = {}
+        stamps = dict(self.__scan_dataset())
+        changed_files = [file for file, stamp in stamps.items()
+                         if file not in self.__entries or self.__entries[file][0] != stamp]
+
+        for file in changed_files:
+            try:
+                content = read_yaml(join(self.data_path, file))
+            except yaml.YAMLError:
+                # the entities read the file themselves and report the error where it matters
+                stamps.pop(file)
+                continue
+            self.__entries[file] = (stamps[file], pickle.dumps(content, pickle.HIGHEST_PROTOCOL))
+        changed_files = [file for file in changed_files if file in stamps]
+        removed_files = [file for file in self.__entries if file not in stamps]
+        for file in removed_files:
+            del self.__entries[file]
+
+        if changed_files or removed_files:
+            self.logger.debug("Updating dataset catalog: %d file(s) parsed, %d file(s) removed",
+                              len(changed_files), len(removed_files))
+            self.__save(changed_files, removed_files)
+        return self
+
+    def get(self, file_path: str) -> Optional[Any]:
+        """The parsed content of the given metadata file, or `None`, if the catalog does not contain the file."""
+        file = self.__get_key(file_path)
+        if file is None or file not in self.__entries:
+            return None
+        # a fresh copy per call, since the entities may modify their data
+        return _intern_keys(pickle.loads(self.__entries[file][1]))
+
+    def get_correct_usage_files(self, correct_usage_path: str) -> Optional[List[str]]:
+        """The paths of the correct-usage files relative to the given path, or `None`, if the catalog does not index
+        the path."""
+        return self.__correct_usage_files.get(self.__get_key(correct_usage_path), None)
+
+    def __contains__(self, file_path: str) -> bool:
+        return self.__get_key(file_path) in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __get_key(self, file_path: str) -> Optional[str]:
+        file_path = abspath(file_path)
+        if not file_path.startswith(self.data_path + sep):
+            return None
+        return relpath(file_path, self.data_path)
+
+    def __scan_dataset(self) -> Iterator[Tuple[str, FileStamp]]:
+        if not exists(self.data_path):
+            return
+        for project_entry in _scan_directories(self.data_path):
+            yield from _find_file(project_entry.path, DatasetCatalog.__PROJECT_FILE, self.data_path)
+            for version_entry in _scan_directories(join(project_entry.path, "versions")):
+                yield from _find_file(version_entry.path, DatasetCatalog.__VERSION_FILE, self.data_path)
+            for misuse_entry in _scan_directories(join(project_entry.path, "misuses")):
+                yield from _find_file(misuse_entry.path, DatasetCatalog.__MISUSE_FILE, self.data_path)
+                correct_usage_path = join(misuse_entry.path, DatasetCatalog.__CORRECT_USAGES_DIR)
+                self.__correct_usage_files[relpath(correct_usage_path, self.data_path)] = \
+                    find_correct_usage_files(correct_usage_path)
+
+    def __load(self) -> Dict[str, Tuple[FileStamp, bytes]]:
+        if not exists(self.catalog_file_path):
+            return {}
+        try:
+            with closing(self.__connect()) as connection:
+                rows = connection.execute("SELECT path, mtime, size, content FROM files").fetchall()
+            return {path: ((mtime, size), content) for path, mtime, size, content in rows}
+        except sqlite3.DatabaseError as e:
+            self.logger.warning("Ignoring unreadable dataset catalog %s: %s", self.catalog_file_path, e)
+            return {}
+
+    def __save(self, changed_files, removed_files):
+        create_file_path(self.catalog_file_path)
+        try:
+            with closing(self.__connect()) as connection, connection:
+                connection.executemany("INSERT OR REPLACE INTO files (path, mtime, size, content) VALUES (?, ?, ?, ?)",
+                                       [(file, self.__entries[file][0][0], self.__entries[file][0][1],
+                                         self.__entries[file][1]) for file in changed_files])
+                connection.executemany("DELETE FROM files WHERE path = ?", [(file,) for file in removed_files])
+        except sqlite3.DatabaseError as e:
+            # the catalog is only a cache, the next run parses the files again
+            self.logger.warning("Failed to update dataset catalog %s: %s", self.catalog_file_path, e)
+
+    def __connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.catalog_file_path)
+        connection.execute("CREATE TABLE IF NOT EXISTS files "
+                           "(path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, content BLOB)")
+        return connection
+
+
+def _scan_directories(path: str):
+    if not exists(path):
+        return []
+    return sorted((entry for entry in scandir(path) if entry.is_dir()), key=lambda entry: entry.name)
+
+
+def _find_file(directory: str, file_name: str, data_path: str) -> Iterator[Tuple[str, FileStamp]]:
+    file_path = join(directory, file_name)
+    try:
+        file_stat = stat(file_path)
+    except FileNotFoundError:
+        return
+    yield relpath(file_path, data_path), (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def _intern_keys(data):
+    # all entities share the same few keys, which would otherwise take most of the memory of their metadata
+    if isinstance(data, dict):
+        return {intern(key) if isinstance(key, str) else key: _intern_keys(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_intern_keys(value) for value in data]
+    return data
+
+
+def find_correct_usage_files(correct_usage_path: str) -> List[str]:
+    """Finds the Java files below the given path in a single traversal and returns their paths relative to it."""
+    files = []
+    directories = [("", correct_usage_path)] if isdir(correct_usage_path) else []
+    while directories:
+        relative_path, path = directories.pop()
+        for entry in scandir(path):
+            if entry.is_dir():
+                directories.append((join(relative_path, entry.name), entry.path))
+            elif entry.name.endswith(".java") and not entry.name.startswith("."):
+                files.append(join(relative_path, entry.name))
+    return sorted(files)
+
+
+def use_dataset_catalog(catalog: Optional[DatasetCatalog]):
+    """Makes the data entities read their metadata from the given catalog, or from the YAML files, if `None`."""
+    global _active_catalog
+    _active_catalog = catalog
+
+
+def read_dataset_yaml(file_path: str) -> Any:
+    if _active_catalog is not None and file_path in _active_catalog:
+        return _active_catalog.get(file_path)
+    return read_yaml(file_path)
+
+
+def read_correct_usage_files(correct_usage_path: str) -> List[str]:
+    if _active_catalog is not None:
+        files = _active_catalog.get_correct_usage_files(correct_usage_path)
+        if files is not None:
+            return files
+    return find_correct_usage_files(correct_usage_path)
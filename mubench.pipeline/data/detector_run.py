@@ -1,4 +1,5 @@
 import time
+from contextlib import contextmanager
 from enum import Enum
 from logging import Logger
 from os import makedirs
@@ -10,6 +11,7 @@ from data.finding import Finding
 from data.project_version import ProjectVersion
 from tasks.configurations.detector_interface_configuration import key_findings_file, key_run_file
 from utils.io import write_yaml, remove_tree, read_yaml_if_exists, open_yamls_if_exists
+from utils.memory_budget import MemoryBudget, get_max_heap_size
 from utils.shell import CommandFailedError
 
 
@@ -23,10 +25,13 @@ class DetectorRun:
     __FINDINGS_FILE = "findings.yml"
     __RUN_FILE = "run.yml"
 
-    def __init__(self, detector: Detector, version: ProjectVersion, findings_path: str):
+    def __init__(self, detector: Detector, version: ProjectVersion, findings_path: str,
+                 memory_budget: Optional[MemoryBudget] = None):
         self.detector = detector
         self.version = version
         self.findings_path = findings_path
+        self.memory_budget = memory_budget
+        self.expected_runtime = 0
         self.__FINDINGS = None
         self.__POTENTIAL_HITS = None
         self.__RUN_INFO = None
@@ -73,17 +78,17 @@ class DetectorRun:
 
     def ensure_executed(self, detector_args: Dict[str, str], timeout: Optional[int], force_detect: bool,
                         current_timestamp: int, compile_timestamp: int, logger: Logger) -> None:
-        if self.is_outdated(compile_timestamp) or force_detect:
-            pass
-        elif self.is_failure():
-            logger.info("Error in previous {}. Skipping.".format(str(self)))
-            logger.debug("Full exception:", exc_info=True)
-            return
-        elif self.is_success():
-            logger.info("Detector reported %s findings in previous %s. Skipping.", len(self.findings), self)
+        if not self.needs_execution(force_detect, compile_timestamp):
+            if self.is_failure():
+                logger.info("Error in previous {}. Skipping.".format(str(self)))
+                logger.debug("Full exception:", exc_info=True)
+            else:
+                logger.info("Detector reported %s findings in previous %s. Skipping.", len(self.findings), self)
             return
 
+        expected_runtime = self.__get_expected_runtime()
         self.reset()
+        self.expected_runtime = expected_runtime
 
         logger.info("Running '%s' on %s ... (%s)", self.detector, self.version, time.strftime("%H:%M"))
 
@@ -100,7 +105,31 @@ class DetectorRun:
         else:
             logger.info("Detector reported %s findings.", len(self.findings))
 
+    def __get_expected_runtime(self) -> float:
+        try:
+            return float(self.runtime)
+        except (TypeError, ValueError):
+            return 0
+
     def _execute(self, detector_args: Dict[str, str], timeout: Optional[int], current_timestamp: int, logger: Logger):
+        with self.__reserve_memory(logger):
+            self.__execute(detector_args, timeout, current_timestamp, logger)
+
+    @contextmanager
+    def __reserve_memory(self, logger: Logger):
+        if not self.memory_budget:
+            yield
+            return
+
+        heap_size = get_max_heap_size(self.detector.runner_interface.java_options)
+        logger.debug("Waiting for %d bytes of memory to run '%s' on %s ...", heap_size, self.detector, self.version)
+        self.memory_budget.acquire(heap_size, self.expected_runtime)
+        try:
+            yield
+        finally:
+            self.memory_budget.release(heap_size)
+
+    def __execute(self, detector_args: Dict[str, str], timeout: Optional[int], current_timestamp: int, logger: Logger):
         start = time.time()
         message = ""
         try:
@@ -161,7 +190,7 @@ class DetectorRun:
     def reset(self):
         remove_tree(self.findings_path)
         makedirs(self.findings_path, exist_ok=True)
-        DetectorRun.__init__(self, self.detector, self.version, self.findings_path)
+        DetectorRun.__init__(self, self.detector, self.version, self.findings_path, self.memory_budget)
 
     def is_success(self):
         return self.result == Result.success
@@ -175,6 +204,11 @@ class DetectorRun:
     def is_failure(self):
         return self.is_error() or self.is_timeout()
 
+    def needs_execution(self, force_detect: bool, compile_timestamp: int) -> bool:
+        if force_detect or self.is_outdated(compile_timestamp):
+            return True
+        return not (self.is_failure() or self.is_success())
+
     def is_outdated(self, compile_timestamp: int):
         return self._is_outdated_detector() or self._newer_compile(compile_timestamp)
 
@@ -0,0 +1,51 @@
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+T = TypeVar('T')
+
+_active_registry = None  # type: Optional[EntityRegistry]
+
+
+class EntityRegistry:
+    """
+    Identity map of the projects, project versions, and misuses of a run, such that each of them exists only once with
+    its parsed metadata, no matter how many versions and misuses refer to the same project. Invalidating an entity makes
+    the next lookup create it anew, which reads its metadata again.
+    """
+
+    def __init__(self):
+        self.__entities = {}  # type: Dict[Tuple[type, Tuple], Any]
+        self.__lock = Lock()
+
+    def get(self, entity_type: Type[T], *args) -> T:
+        key = (entity_type, args)
+        entity = self.__entities.get(key, None)
+        if entity is None:
+            # create outside the lock, since entities look up the entities they refer to on creation
+            new_entity = entity_type(*args)
+            with self.__lock:
+                entity = self.__entities.setdefault(key, new_entity)
+        return entity
+
+    def invalidate(self, entity: Any):
+        with self.__lock:
+            self.__entities = {key: value for key, value in self.__entities.items() if value is not entity}
+
+    def clear(self):
+        with self.__lock:
+            self.__entities = {}
+
+    def __len__(self):
+        return len(self.__entities)
+
+
+def use_entity_registry(registry: Optional[EntityRegistry]):
+    """Makes the data entities share the entities they refer to through the given registry, if not `None`."""
+    global _active_registry
+    _active_registry = registry
+
+
+def get_entity(entity_type: Type[T], *args) -> T:
+    if _active_registry is None:
+        return entity_type(*args)
+    return _active_registry.get(entity_type, *args)
@@ -1,7 +1,7 @@
 from typing import Dict, List
 
 from data.misuse import Misuse
-from data.snippets import get_snippets, Snippet
+from data.snippets import get_snippets, get_snippets_batch, Snippet
 
 
 class Finding(Dict[str, str]):
@@ -45,10 +45,8 @@ class Finding(Dict[str, str]):
         if self.__startline() < 0:
             return True
 
-        snippets = misuse.get_snippets(source_base_paths)
-        for snippet in snippets:
-            snippet_last_line_number = snippet.first_line_number + snippet.code.count("\n")
-            if snippet.first_line_number < self.__startline() < snippet_last_line_number:
+        for first_line_number, last_line_number in misuse.get_snippet_line_ranges(source_base_paths):
+            if first_line_number < self.__startline() < last_line_number:
                 return True
 
         return False
@@ -61,3 +59,9 @@ class Finding(Dict[str, str]):
 
     def get_snippets(self, source_base_paths: List[str]) -> List[Snippet]:
         return get_snippets(source_base_paths, self.__file(), self.__method(), self.__startline())
+
+    @staticmethod
+    def get_snippets_batch(findings: List['Finding'], source_base_paths: List[str]) -> List[List[Snippet]]:
+        """Returns the snippets of each of the findings, parsing each source file only once."""
+        return get_snippets_batch(source_base_paths, [(finding.__file(), finding.__method(), finding.__startline())
+                                                      for finding in findings])
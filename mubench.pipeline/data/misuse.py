@@ -1,16 +1,17 @@
-import os
-from glob import glob
-from os.path import isdir, isfile, join
-from typing import Set, List
+from os.path import isfile, join
+from sys import intern
+from typing import Set, List, Tuple, Dict, Union
 
-import yaml
-
-from data.misuse_compile import MisuseCompile
 from data.correct_usage import CorrectUsage
-from data.snippets import get_snippets, Snippet
+from data.dataset_catalog import read_dataset_yaml, read_correct_usage_files
+from data.entity_registry import get_entity
+from data.misuse_compile import MisuseCompile
+from data.snippets import get_snippets, Snippet, SnippetUnavailableException
 
 
 class Location:
+    __slots__ = ["file", "method", "line"]
+
     def __init__(self, file: str, method: str, line: int):
         self.file = file
         self.method = method
@@ -24,6 +25,8 @@ class Location:
 
 
 class Fix:
+    __slots__ = ["description", "commit", "revision"]
+
     def __init__(self, description: str, commit: str, revision: str):
         self.description = description
         self.commit = commit
@@ -33,46 +36,78 @@ class Fix:
 class Misuse:
     MISUSE_FILE = "misuse.yml"
 
+    # keeps large datasets small in memory, a misuse keeps only the fields of its metadata that the pipeline reads
+    __slots__ = ["_base_path", "project_id", "version_id", "misuse_id", "id", "__project", "path", "_YAML",
+                 "_CORRECT_USAGES", "__is_loaded", "__location", "__fix", "__description", "__is_crash", "__source",
+                 "__apis", "__is_apis_are_internal", "__violations", "__snippet_line_ranges"]
+
     @staticmethod
     def is_misuse(path: str) -> bool:
         return isfile(join(path, Misuse.MISUSE_FILE))
 
     def __init__(self, base_path: str, project_id: str, version_id: str, misuse_id: str):
-        self._base_path = base_path
-        self.project_id = project_id
-        self.version_id = version_id
+        # the ids and base path are shared by all misuses of a project
+        self._base_path = intern(base_path)
+        self.project_id = intern(project_id)
+        self.version_id = intern(version_id)
         self.misuse_id = misuse_id
         self.id = "{}.{}.{}".format(project_id, version_id, misuse_id).lower()
 
         from data.project import Project
-        self.__project = Project(base_path, project_id)
+        self.__project = get_entity(Project, base_path, project_id)
 
         self.path = join(self.__project.path, Project.MISUSES_DIR, misuse_id)
-        self.misuse_file = join(self.path, Misuse.MISUSE_FILE)
 
+        self._YAML = None
+        self._CORRECT_USAGES = []
+
+        self.__is_loaded = False
         self.__location = None
         self.__fix = None
+        self.__description = None
+        self.__is_crash = None
+        self.__source = None
+        self.__apis = None
+        self.__is_apis_are_internal = None
+        self.__violations = None
+        self.__snippet_line_ranges = None
 
-        self._YAML = None
-        self._CORRECT_USAGES = []
+    @property
+    def misuse_file(self) -> str:
+        return join(self.path, Misuse.MISUSE_FILE)
 
     @property
     def _yaml(self):
-        if self._YAML is None:
-            with open(self.misuse_file, 'r') as stream:
-                self._YAML = yaml.load(stream)
-        return self._YAML
+        # the entire metadata is read anew on each access, since only the dataset check needs more than the fields
+        if self._YAML is not None:
+            return self._YAML
+        return read_dataset_yaml(self.misuse_file)
+
+    def __load(self):
+        if self.__is_loaded:
+            return
+
+        yaml = self._yaml
+        location = yaml.get("location")
+        if location is not None:
+            self.__location = Location(location.get("file", ""), location.get("method", ""), location.get("line", -1))
+        fix = yaml.get("fix", {})
+        self.__fix = Fix(fix.get("description", ""), fix.get("commit", ""), str(fix.get("revision", "")))
+        self.__description = yaml.get("description", "")
+        self.__is_crash = yaml.get("crash")
+        source = yaml.get("source", None)
+        self.__source = source.get("name", None) if source is not None else None
+        self.__apis = _intern_all(yaml.get("api", []))
+        self.__is_apis_are_internal = yaml.get("internal", False)
+        self.__violations = _intern_all(yaml.get("violations", []))
+        self.__is_loaded = True
 
     @property
     def correct_usages(self) -> Set[CorrectUsage]:
         if not self._CORRECT_USAGES:
             correct_usage_path = self.correct_usage_path
-            if isdir(correct_usage_path):
-                self._CORRECT_USAGES = set(
-                    [CorrectUsage(correct_usage_path, y[len(correct_usage_path) + 1:]) for x in os.walk(correct_usage_path) for y in
-                     glob(os.path.join(x[0], '*.java'))])
-            else:
-                self._CORRECT_USAGES = set()
+            self._CORRECT_USAGES = set([CorrectUsage(correct_usage_path, file)
+                                        for file in read_correct_usage_files(correct_usage_path)])
 
         return self._CORRECT_USAGES
 
@@ -82,58 +117,73 @@ class Misuse:
 
     @property
     def location(self) -> Location:
-        if not self.__location:
-            location = self._yaml["location"]
-            self.__location = Location(location.get("file", ""), location.get("method", ""), location.get("line", -1))
+        self.__load()
+        if self.__location is None:
+            raise KeyError("location")
         return self.__location
 
     @property
     def description(self) -> str:
-        if getattr(self, '_DESCRIPTION', None) is None:
-            description = self._yaml.get("description", "")
-            self._DESCRIPTION = description
-        return self._DESCRIPTION
+        self.__load()
+        return self.__description
 
     @property
     def fix(self) -> Fix:
-        if not self.__fix:
-            fix = self._yaml.get("fix", {})
-            self.__fix = Fix(fix.get("description", ""), fix.get("commit", ""), str(fix.get("revision", "")))
+        self.__load()
         return self.__fix
 
     @property
     def is_crash(self) -> bool:
-        if getattr(self, '_IS_CRASH', None) is None:
-            self._IS_CRASH = self._yaml["crash"]
-        return self._IS_CRASH
+        self.__load()
+        if self.__is_crash is None:
+            raise KeyError("crash")
+        return self.__is_crash
 
     @property
     def source(self):
-        if getattr(self, '_source', None) is None:
-            source_key = self._yaml.get('source', None)
-            if source_key is not None:
-                self._source = source_key.get('name', None)
-        return self._source
+        self.__load()
+        return self.__source
 
     @property
     def apis(self):
-        if getattr(self, '_apis', None) is None:
-            self._apis = self._yaml.get('api', [])
-        return self._apis
+        self.__load()
+        return self.__apis
 
     @property
     def is_apis_are_internal(self):
-        return self._yaml.get('internal', False)
+        self.__load()
+        return self.__is_apis_are_internal
 
     @property
     def violations(self):
-        if getattr(self, '_violations', None) is None:
-            self._violations = self._yaml.get('violations', [])
-        return self._violations
+        self.__load()
+        return self.__violations
 
     def get_snippets(self, source_base_paths: List[str]) -> List[Snippet]:
         return get_snippets(source_base_paths, self.location.file, self.location.method, self.location.line)
 
+    def get_snippet_line_ranges(self, source_base_paths: List[str]) -> List[Tuple[int, int]]:
+        """
+        The first and last line numbers of the snippets of this misuse. Extracts the snippets only once per source base
+        paths, i.e., once per version compile, no matter how many findings are matched against them.
+        """
+        if self.__snippet_line_ranges is None:
+            self.__snippet_line_ranges = {}  # type: Dict[Tuple[str, ...], Union[List[Tuple[int, int]], Exception]]
+
+        key = tuple(source_base_paths)
+        line_ranges = self.__snippet_line_ranges.get(key)
+        if line_ranges is None:
+            try:
+                line_ranges = [(snippet.first_line_number, snippet.first_line_number + snippet.code.count("\n"))
+                               for snippet in self.get_snippets(source_base_paths)]
+            except SnippetUnavailableException as e:
+                line_ranges = e
+            self.__snippet_line_ranges[key] = line_ranges
+
+        if isinstance(line_ranges, Exception):
+            raise line_ranges
+        return line_ranges
+
     def get_misuse_compile(self, base_path: str) -> MisuseCompile:
         return MisuseCompile(join(base_path, self.project_id, "misuses", self.misuse_id), self.correct_usages)
 
@@ -148,3 +198,8 @@ class Misuse:
 
     def __ne__(self, other):
         return not self.__eq__(other)
+
+
+def _intern_all(values):
+    # many misuses share the same APIs and violations
+    return [intern(value) if isinstance(value, str) else value for value in values] if values else values
@@ -31,6 +31,9 @@ class MisuseCompile:
     def needs_compile(self):
         return self.correct_usages and not isdir(self.correct_usage_classes_path)
 
+    def is_outdated(self, version_compile_timestamp: int) -> bool:
+        return version_compile_timestamp > self.timestamp
+
     @property
     def timestamp(self):
         timestamp = self.__DEFAULT_TIMESTAMP
@@ -0,0 +1,60 @@
+from threading import Lock
+from typing import Dict, List, Optional, Set
+
+from data.misuse import Misuse
+from data.project import Project
+from data.project_version import ProjectVersion
+
+_active_index = None  # type: Optional[MisuseVersionIndex]
+
+
+class MisuseVersionIndex:
+    """
+    Bidirectional index between the misuses and the project versions that list them. It indexes each project once, on
+    the first lookup of one of its misuses or versions, such that later lookups neither scan the versions of the project
+    nor load their metadata again.
+    """
+
+    def __init__(self):
+        self.__versions_by_misuse = {}  # type: Dict[str, List[ProjectVersion]]
+        self.__misuses_by_version = {}  # type: Dict[str, List[Misuse]]
+        self.__indexed_projects = set()  # type: Set[str]
+        self.__lock = Lock()
+
+    def get_versions(self, project: Project, misuse: Misuse) -> List[ProjectVersion]:
+        self.__ensure_indexed(project)
+        return self.__versions_by_misuse.get(misuse.path, [])
+
+    def get_misuses(self, project: Project, version: ProjectVersion) -> List[Misuse]:
+        self.__ensure_indexed(project)
+        return self.__misuses_by_version.get(version.id, [])
+
+    def __ensure_indexed(self, project: Project):
+        if project.path in self.__indexed_projects:
+            return
+
+        # load the metadata outside the lock, other threads may index other projects meanwhile
+        versions_by_misuse = {}
+        misuses_by_version = {}
+        for version in project.versions:
+            misuses_by_version[version.id] = version.misuses
+            for misuse in version.misuses:
+                versions_by_misuse.setdefault(misuse.path, []).append(version)
+
+        with self.__lock:
+            if project.path not in self.__indexed_projects:
+                self.__versions_by_misuse.update(versions_by_misuse)
+                self.__misuses_by_version.update(misuses_by_version)
+                self.__indexed_projects.add(project.path)
+
+
+def use_misuse_version_index(index: Optional[MisuseVersionIndex]):
+    """Makes the tasks share the given index, if not `None`."""
+    global _active_index
+    _active_index = index
+
+
+def get_misuse_version_index() -> MisuseVersionIndex:
+    if _active_index is None:
+        return MisuseVersionIndex()
+    return _active_index
@@ -2,8 +2,8 @@ from os import listdir
 from os.path import join, exists
 from typing import List, Dict, Any, Optional
 
-import yaml
-
+from data.dataset_catalog import read_dataset_yaml
+from data.entity_registry import get_entity
 from data.project_version import ProjectVersion
 from data.repository import Repository
 
@@ -30,9 +30,7 @@ class Project:
     @property
     def _yaml(self) -> Dict[str, Any]:
         if self._YAML is None:
-            with open(self._project_file) as project_file:
-                project_yml = yaml.load(project_file)
-            self._YAML = project_yml
+            self._YAML = read_dataset_yaml(self._project_file)
         return self._YAML
 
     @property
@@ -54,7 +52,7 @@ class Project:
     def versions(self) -> List[ProjectVersion]:
         if not self._VERSIONS:
             if exists(self._versions_path):
-                self._VERSIONS = [ProjectVersion(self._base_path, self.id, subdir) for subdir in
+                self._VERSIONS = [get_entity(ProjectVersion, self._base_path, self.id, subdir) for subdir in
                                   listdir(self._versions_path) if
                                   ProjectVersion.is_project_version(join(self._versions_path, subdir))]
         return self._VERSIONS
@@ -1,12 +1,14 @@
 from os.path import exists
 from os.path import join
+from sys import intern
 from typing import List, Optional, Any, Dict, Set
 
+from data.dataset_catalog import read_dataset_yaml
+from data.entity_registry import get_entity
 from data.misuse import Misuse, CorrectUsage
 from data.project_checkout import ProjectCheckout, GitProjectCheckout, SVNProjectCheckout, \
     SyntheticProjectCheckout, ZipProjectCheckout
 from data.version_compile import VersionCompile
-from utils.io import read_yaml
 
 
 class ProjectVersion:
@@ -18,31 +20,64 @@ class ProjectVersion:
                 '$mvn.default.test-classes': "target/test-classes/"
             }
 
+    # keeps large datasets small in memory, a version keeps only the fields of its metadata that the pipeline reads
+    __slots__ = ["_base_path", "version_id", "project_id", "id", "__project", "path", "_YAML", "_MISUSES", "_PATTERNS",
+                 "__is_loaded", "__misuse_ids", "__build", "__revision", "__md5"]
+
     def __init__(self, base_path: str, project_id: str, version_id: str):
-        self._base_path = base_path
-        self.version_id = version_id
-        self.project_id = project_id
+        self._base_path = intern(base_path)
+        self.version_id = intern(version_id)
+        self.project_id = intern(project_id)
         self.id = "{}.{}".format(project_id, version_id).lower()
 
         from data.project import Project
-        self.__project = Project(base_path, project_id)
+        self.__project = get_entity(Project, base_path, project_id)
 
         self.path = join(self.__project.path, Project.VERSIONS_DIR, version_id)
-        self.version_file = join(self.path, ProjectVersion.VERSION_FILE)  # type: str
-        self._misuses_dir = join(self.__project.path, Project.MISUSES_DIR)  # type: str
         self._YAML = None
         self._MISUSES = None
         self._PATTERNS = None
 
+        self.__is_loaded = False
+        self.__misuse_ids = None
+        self.__build = None
+        self.__revision = None
+        self.__md5 = None
+
+    @property
+    def project(self) -> 'Project':
+        return self.__project
+
     @staticmethod
     def is_project_version(path: str) -> bool:
         return exists(join(path, ProjectVersion.VERSION_FILE))
 
+    @property
+    def version_file(self) -> str:
+        return join(self.path, ProjectVersion.VERSION_FILE)
+
+    @property
+    def _misuses_dir(self) -> str:
+        from data.project import Project
+        return join(self.__project.path, Project.MISUSES_DIR)
+
     @property
     def _yaml(self) -> Dict[str, Any]:
-        if self._YAML is None:
-            self._YAML = read_yaml(self.version_file)
-        return self._YAML
+        # the entire metadata is read anew on each access, since only the dataset check needs more than the fields
+        if self._YAML is not None:
+            return self._YAML
+        return read_dataset_yaml(self.version_file)
+
+    def __load(self):
+        if self.__is_loaded:
+            return
+
+        yaml = self._yaml
+        self.__misuse_ids = [intern(misuse_id) for misuse_id in yaml.get("misuses", []) or []]
+        self.__build = yaml.get("build", {})
+        self.__revision = yaml.get("revision")
+        self.__md5 = yaml.get("md5")
+        self.__is_loaded = True
 
     def get_checkout(self, base_path: str) -> ProjectCheckout:
         repository = self.__project.repository
@@ -55,7 +90,10 @@ class ProjectVersion:
         elif repository.vcstype == "synthetic":
             return SyntheticProjectCheckout(self.__project.id, self.version_id, self.path, base_path)
         elif repository.vcstype == "zip":
-            return ZipProjectCheckout(self.__project.id, self.version_id, self.revision, self._yaml["md5"], base_path)
+            self.__load()
+            if self.__md5 is None:
+                raise KeyError("md5")
+            return ZipProjectCheckout(self.__project.id, self.version_id, self.revision, self.__md5, base_path)
         else:
             raise ValueError("unknown repository type: {}".format(repository.vcstype))
 
@@ -64,8 +102,9 @@ class ProjectVersion:
 
     @property
     def __compile_config(self):
+        self.__load()
         compile = {"src": [""], "commands": [], "classes": [""]}
-        compile.update(self._yaml.get("build", {}))
+        compile.update(self.__build)
 
         src = compile["src"]
         if type(src) == str:
@@ -94,9 +133,9 @@ class ProjectVersion:
     @property
     def misuses(self) -> List[Misuse]:
         if not self._MISUSES:
-            misuse_ids = self._yaml.get("misuses", []) or []
-            self._MISUSES = [Misuse(self._base_path, self.__project.id, self.version_id, misuse_id)
-                             for misuse_id in misuse_ids
+            self.__load()
+            self._MISUSES = [get_entity(Misuse, self._base_path, self.__project.id, self.version_id, misuse_id)
+                             for misuse_id in self.__misuse_ids
                              if Misuse.is_misuse(join(self._misuses_dir, misuse_id))]
 
         return self._MISUSES
@@ -112,9 +151,8 @@ class ProjectVersion:
 
     @property
     def revision(self) -> Optional[str]:
-        if getattr(self, '_REVISION', None) is None:
-            self._REVISION = self._yaml.get('revision')
-        return self._REVISION
+        self.__load()
+        return self.__revision
 
     @property
     def additional_compile_sources(self) -> str:
@@ -0,0 +1,72 @@
+from glob import glob
+from os import sep
+from os.path import join, relpath, dirname
+from statistics import median
+from typing import Dict, Optional, Tuple
+
+from utils.io import read_yaml_if_exists
+
+
+class RuntimeHistory:
+    """
+    Provides the detector runtimes recorded in the `run.yml` files of previous runs. The runtime of a project version
+    is the total runtime of all runs on the version and its misuses by one detector in one experiment, taking the
+    longest such total if multiple detectors or experiments ran on the version.
+    """
+
+    __RUN_FILE = "run.yml"
+
+    def __init__(self, findings_path: str):
+        self.findings_path = findings_path
+        self.__RUNTIMES = None
+        self.__MISUSE_RUNTIMES = None
+
+    def get_version_runtime(self, version_id: str) -> Optional[float]:
+        self.__ensure_loaded()
+        return self.__RUNTIMES.get(version_id.lower(), None)
+
+    def get_misuse_runtime(self, misuse_id: str) -> Optional[float]:
+        self.__ensure_loaded()
+        return self.__MISUSE_RUNTIMES.get(misuse_id.lower(), None)
+
+    def get_median_version_runtime(self) -> Optional[float]:
+        self.__ensure_loaded()
+        return median(self.__RUNTIMES.values()) if self.__RUNTIMES else None
+
+    def get_median_misuse_runtime(self) -> Optional[float]:
+        self.__ensure_loaded()
+        return median(self.__MISUSE_RUNTIMES.values()) if self.__MISUSE_RUNTIMES else None
+
+    def __ensure_loaded(self):
+        if self.__RUNTIMES is None:
+            self.__RUNTIMES, self.__MISUSE_RUNTIMES = self.__load_runtimes()
+
+    def __load_runtimes(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        runtimes_by_run = {}
+        misuse_runtimes = {}
+        # findings are stored per experiment, detector, project, version, and, optionally, misuse
+        for depth in [4, 5]:
+            pattern = join(self.findings_path, *(["*"] * depth), RuntimeHistory.__RUN_FILE)
+            for run_file in glob(pattern):
+                path_segments = relpath(dirname(run_file), self.findings_path).split(sep)
+                experiment_and_detector = tuple(path_segments[:2])
+                version_id = "{}.{}".format(path_segments[2], path_segments[3]).lower()
+                runtime = self.__read_runtime(run_file)
+                key = (version_id, experiment_and_detector)
+                runtimes_by_run[key] = runtimes_by_run.get(key, 0) + runtime
+
+                if depth == 5:
+                    misuse_id = "{}.{}".format(version_id, path_segments[4]).lower()
+                    misuse_runtimes[misuse_id] = max(misuse_runtimes.get(misuse_id, 0), runtime)
+
+        runtimes = {}
+        for (version_id, _), runtime in runtimes_by_run.items():
+            runtimes[version_id] = max(runtimes.get(version_id, 0), runtime)
+        return runtimes, misuse_runtimes
+
+    @staticmethod
+    def __read_runtime(run_file: str) -> float:
+        try:
+            return float(read_yaml_if_exists(run_file).get("runtime", 0))
+        except (TypeError, ValueError, AttributeError):
+            return 0
@@ -0,0 +1,178 @@
+import logging
+import pickle
+import sqlite3
+import time
+from hashlib import sha1
+from os import getpid, stat
+from os.path import exists
+from threading import Lock, local
+from typing import Dict, List, Optional, Tuple
+
+from utils.io import create_file_path
+
+_active_cache = None  # type: Optional[SnippetCache]
+
+
+class SnippetCache:
+    """
+    Keeps extracted snippets in a single SQLite file across runs, such that the tasks that need the snippets of the
+    same misuses and findings extract them only once. Entries are keyed by the SHA-1 of the content of the source file,
+    the method signature, the target line, and the version of the extractor, such that changing a source file or the
+    extractor invalidates its snippets. When the entries exceed the size limit, the cache evicts the least recently
+    used ones. It records uses in batches, with the next addition or on `flush()`.
+    """
+
+    # the number of uses to record at once
+    USES_BATCH_SIZE = 256
+
+    def __init__(self, cache_file_path: str, max_size_in_bytes: int = 64 * 1024 * 1024):
+        self.cache_file_path = cache_file_path
+        self.max_size_in_bytes = max_size_in_bytes
+        self.logger = logging.getLogger("data.snippet_cache")
+        self.hits = 0
+        self.misses = 0
+        # the hashes of the source files by their modification time and size, to read each file only once per run
+        self.__file_hashes = {}  # type: Dict[str, Tuple[int, int, str]]
+        self.__lock = Lock()
+        # one connection per thread, since SQLite connections must not be shared between threads or processes
+        self.__connections = local()
+        self.__has_schema = False
+        # the size of all entries, which this process updates itself, rather than summing the entries on every addition
+        self.__size = None  # type: Optional[int]
+        self.__uses = {}  # type: Dict[str, float]
+
+    def get_key(self, file_path: str, method: str, target_line_number: int, extractor_version: str) -> Optional[str]:
+        """The key of the snippets of the given method, or `None`, if the source file does not exist."""
+        file_hash = self.__get_file_hash(file_path)
+        if file_hash is None:
+            return None
+        return "{}:{}:{}:{}".format(file_hash, method, target_line_number, extractor_version)
+
+    def __get_file_hash(self, file_path: str) -> Optional[str]:
+        try:
+            file_stat = stat(file_path)
+            entry = self.__file_hashes.get(file_path, None)
+            if entry is not None and entry[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+                return entry[2]
+            with open(file_path, "rb") as file:
+                file_hash = sha1(file.read()).hexdigest()
+        except OSError:
+            return None
+        self.__file_hashes[file_path] = (file_stat.st_mtime_ns, file_stat.st_size, file_hash)
+        return file_hash
+
+    def get(self, key: str) -> Optional[List['Snippet']]:
+        row = None
+        if exists(self.cache_file_path):
+            try:
+                row = self.__get_connection().execute("SELECT snippets FROM snippets WHERE key = ?", (key,)).fetchone()
+            except sqlite3.DatabaseError as e:
+                self.logger.warning("Ignoring unreadable snippet cache %s: %s", self.cache_file_path, e)
+
+        is_batch_complete = False
+        with self.__lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.__uses[key] = time.time()
+                is_batch_complete = len(self.__uses) >= SnippetCache.USES_BATCH_SIZE
+        if is_batch_complete:
+            self.flush()
+        return pickle.loads(row[0]) if row is not None else None
+
+    def add(self, key: str, snippets: List['Snippet']):
+        content = pickle.dumps(snippets, pickle.HIGHEST_PROTOCOL)
+        create_file_path(self.cache_file_path)
+        try:
+            connection = self.__get_connection()
+            with connection:
+                if self.__size is None:
+                    self.__size = self.__get_size(connection)
+                self.__record_uses(connection)
+                connection.execute("INSERT OR REPLACE INTO snippets (key, snippets, size, last_used) "
+                                   "VALUES (?, ?, ?, ?)", (key, content, len(content), time.time()))
+                with self.__lock:
+                    self.__size += len(content)
+                    is_full = self.__size > self.max_size_in_bytes
+                if is_full:
+                    self.__evict(connection)
+        except sqlite3.DatabaseError as e:
+            # the cache only saves work, the next run extracts the snippets again
+            self.logger.warning("Failed to update snippet cache %s: %s", self.cache_file_path, e)
+
+    def flush(self):
+        """Records the pending uses of entries, which determine the entries to evict."""
+        if not exists(self.cache_file_path):
+            return
+        try:
+            connection = self.__get_connection()
+            with connection:
+                self.__record_uses(connection)
+        except sqlite3.DatabaseError as e:
+            self.logger.warning("Failed to update snippet cache %s: %s", self.cache_file_path, e)
+
+    def __record_uses(self, connection: sqlite3.Connection):
+        with self.__lock:
+            uses = self.__uses
+            self.__uses = {}
+        if uses:
+            connection.executemany("UPDATE snippets SET last_used = ? WHERE key = ?",
+                                   [(last_used, key) for key, last_used in uses.items()])
+
+    @staticmethod
+    def __get_size(connection: sqlite3.Connection) -> int:
+        return connection.execute("SELECT COALESCE(SUM(size), 0) FROM snippets").fetchone()[0]
+
+    def __evict(self, connection: sqlite3.Connection):
+        # the actual size, which also reflects replaced entries and the additions of parallel processes
+        size = self.__get_size(connection)
+        if size <= self.max_size_in_bytes:
+            with self.__lock:
+                self.__size = size
+            return
+
+        evicted_keys = []
+        for key, entry_size in connection.execute("SELECT key, size FROM snippets ORDER BY last_used").fetchall():
+            if size <= self.max_size_in_bytes:
+                break
+            evicted_keys.append((key,))
+            size -= entry_size
+        connection.executemany("DELETE FROM snippets WHERE key = ?", evicted_keys)
+        with self.__lock:
+            self.__size = size
+        self.logger.debug("Evicted %d snippet(s) from the snippet cache.", len(evicted_keys))
+
+    def __len__(self):
+        if not exists(self.cache_file_path):
+            return 0
+        try:
+            return self.__get_connection().execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+        except sqlite3.DatabaseError:
+            return 0
+
+    def __get_connection(self) -> sqlite3.Connection:
+        connection = getattr(self.__connections, "connection", None)
+        # a forked worker process must not use the connection of its parent
+        if connection is None or self.__connections.pid != getpid():
+            # parallel tasks share the file, wait for their writes rather than failing
+            connection = sqlite3.connect(self.cache_file_path, timeout=30)
+            self.__connections.connection = connection
+            self.__connections.pid = getpid()
+            with self.__lock:
+                if not self.__has_schema:
+                    with connection:
+                        connection.execute("CREATE TABLE IF NOT EXISTS snippets "
+                                           "(key TEXT PRIMARY KEY, snippets BLOB, size INTEGER, last_used REAL)")
+                    self.__has_schema = True
+        return connection
+
+
+def use_snippet_cache(cache: Optional[SnippetCache]):
+    """Makes the snippet extraction consult the given cache, or extract every snippet, if `None`."""
+    global _active_cache
+    _active_cache = cache
+
+
+def get_snippet_cache() -> Optional[SnippetCache]:
+    return _active_cache
@@ -1,10 +1,19 @@
+import logging
 import os
 import re
 from os.path import join
-from typing import List
+from collections import OrderedDict
+from typing import List, Tuple, Dict
 
+from data.snippet_cache import get_snippet_cache
 from utils import io
-from utils.java_utils import exec_util
+from utils.java_method_index import JavaMethodIndex, get_java_method_index, UnsupportedJavaSourceError
+from utils.java_utils import extract_methods, extract_all_methods, get_method_extractor_version
+
+_use_java_method_index = False
+
+# the errors of the method extractor, e.g., on a missing file or a crash, and of parsing its output
+_EXTRACTION_ERRORS = (ValueError, EOFError, OSError)
 
 
 def get_snippets(source_base_paths: List[str], file: str, method: str, target_line_number: int = -1) -> List['Snippet']:
@@ -22,44 +31,150 @@ def get_snippets(source_base_paths: List[str], file: str, method: str, target_li
     return snippets
 
 
+def get_snippets_batch(source_base_paths: List[str], requests: List[Tuple[str, str, int]]) -> List[List['Snippet']]:
+    """
+    Extracts the snippets for many (file, method, target line number) requests at once. It parses each file only once,
+    no matter how many methods it extracts from that file. Returns the snippets for each request, in the order of the
+    requests, and an empty list for requests that have no snippets.
+    """
+    snippets = [[] for _ in requests]  # type: List[List[Snippet]]
+
+    for source_base_path in source_base_paths:
+        requests_by_target_file = OrderedDict()  # type: Dict[str, List[int]]
+        for index, (file, method, target_line_number) in enumerate(requests):
+            if file and method:
+                requests_by_target_file.setdefault(join(source_base_path, file), []).append(index)
+            else:
+                try:
+                    snippets[index].extend(__get_snippets(source_base_path, file, method, target_line_number))
+                except SnippetUnavailableException:
+                    continue
+
+        cache = get_snippet_cache()
+        for target_file, indices in requests_by_target_file.items():
+            cache_keys = {}
+            if cache is not None:
+                for index in list(indices):
+                    cache_keys[index] = cache.get_key(target_file, requests[index][1], requests[index][2],
+                                                      _get_extractor_version())
+                    cached_snippets = cache.get(cache_keys[index]) if cache_keys[index] else None
+                    if cached_snippets is not None:
+                        snippets[index].extend(cached_snippets)
+                        indices.remove(index)
+            if not indices:
+                continue
+
+            methods = [requests[index][1] for index in indices]
+            try:
+                outputs = __extract_all_methods(target_file, methods)
+                extracted_snippets = [__to_snippets(output, requests[index][2])
+                                      for index, output in zip(indices, outputs)]
+            except _EXTRACTION_ERRORS as e:
+                logging.getLogger("data.snippets").debug(
+                    SnippetUnavailableException(target_file, ", ".join(methods), e))
+                continue
+            for index, method_snippets in zip(indices, extracted_snippets):
+                snippets[index].extend(method_snippets)
+                if cache_keys.get(index):
+                    cache.add(cache_keys[index], method_snippets)
+
+    return snippets
+
+
 def __get_snippets(source_base_path: str, file: str, method: str, target_line_number: int) -> List['Snippet']:
     target_file = join(source_base_path, file)
     snippets = []
-    snippets_with_matching_line_number = []
     try:
         if file and method:
-            # output comes as:
-            #
-            #   <first-line number>:<declaring type>:<code>
-            #   ===
-            #   <first-line number>:<declaring type>:<code>
-            #
-            output = exec_util("MethodExtractor", "\"{}\" \"{}\"".format(target_file, method))
-
-            # if there's other preceding output, we need to strip it
-            while output and not re.match("^[0-9]+:[^:\n]+:", output):
-                output_lines = output.split("\n", 2)
-                if len(output_lines) > 1:
-                    output = output_lines[1]
-                else:
-                    output = ""
-
-            if output:
-                methods = output.split("\n===\n")
-                for method in methods:
-                    first_line, class_name, code = method.split(":", 2)
-                    first_line = int(first_line)
-                    snippet = Snippet("""class {} {{\n{}\n}}""".format(class_name, code), first_line - 1)
-                    snippets.append(snippet)
-
-                    last_line = first_line + code.count("\n")
-                    if first_line <= target_line_number <= last_line:
-                        snippets_with_matching_line_number.append(snippet)
+            snippets = __extract_snippets(target_file, method, target_line_number)
         elif file and os.path.exists(target_file):
             snippets.append(Snippet(io.safe_read(target_file), 1))
 
     except Exception as e:
         raise SnippetUnavailableException(target_file, method, e)
+    return snippets
+
+
+def __extract_snippets(target_file: str, method: str, target_line_number: int) -> List['Snippet']:
+    cache = get_snippet_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.get_key(target_file, method, target_line_number, _get_extractor_version())
+    if cache_key:
+        cached_snippets = cache.get(cache_key)
+        if cached_snippets is not None:
+            return cached_snippets
+
+    snippets = __to_snippets(__extract_methods(target_file, method), target_line_number)
+    if cache_key:
+        cache.add(cache_key, snippets)
+    return snippets
+
+
+def __extract_methods(target_file: str, method: str) -> str:
+    if _use_java_method_index:
+        try:
+            return get_java_method_index(target_file).extract(method)
+        except UnsupportedJavaSourceError:
+            # the MethodExtractor of the utils parses the code that the index does not handle
+            pass
+    return extract_methods(target_file, method)
+
+
+def __extract_all_methods(target_file: str, methods: List[str]) -> List[str]:
+    if _use_java_method_index:
+        try:
+            index = get_java_method_index(target_file)
+        except UnsupportedJavaSourceError:
+            pass
+        else:
+            return [index.extract(method) for method in methods]
+    return extract_all_methods(target_file, methods)
+
+
+def _get_extractor_version() -> str:
+    # the extractors may produce different snippets for the same method
+    if _use_java_method_index:
+        return "index-{}+utils-{}".format(JavaMethodIndex.VERSION, get_method_extractor_version())
+    return "utils-{}".format(get_method_extractor_version())
+
+
+def use_java_method_index(enabled: bool):
+    """Makes the snippet extraction locate methods with the `JavaMethodIndex` first, or only with the utils."""
+    global _use_java_method_index
+    _use_java_method_index = enabled
+
+
+def __to_snippets(output: str, target_line_number: int) -> List['Snippet']:
+    # output comes as:
+    #
+    #   <first-line number>:<declaring type>:<code>
+    #   ===
+    #   <first-line number>:<declaring type>:<code>
+    #
+    snippets = []
+    snippets_with_matching_line_number = []
+
+    # if there's other preceding output, we need to strip it
+    while output and not re.match("^[0-9]+:[^:\n]+:", output):
+        output_lines = output.split("\n", 2)
+        if len(output_lines) > 1:
+            output = output_lines[1]
+        else:
+            output = ""
+
+    if output:
+        methods = output.split("\n===\n")
+        for method in methods:
+            first_line, class_name, code = method.split(":", 2)
+            first_line = int(first_line)
+            snippet = Snippet("""class {} {{\n{}\n}}""".format(class_name, code), first_line - 1)
+            snippets.append(snippet)
+
+            last_line = first_line + code.count("\n")
+            if first_line <= target_line_number <= last_line:
+                snippets_with_matching_line_number.append(snippet)
+
     return snippets_with_matching_line_number if snippets_with_matching_line_number else snippets
 
 
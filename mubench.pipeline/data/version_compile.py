@@ -25,6 +25,9 @@ class VersionCompile:
     def needs_compile(self):
         return not exists(self._compile_info_file)
 
+    def is_outdated(self, checkout_timestamp: int) -> bool:
+        return checkout_timestamp > self.timestamp
+
     def get_dependency_classpath(self):
         if isdir(self.dependencies_path):
             return ":".join([join(self.dependencies_path, file)
@@ -0,0 +1,92 @@
+"""
+Measures the memory that the data entities of a synthetic dataset take, to check that large generated datasets fit into
+memory. Usage: `python3 entity_memory_benchmark.py [<number of misuses>]`
+"""
+import sys
+import time
+import tracemalloc
+from os.path import join
+from tempfile import mkdtemp
+
+from data.dataset_catalog import DatasetCatalog, use_dataset_catalog
+from data.entity_registry import EntityRegistry, use_entity_registry
+from tasks.implementations.collect_misuses import CollectMisusesTask
+from tasks.implementations.collect_projects import CollectProjectsTask
+from tasks.implementations.collect_versions import CollectVersionsTask
+from utils.data_entity_lists import DataEntityLists
+from utils.io import write_yaml, safe_write, remove_tree
+
+MISUSES_PER_VERSION = 10
+VERSIONS_PER_PROJECT = 10
+
+
+def create_dataset(data_path: str, number_of_misuses: int):
+    for misuse_number in range(number_of_misuses):
+        version_number = misuse_number // MISUSES_PER_VERSION
+        project_id = "project{}".format(version_number // VERSIONS_PER_PROJECT)
+        version_id = "version{}".format(version_number)
+        misuse_id = "misuse{}".format(misuse_number)
+        project_path = join(data_path, project_id)
+        if version_number % VERSIONS_PER_PROJECT == 0 and misuse_number % MISUSES_PER_VERSION == 0:
+            write_yaml({"name": project_id, "repository": {"type": "git", "url": "-url-"}},
+                       join(project_path, "project.yml"))
+        if misuse_number % MISUSES_PER_VERSION == 0:
+            write_yaml({"revision": "0" * 40, "build": {"src": "src/main/java/", "commands": ["mvn compile"],
+                                                        "classes": "target/classes/"},
+                        "misuses": ["misuse{}".format(misuse_number + offset) for offset in range(MISUSES_PER_VERSION)]},
+                       join(project_path, "versions", version_id, "version.yml"))
+        misuse_path = join(project_path, "misuses", misuse_id)
+        write_yaml({"api": ["java.util.Iterator"], "violations": ["missing/condition/value_or_state"], "crash": False,
+                    "description": "Calls next() on an iterator without checking hasNext().",
+                    "location": {"file": "org/example/Example{}.java".format(misuse_number), "method": "m()",
+                                 "line": 42},
+                    "fix": {"commit": "http://example.org/commit", "description": "Check hasNext().",
+                            "revision": "1" * 40},
+                    "source": {"name": "synthetic", "url": "http://example.org"}},
+                   join(misuse_path, "misuse.yml"))
+        safe_write("class Pattern {}", join(misuse_path, "correct-usages", "Pattern.java"), append=False)
+
+
+def collect_misuses(data_path: str) -> list:
+    data_entity_lists = DataEntityLists([], [])
+    collect_versions = CollectVersionsTask(False)
+    collect_misuses = CollectMisusesTask()
+    misuses = []
+    for project in CollectProjectsTask(data_path).run(data_entity_lists):
+        for version in collect_versions.run(project, data_entity_lists):
+            for misuse in collect_misuses.run(version, data_entity_lists):
+                # the properties that the pipeline reads for every misuse
+                misuse.location, misuse.fix, misuse.apis, misuse.violations, misuse.correct_usages
+                misuses.append(misuse)
+    return misuses
+
+
+def main(number_of_misuses: int):
+    temp_path = mkdtemp(prefix="mubench-entity-memory_")
+    try:
+        data_path = join(temp_path, "data")
+        print("Creating {} misuses...".format(number_of_misuses))
+        create_dataset(data_path, number_of_misuses)
+
+        start = time.time()
+        catalog = DatasetCatalog(data_path, join(temp_path, "catalog.sqlite")).open()
+        print("Compiled catalog in {:.2f}s".format(time.time() - start))
+        start = time.time()
+        catalog = DatasetCatalog(data_path, join(temp_path, "catalog.sqlite")).open()
+        print("Opened catalog in {:.2f}s".format(time.time() - start))
+        use_dataset_catalog(catalog)
+        use_entity_registry(EntityRegistry())
+
+        tracemalloc.start()
+        start = time.time()
+        misuses = collect_misuses(data_path)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("Collected {} misuses in {:.2f}s, using {:.1f} MB ({:.0f} bytes per misuse)".format(
+            len(misuses), time.time() - start, memory / 1024 / 1024, memory / max(len(misuses), 1)))
+    finally:
+        remove_tree(temp_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
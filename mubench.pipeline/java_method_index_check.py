@@ -0,0 +1,69 @@
+"""
+Checks that the Java method index extracts the same methods as the MethodExtractor of the utils, for every method in
+every Java file of the dataset, and lists the files that the index leaves to the MethodExtractor. Requires Java.
+Usage: `python3 java_method_index_check.py [<data path>]`
+"""
+import sys
+from os import walk
+from os.path import join
+from typing import List, Optional
+
+from utils.config_util import MUBENCH_ROOT_PATH
+from utils.java_method_index import JavaMethodIndex, UnsupportedJavaSourceError
+from utils.java_utils import extract_all_methods
+
+
+def find_java_files(data_path: str) -> List[str]:
+    java_files = []
+    for root, _, files in walk(data_path):
+        java_files.extend(join(root, file) for file in files if file.endswith(".java"))
+    return sorted(java_files)
+
+
+def extract(index: JavaMethodIndex, method: str) -> Optional[str]:
+    try:
+        return index.extract(method)
+    except ValueError:
+        return None
+
+
+def extract_with_utils(file: str, methods: List[str]) -> List[Optional[str]]:
+    try:
+        return [output.rstrip("\n") for output in extract_all_methods(file, methods)]
+    except Exception:
+        # the MethodExtractor fails for all methods of a file at once, check the methods one by one
+        if len(methods) > 1:
+            return [extract_with_utils(file, [method])[0] for method in methods]
+        return [None]
+
+
+def main(data_path: str):
+    java_files = find_java_files(data_path)
+    unsupported_files = []
+    number_of_methods = 0
+    disagreements = 0
+    for java_file in java_files:
+        try:
+            index = JavaMethodIndex.from_file(java_file)
+        except UnsupportedJavaSourceError as e:
+            unsupported_files.append(java_file)
+            print("Unsupported {}: {}".format(java_file, e))
+            continue
+
+        # the default constructor is not among the signatures
+        methods = index.get_signatures() + ["<init>()"]
+        number_of_methods += len(methods)
+        for method, expected in zip(methods, extract_with_utils(java_file, methods)):
+            actual = extract(index, method)
+            if actual != expected:
+                disagreements += 1
+                print("Disagreement on {} in {}:\n--- index:\n{}\n--- utils:\n{}".format(
+                    method, java_file, actual, expected))
+
+    print("Checked {} methods in {} files: {} disagreement(s), {} file(s) left to the utils".format(
+        number_of_methods, len(java_files) - len(unsupported_files), disagreements, len(unsupported_files)))
+    sys.exit(1 if disagreements else 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else join(MUBENCH_ROOT_PATH, "data"))
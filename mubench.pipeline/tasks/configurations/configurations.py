@@ -1,13 +1,17 @@
-from typing import List
+from os.path import join, exists
+from socket import gethostname
+from typing import List, Dict, Optional
 
+from data.runtime_history import RuntimeHistory
 from tasks.implementations import stats
 from tasks.implementations.checkout import CheckoutTask
 from tasks.implementations.collect_misuses import CollectMisusesTask
 from tasks.implementations.collect_projects import CollectProjectsTask
-from tasks.implementations.collect_versions import CollectVersionsTask
+from tasks.implementations.collect_versions import CollectVersionsTask, CollectAllVersionsTask, \
+    CollectVersionProjectTask
 from tasks.implementations.compile_misuse import CompileMisuseTask
 from tasks.implementations.compile_version import CompileVersionTask
-from tasks.implementations.dataset_check_misuse import MisuseCheckTask
+from tasks.implementations.dataset_check_misuse import MisuseCheckTask, MisuseCheckCache
 from tasks.implementations.dataset_check_project import ProjectCheckTask
 from tasks.implementations.dataset_check_version import VersionCheckTask
 from tasks.implementations.detect_all_findings import DetectAllFindingsTask
@@ -16,9 +20,16 @@ from tasks.implementations.filter_misuses_without_correct_usages import FilterMi
 from tasks.implementations.findings_filters import AllFindingsFilterTask, PotentialHitsFilterTask
 from tasks.implementations.info import ProjectInfoTask, VersionInfoTask, MisuseInfoTask
 from tasks.implementations.load_detector import LoadDetectorTask
+from tasks.implementations.plan import RunPlan, PlanLoadDetectorTask, PlanCheckoutTask, PlanCompileVersionTask, \
+    PlanCompileMisuseTask, PlanDetectAllFindingsTask, PlanDetectProvidedCorrectUsagesTask
 from tasks.implementations.publish_findings import PublishFindingsTask
 from tasks.implementations.publish_metadata import PublishMetadataTask
+from tasks.implementations.shard import CollectShardsTask, FilterShardVersionsTask
+from tasks.staged_task_runner import Stage
 from utils.dataset_util import get_available_datasets
+from utils.longest_first_order import LongestFirstOrder
+from utils.memory_budget import create_memory_budget
+from utils.work_queue import WorkQueue
 
 
 class TaskConfiguration:
@@ -46,6 +57,72 @@ def get_task_configuration(config) -> List:
     return requested_configurations[0].tasks(config)
 
 
+PIPELINE_STAGES = [
+    ("checkout", (CheckoutTask,)),
+    ("compile", (CompileVersionTask, CompileMisuseTask)),
+    ("detect", (DetectAllFindingsTask, DetectProvidedCorrectUsagesTask)),
+    ("publish", (PublishFindingsTask, PublishMetadataTask)),
+]
+
+
+def get_pipeline_stages(concurrencies: Dict[str, int]) -> List[Stage]:
+    unknown_stages = set(concurrencies) - {name for name, _ in PIPELINE_STAGES}
+    if unknown_stages:
+        raise ValueError("Unknown pipeline stage(s): {}".format(", ".join(sorted(unknown_stages))))
+
+    return [Stage(name, task_types, concurrencies.get(name, 1)) for name, task_types in PIPELINE_STAGES]
+
+
+def _get_order(config) -> Optional[LongestFirstOrder]:
+    if 'longest_first' in config and config.longest_first:
+        return LongestFirstOrder(RuntimeHistory(config.findings_path), config.compiles_path)
+    return None
+
+
+def _is_parallel(config) -> bool:
+    is_pipeline = 'pipeline' in config and config.pipeline is not None
+    return is_pipeline or ('jobs' in config and config.jobs > 1)
+
+
+def get_expected_runtime(config) -> Optional[float]:
+    """
+    The typical runtime of the detector on one project version or, in the experiment that runs per misuse, on one
+    misuse, according to previous runs.
+    """
+    if config.task not in ["run", "publish"] or not hasattr(config, 'sub_task'):
+        return None
+    runtime_history = RuntimeHistory(config.findings_path)
+    if config.sub_task == RunProvidedPatternsExperiment.ID:
+        return runtime_history.get_median_misuse_runtime()
+    return runtime_history.get_median_version_runtime()
+
+
+def _is_plan(config) -> bool:
+    return 'plan' in config and config.plan
+
+
+def _get_plan_tasks(tasks: List, config) -> List:
+    """
+    Replaces the tasks that download, check out, compile, or run detectors with tasks that only record whether they
+    would do so.
+    """
+    plan = RunPlan()
+    plan_task_factories = {
+        LoadDetectorTask: lambda task: PlanLoadDetectorTask(task, plan),
+        CheckoutTask: lambda task: PlanCheckoutTask(task, plan),
+        CompileVersionTask: lambda task: PlanCompileVersionTask(task, plan),
+        CompileMisuseTask: lambda task: PlanCompileMisuseTask(task, plan),
+        DetectAllFindingsTask: lambda task: PlanDetectAllFindingsTask(task, RuntimeHistory(config.findings_path), plan),
+        DetectProvidedCorrectUsagesTask: lambda task: PlanDetectProvidedCorrectUsagesTask(task, plan),
+    }
+    return [plan_task_factories[type(task)](task) if type(task) in plan_task_factories else task for task in tasks]
+
+
+def _get_memory_budget(config):
+    # worker processes of parallel runs share the budget
+    return create_memory_budget(config.memory_budget, shared=config.jobs > 1)
+
+
 class InfoTaskConfiguration(TaskConfiguration):
     @staticmethod
     def mode() -> str:
@@ -67,10 +144,37 @@ class CheckoutTaskConfiguration(TaskConfiguration):
         return "checkout"
 
     def tasks(self, config) -> List:
-        collect_projects = CollectProjectsTask(config.data_path)
-        collect_versions = CollectVersionsTask(config.development_mode)
+        order = _get_order(config)
         checkout = CheckoutTask(config.checkouts_path, config.run_timestamp, config.force_checkout, config.use_tmp_wrkdir)
-        return [collect_projects, collect_versions, checkout]
+        if order and _is_parallel(config):
+            # parallel runs start the versions in the order of the branches, hence, order them across projects
+            collect_projects = CollectProjectsTask(config.data_path)
+            collect_versions = CollectVersionsTask(config.development_mode)
+            collect_tasks = [CollectAllVersionsTask(collect_projects, collect_versions, order),
+                             CollectVersionProjectTask()]
+        else:
+            collect_projects = CollectProjectsTask(config.data_path, order)
+            collect_versions = CollectVersionsTask(config.development_mode, order)
+            collect_tasks = [collect_projects, collect_versions]
+        if config.shard:
+            return self.__get_sharded_tasks(config, collect_tasks, collect_projects, collect_versions) + [checkout]
+        return collect_tasks + [checkout]
+
+    @staticmethod
+    def __get_sharded_tasks(config, collect_tasks: List, collect_projects: CollectProjectsTask,
+                            collect_versions: CollectVersionsTask) -> List:
+        index, count = config.shard
+        work_queue = None
+        if config.shard_queue and not _is_plan(config):
+            work_queue = WorkQueue(config.shard_queue, "{}/{}@{}".format(index, count, gethostname()))
+        collect_shards = CollectShardsTask(index, count, work_queue)
+        partition_file_path = config.shard_partition
+        if partition_file_path and _is_plan(config) and not exists(partition_file_path):
+            partition_file_path = None
+        filter_shard_versions = FilterShardVersionsTask(collect_projects, collect_versions,
+                                                        RuntimeHistory(config.findings_path), work_queue,
+                                                        partition_file_path)
+        return [collect_shards] + collect_tasks + [filter_shard_versions]
 
 
 class CompileTaskConfiguration(TaskConfiguration):
@@ -81,7 +185,7 @@ class CompileTaskConfiguration(TaskConfiguration):
     def tasks(self, config) -> List:
         compile_version = CompileVersionTask(config.compiles_path, config.run_timestamp, config.force_compile,
                                              config.use_tmp_wrkdir)
-        collect_misuses = CollectMisusesTask()
+        collect_misuses = CollectMisusesTask(_get_order(config))
         compile_misuse = CompileMisuseTask(config.compiles_path, config.run_timestamp, config.force_compile)
         return CheckoutTaskConfiguration().tasks(config) + [compile_version, collect_misuses, compile_misuse]
 
@@ -96,16 +200,17 @@ class RunProvidedPatternsExperiment(TaskConfiguration):
     def tasks(self, config) -> List:
         compile_version = CompileVersionTask(config.compiles_path, config.run_timestamp, config.force_compile,
                                              config.use_tmp_wrkdir)
-        collect_misuses = CollectMisusesTask()
+        collect_misuses = CollectMisusesTask(_get_order(config))
         filter_misuses_without_correct_usages = FilterMisusesWithoutCorrectUsagesTask()
         compile_misuse = CompileMisuseTask(config.compiles_path, config.run_timestamp, config.force_compile)
         load_detector = LoadDetectorTask(config.detectors_path, config.detector, config.requested_release,
                                          config.java_options)
         detect = DetectProvidedCorrectUsagesTask(config.findings_path, config.force_detect, config.timeout,
-                                                 config.run_timestamp)
-        return [load_detector] + CheckoutTaskConfiguration().tasks(config) + [compile_version, collect_misuses,
-                                                                              filter_misuses_without_correct_usages,
-                                                                              compile_misuse, detect]
+                                                 config.run_timestamp, _get_memory_budget(config))
+        tasks = [load_detector] + CheckoutTaskConfiguration().tasks(config) + [compile_version, collect_misuses,
+                                                                               filter_misuses_without_correct_usages,
+                                                                               compile_misuse, detect]
+        return _get_plan_tasks(tasks, config) if _is_plan(config) else tasks
 
 
 class PublishProvidedPatternsExperiment(TaskConfiguration):
@@ -132,8 +237,10 @@ class RunAllFindingsExperiment(TaskConfiguration):
                                              config.force_compile, config.use_tmp_wrkdir)
         load_detector = LoadDetectorTask(config.detectors_path, config.detector, config.requested_release,
                                          config.java_options)
-        detect = DetectAllFindingsTask(config.findings_path, config.force_detect, config.timeout, config.run_timestamp)
-        return [load_detector] + CheckoutTaskConfiguration().tasks(config) + [compile_version, detect]
+        detect = DetectAllFindingsTask(config.findings_path, config.force_detect, config.timeout, config.run_timestamp,
+                                       _get_memory_budget(config))
+        tasks = [load_detector] + CheckoutTaskConfiguration().tasks(config) + [compile_version, detect]
+        return _get_plan_tasks(tasks, config) if _is_plan(config) else tasks
 
 
 class PublishAllFindingsExperiment(TaskConfiguration):
@@ -160,8 +267,10 @@ class RunBenchmarkExperiment(TaskConfiguration):
                                              config.force_compile, config.use_tmp_wrkdir)
         load_detector = LoadDetectorTask(config.detectors_path, config.detector, config.requested_release,
                                          config.java_options)
-        detect = DetectAllFindingsTask(config.findings_path, config.force_detect, config.timeout, config.run_timestamp)
-        return [load_detector] + CheckoutTaskConfiguration().tasks(config) + [compile_version, detect]
+        detect = DetectAllFindingsTask(config.findings_path, config.force_detect, config.timeout, config.run_timestamp,
+                                       _get_memory_budget(config))
+        tasks = [load_detector] + CheckoutTaskConfiguration().tasks(config) + [compile_version, detect]
+        return _get_plan_tasks(tasks, config) if _is_plan(config) else tasks
 
 
 class PublishBenchmarkExperiment(TaskConfiguration):
@@ -222,6 +331,7 @@ class DatasetCheckTaskConfiguration(TaskConfiguration):
         collect_misuses = CollectMisusesTask()
         project_check = ProjectCheckTask()
         version_check = VersionCheckTask()
+        check_cache = MisuseCheckCache(join(config.checkouts_path, "dataset-check-cache.json"))
         misuse_check = MisuseCheckTask(get_available_datasets(config.datasets_file_path), config.checkouts_path,
-                                       config.data_path)
+                                       config.data_path, check_cache)
         return [collect_projects, project_check, collect_versions, version_check, collect_misuses, misuse_check]
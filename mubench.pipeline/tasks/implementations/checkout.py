@@ -1,7 +1,10 @@
 import logging
 from tempfile import mkdtemp
+from typing import Optional
 
+from data.project_checkout import ProjectCheckout
 from data.project_version import ProjectVersion
+from tasks.run_journal import get_file_state
 from utils.io import copy_tree, remove_tree
 
 
@@ -13,7 +16,7 @@ class CheckoutTask:
         self.use_temp_dir = use_temp_dir
         self.run_timestamp = run_timestamp
 
-    def run(self, version: ProjectVersion):
+    def run(self, version: ProjectVersion) -> ProjectCheckout:
         logger = logging.getLogger("tasks.checkout")
 
         try:
@@ -40,3 +43,12 @@ class CheckoutTask:
                 checkout.create(self.run_timestamp)
 
         return checkout
+
+    def get_journal_state(self, entity) -> Optional[str]:
+        if isinstance(entity, ProjectVersion):
+            try:
+                # noinspection PyProtectedMember
+                return get_file_state(entity.get_checkout(self.checkouts_path)._checkout_info_file)
+            except ValueError:
+                return None
+        return None
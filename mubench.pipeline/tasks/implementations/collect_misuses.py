@@ -1,11 +1,17 @@
 import logging
+from typing import List, Optional
 
+from data.misuse import Misuse
 from data.project_version import ProjectVersion
 from utils.data_entity_lists import DataEntityLists
+from utils.longest_first_order import LongestFirstOrder
 
 
 class CollectMisusesTask:
-    def run(self, version: ProjectVersion, data_entity_lists: DataEntityLists):
+    def __init__(self, order: Optional[LongestFirstOrder] = None):
+        self.order = order
+
+    def run(self, version: ProjectVersion, data_entity_lists: DataEntityLists) -> List[Misuse]:
         misuses = [misuse for misuse in version.misuses if
                    not self.__is_filtered(version.id, misuse.id, data_entity_lists)]
 
@@ -13,13 +19,15 @@ class CollectMisusesTask:
             logger = logging.getLogger("tasks.collect_misuses")
             logger.warning("Filtered all misuses of {}!".format(version))
 
+        if self.order:
+            misuses = self.order.sort_misuses(misuses)
+
         return misuses
 
     @staticmethod
     def __is_filtered(version_id: str, misuse_id: str, data_entity_lists: DataEntityLists) -> bool:
         white_list = data_entity_lists.get_misuse_white_list(version_id)
-        black_list = data_entity_lists.black_list
 
         is_whitelisted = not white_list or misuse_id in white_list
-        is_blacklisted = misuse_id in black_list
+        is_blacklisted = data_entity_lists.is_blacklisted(misuse_id)
         return is_blacklisted or not is_whitelisted
@@ -1,34 +1,40 @@
 import logging
 from os import listdir
 from os.path import exists, join
+from typing import List, Optional
 
+from data.entity_registry import get_entity
 from data.project import Project
 from utils.data_entity_lists import DataEntityLists
+from utils.longest_first_order import LongestFirstOrder
 
 
 class CollectProjectsTask:
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: str, order: Optional[LongestFirstOrder] = None):
         self.data_path = data_path
+        self.order = order
 
-    def run(self, data_entity_lists: DataEntityLists):
+    def run(self, data_entity_lists: DataEntityLists) -> List[Project]:
         project_ids = []
         if exists(self.data_path):
             project_ids.extend(sorted(listdir(self.data_path)))
 
-        projects = [Project(self.data_path, project_id) for project_id in project_ids if
+        projects = [get_entity(Project, self.data_path, project_id) for project_id in project_ids if
                     Project.is_project(join(self.data_path, project_id)) and not self.__is_filtered(project_id,
                                                                                                     data_entity_lists)]
         if not projects:
             logger = logging.getLogger("tasks.collect_projects")
             logger.warning("Filtered all projects!")
 
+        if self.order:
+            projects = self.order.sort_projects(projects)
+
         return projects
 
     @staticmethod
     def __is_filtered(project_id: str, data_entity_lists: DataEntityLists) -> bool:
         white_list = data_entity_lists.get_project_white_list()
-        black_list = data_entity_lists.black_list
 
         is_whitelisted = not white_list or project_id in white_list
-        is_blacklisted = project_id in black_list
+        is_blacklisted = data_entity_lists.is_blacklisted(project_id)
         return is_blacklisted or not is_whitelisted
@@ -1,15 +1,19 @@
 import logging
+from typing import List, Optional
 
 from data.project import Project
 from data.project_version import ProjectVersion
+from tasks.implementations.collect_projects import CollectProjectsTask
 from utils.data_entity_lists import DataEntityLists
+from utils.longest_first_order import LongestFirstOrder
 
 
 class CollectVersionsTask:
-    def __init__(self, development_mode: bool):
+    def __init__(self, development_mode: bool, order: Optional[LongestFirstOrder] = None):
         self._filter_non_compilable_versions = not development_mode
+        self.order = order
 
-    def run(self, project: Project, data_entity_lists: DataEntityLists):
+    def run(self, project: Project, data_entity_lists: DataEntityLists) -> List[ProjectVersion]:
         versions = [version for version in project.versions
                     if not self.__is_filtered(project.id, version, data_entity_lists)]
 
@@ -20,15 +24,45 @@ class CollectVersionsTask:
         if self._filter_non_compilable_versions:
             versions = [version for version in versions if version.is_compilable]
 
+        if self.order:
+            versions = self.order.sort_versions(versions)
+
         return versions
 
     @staticmethod
     def __is_filtered(project_id: str, version: ProjectVersion, data_entity_lists: DataEntityLists) -> bool:
         version_id = version.id
         white_list = data_entity_lists.get_version_white_list(project_id)
-        black_list = data_entity_lists.black_list
 
         is_whitelisted = not white_list or version_id in white_list
-        is_blacklisted = version_id in black_list
+        is_blacklisted = data_entity_lists.is_blacklisted(version_id)
 
         return is_blacklisted or not is_whitelisted
+
+
+class CollectAllVersionsTask:
+    """
+    Collects the versions of all projects at once, such that the order applies across projects. Parallel runs start
+    the branches of the task tree in order, hence, this lets them start, e.g., the longest versions of all projects
+    first. Use `CollectVersionProjectTask` to pass each version's project to subsequent tasks.
+    """
+
+    def __init__(self, collect_projects: CollectProjectsTask, collect_versions: CollectVersionsTask,
+                 order: Optional[LongestFirstOrder] = None):
+        self.collect_projects = collect_projects
+        self.collect_versions = collect_versions
+        self.order = order
+
+    def run(self, data_entity_lists: DataEntityLists) -> List[ProjectVersion]:
+        versions = [version for project in self.collect_projects.run(data_entity_lists)
+                    for version in self.collect_versions.run(project, data_entity_lists)]
+
+        if self.order:
+            versions = self.order.sort_versions(versions)
+
+        return versions
+
+
+class CollectVersionProjectTask:
+    def run(self, version: ProjectVersion) -> Project:
+        return version.project
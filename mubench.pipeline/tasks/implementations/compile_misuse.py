@@ -4,9 +4,12 @@ import shutil
 from glob import glob
 from os import makedirs
 from os.path import join, dirname, splitext, relpath, exists
+from typing import Optional
 
 from data.misuse import Misuse
+from data.misuse_compile import MisuseCompile
 from data.version_compile import VersionCompile
+from tasks.run_journal import get_file_state
 from utils.io import copy_tree
 from utils.shell import Shell
 
@@ -17,12 +20,12 @@ class CompileMisuseTask:
         self.run_timestamp = run_timestamp
         self.force_compile = force_compile
 
-    def run(self, misuse: Misuse, version_compile: VersionCompile):
+    def run(self, misuse: Misuse, version_compile: VersionCompile) -> MisuseCompile:
         logger = logging.getLogger("task.compile_patterns")
 
         misuse_compile = misuse.get_misuse_compile(self.compile_base_path)
 
-        if self.force_compile or version_compile.timestamp > misuse_compile.timestamp:
+        if self.force_compile or misuse_compile.is_outdated(version_compile.timestamp):
             misuse_compile.delete()
 
         if not exists(misuse_compile.misuse_source_path):
@@ -57,6 +60,12 @@ class CompileMisuseTask:
 
         return misuse_compile
 
+    def get_journal_state(self, entity) -> Optional[str]:
+        if isinstance(entity, Misuse):
+            # noinspection PyProtectedMember
+            return get_file_state(entity.get_misuse_compile(self.compile_base_path)._misuse_compile_file)
+        return None
+
     @staticmethod
     def _compile_correct_usages(source: str, destination: str, classpath: str):
         makedirs(destination, exist_ok=True)
@@ -5,11 +5,13 @@ from logging import Logger
 from os import makedirs
 from os.path import exists
 from tempfile import mkdtemp
-from typing import List, Set
+from typing import List, Optional, Set
 
 from data.build_command import BuildCommand
 from data.project_checkout import ProjectCheckout
 from data.project_version import ProjectVersion
+from data.version_compile import VersionCompile
+from tasks.run_journal import get_file_state
 from utils.io import remove_tree, copy_tree, zip_dir_contents
 
 
@@ -21,14 +23,14 @@ class CompileVersionTask:
         self.force_compile = force_compile
         self.use_temp_dir = use_temp_dir
 
-    def run(self, version: ProjectVersion, checkout: ProjectCheckout):
+    def run(self, version: ProjectVersion, checkout: ProjectCheckout) -> VersionCompile:
         logger = logging.getLogger("task.compile")
 
         version_compile = version.get_compile(self.compiles_base_path)
 
         build_path = mkdtemp(prefix='mubench-compile_') if self.use_temp_dir else version_compile.build_dir
 
-        if self.force_compile or checkout.timestamp > version_compile.timestamp:
+        if self.force_compile or version_compile.is_outdated(checkout.timestamp):
             logger.debug("Force compile - removing previous compiles...")
             version_compile.delete()
 
@@ -65,6 +67,12 @@ class CompileVersionTask:
 
         return version_compile
 
+    def get_journal_state(self, entity) -> Optional[str]:
+        if isinstance(entity, ProjectVersion):
+            # noinspection PyProtectedMember
+            return get_file_state(entity.get_compile(self.compiles_base_path)._compile_info_file)
+        return None
+
     @staticmethod
     def __copy_additional_compile_sources(version: ProjectVersion, checkout_dir: str):
         additional_sources = version.additional_compile_sources
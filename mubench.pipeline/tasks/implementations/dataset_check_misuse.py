@@ -1,12 +1,17 @@
+import json
 import logging
-from os import listdir, path
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from os import listdir, path, replace, cpu_count, stat
 from os.path import join, isdir, basename, exists
-from typing import Dict, List
+from stat import S_ISDIR
+from typing import Dict, List, Optional, Set, Tuple
 
 from data.misuse import Misuse
 from data.project import Project
 from data.project_version import ProjectVersion
-from data.snippets import get_snippets, SnippetUnavailableException
+from data.snippets import get_snippets_batch
+from utils.io import safe_open
 
 VALID_VIOLATION_TYPES = [
     'missing/call',
@@ -43,31 +48,144 @@ def _get_all_misuses(data_base_path: str) -> List[str]:
     return misuses
 
 
+class MisuseCheckCache:
+    """
+    Remembers the reports of the checks of each misuse, identified by the content of its metadata, such that checking
+    an unchanged dataset neither reads the metadata nor looks at the checkouts again. Each entry lists the files and
+    directories its checks depend on, e.g., the source files that may contain the misuse's location, and applies only
+    while they remain the same. It also remembers whether misuse locations exist, such that changing a misuse's
+    metadata does not extract its method again. Files are identified by their content, which is hashed again only if
+    their size or modification time changes. Only the results used by a check are saved, such that results for removed
+    misuses or outdated sources do not pile up.
+    """
+
+    __DIRECTORY = "-directory-"
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        previous = self.__load()
+        self.__previous_files = previous.get("files", {})  # type: Dict[str, List]
+        self.__previous_locations = previous.get("locations", {})  # type: Dict[str, bool]
+        self.__previous_misuses = previous.get("misuses", {})  # type: Dict[str, Dict]
+        self.__files = {}  # type: Dict[str, List]
+        self.__locations = {}  # type: Dict[str, bool]
+        self.__misuses = {}  # type: Dict[str, Dict]
+
+    def get_key(self, paths: List[str], *values: str) -> str:
+        fingerprint = sha1()
+        for value in values:
+            fingerprint.update("{}\n".format(value).encode("utf-8"))
+        for path_ in paths:
+            fingerprint.update("{}\n{}\n".format(path_, self.get_path_state(path_)).encode("utf-8"))
+        return fingerprint.hexdigest()
+
+    def get_path_state(self, path_: str) -> Optional[str]:
+        try:
+            stat_ = stat(path_)
+        except OSError:
+            return None
+        if S_ISDIR(stat_.st_mode):
+            return MisuseCheckCache.__DIRECTORY
+
+        file_state = [stat_.st_mtime_ns, stat_.st_size]
+        file_ = self.__files.get(path_, self.__previous_files.get(path_, None))
+        if file_ is None or file_[:2] != file_state:
+            with open(path_, 'rb') as source_file:
+                file_ = file_state + [sha1(source_file.read()).hexdigest()]
+        self.__files[path_] = file_
+        return file_[2]
+
+    def get_location(self, key: str) -> Optional[bool]:
+        result = self.__locations.get(key, self.__previous_locations.get(key, None))
+        if result is not None:
+            self.__locations[key] = result
+        return result
+
+    def add_location(self, key: str, result: bool):
+        self.__locations[key] = result
+
+    def get_misuse_reports(self, key: str) -> Optional[List[str]]:
+        entry = self.__misuses.get(key, self.__previous_misuses.get(key, None))
+        if entry is None:
+            return None
+        for path_, state in entry["dependencies"].items():
+            if self.get_path_state(path_) != state:
+                return None
+        self.__misuses[key] = entry
+        return entry["reports"]
+
+    def add_misuse_reports(self, key: str, dependencies: List[str], reports: List[str]):
+        self.__misuses[key] = {"dependencies": {path_: self.get_path_state(path_) for path_ in dependencies},
+                               "reports": reports}
+
+    def save(self):
+        # replace the file at once, such that an interrupted check does not corrupt the cache
+        temp_file_path = self.file_path + ".tmp"
+        with safe_open(temp_file_path, 'w') as file:
+            json.dump({"files": self.__files, "locations": self.__locations, "misuses": self.__misuses}, file)
+        replace(temp_file_path, self.file_path)
+
+    def __load(self) -> Dict[str, Dict]:
+        if not exists(self.file_path):
+            return {}
+        try:
+            with open(self.file_path, encoding="utf-8") as file:
+                previous = json.load(file)
+        except ValueError:
+            return {}
+        return previous if isinstance(previous, dict) and "misuses" in previous else {}
+
+
 class MisuseCheckTask:
-    def __init__(self, datasets: Dict[str, List[str]], checkout_base_path: str, data_base_path: str):
+    def __init__(self, datasets: Dict[str, List[str]], checkout_base_path: str, data_base_path: str,
+                 check_cache: Optional[MisuseCheckCache] = None, location_check_jobs: int = 0):
         super().__init__()
         self.logger = logging.getLogger("tasks.datasetcheck")
         self.datasets = datasets
         self.checkout_base_path = checkout_base_path
         self.data_base_path = data_base_path
-        self.registered_entries = set()
-        self.misuses_not_listed_in_any_version = _get_all_misuses(data_base_path)
+        self.check_cache = check_cache
+        self.location_check_jobs = location_check_jobs or cpu_count() or 1
+        self.__source_base_paths = {}  # type: Dict[str, Tuple[Tuple[str, ...], bool]]
+        self.__location_check_results = {}  # type: Dict[Tuple[Tuple[str, ...], str, str], bool]
+        self.__reports = []  # type: List[str]
+        self.__dependencies = []  # type: List[str]
+        self.registered_entries = set()  # type: Set[str]
+        self.misuses_not_listed_in_any_version = set(_get_all_misuses(data_base_path))  # type: Set[str]
         self._report_invalid_dataset_entries()
         self._check_for_conflicting_dataset_names(datasets.keys())
 
-    def run(self, project: Project, version: ProjectVersion, misuse: Misuse):
+    def run(self, project: Project, version: ProjectVersion, misuse: Misuse) -> None:
         self.logger = logging.getLogger("datasetcheck.project.version.misuse")
         self._register_existing_dataset_entry(misuse.id)
         self._register_misuse_is_linked_from_version(project.id, misuse.misuse_id)
+
+        key = None
+        if self.check_cache:
+            key = self.check_cache.get_key([misuse.misuse_file, version.version_file], self.checkout_base_path,
+                                           self.data_base_path, project.repository.vcstype)
+            reports = self.check_cache.get_misuse_reports(key)
+            if reports is not None:
+                for report in reports:
+                    self.logger.warning(report)
+                return
+
+        self.__reports = []
+        self.__dependencies = []
         self._check_required_keys_in_misuse_yaml(project, misuse)
         self._check_misuse_location_exists(version, misuse)
         self._check_violation_types(misuse)
 
+        if self.check_cache:
+            self.check_cache.add_misuse_reports(key, self.__dependencies, self.__reports)
+
     def end(self):
         self.logger = logging.getLogger("datasetcheck.misuse")
         self._report_misuses_not_listed_in_any_version()
         self.logger = logging.getLogger("datasetcheck")
         self._report_unknown_dataset_entries()
+        if self.check_cache:
+            self.check_cache.save()
 
     def _check_required_keys_in_misuse_yaml(self, project: Project, misuse: Misuse):
         yaml_path = self._get_rel_misuse_file_path(misuse)
@@ -123,22 +241,78 @@ class MisuseCheckTask:
         if "location" in misuse._yaml:
             location = misuse.location
             if location.file and location.method:
-                checkout = version.get_checkout(self.checkout_base_path)
-                if not checkout or not checkout.exists():
+                source_base_paths, is_checked_out = self._get_source_base_paths(version)
+                # the check changes once the checkout appears or the source files change
+                self.__dependencies.extend(source_base_paths)
+                self.__dependencies.extend(join(source_base_path, location.file)
+                                           for source_base_path in source_base_paths)
+                if not is_checked_out:
                     self.logger.debug(
                         'Skipping location check for "{}": requires checkout of "{}".'.format(
                             misuse.id, version.id))
                 else:
-                    source_base_paths = [join(checkout.base_path, src_dir) for src_dir in version.source_dirs]
-                    if not self._location_exists(source_base_paths, location.file, location.method):
+                    lookup = (source_base_paths, location.file, location.method)
+                    if lookup not in self.__location_check_results:
+                        self._resolve_location_checks(version, source_base_paths)
+                    if not self.__location_check_results[lookup]:
                         self._report_cannot_find_location(str(location), self._get_rel_misuse_file_path(misuse))
 
-    @staticmethod
-    def _location_exists(source_base_paths, file_, method) -> bool:
+    def _get_source_base_paths(self, version: ProjectVersion) -> Tuple[Tuple[str, ...], bool]:
+        if version.id not in self.__source_base_paths:
+            checkout = version.get_checkout(self.checkout_base_path)
+            source_base_paths = tuple(join(checkout.base_path, src_dir) for src_dir in version.source_dirs)
+            self.__source_base_paths[version.id] = (source_base_paths, checkout.exists())
+        return self.__source_base_paths[version.id]
+
+    def _resolve_location_checks(self, version: ProjectVersion, source_base_paths: Tuple[str, ...]):
+        # checks the locations of all misuses of the version at once, such that the checks run in parallel, while each
+        # misuse still reports its location in its place among the other reports
+        lookups = {}  # type: Dict[Tuple[Tuple[str, ...], str, str], Optional[bool]]
+        for misuse in version.misuses:
+            if "location" in misuse._yaml:
+                location = misuse.location
+                if location.file and location.method:
+                    lookups[(source_base_paths, location.file, location.method)] = None
+
+        cache_keys = {}
+        if self.check_cache:
+            for lookup in lookups:
+                source_base_paths, file_, method = lookup
+                cache_keys[lookup] = self.check_cache.get_key(
+                    [join(source_base_path, file_) for source_base_path in source_base_paths], file_, method)
+                lookups[lookup] = self.check_cache.get_location(cache_keys[lookup])
+
+        # one batch per source file, such that the batches share no work and run in parallel
+        batches = {}
+        for lookup, location_exists in lookups.items():
+            if location_exists is None:
+                batches.setdefault((lookup[0], lookup[1]), []).append(lookup)
+        if batches:
+            self.logger.debug("Checking %d location(s) in %d source file(s).", sum(map(len, batches.values())),
+                              len(batches))
+            with ThreadPoolExecutor(max_workers=self.location_check_jobs) as executor:
+                for batch, results in zip(batches.values(), executor.map(self._check_locations, batches.values())):
+                    for lookup, location_exists in zip(batch, results):
+                        lookups[lookup] = bool(location_exists)
+                        # does not cache failed checks, such that the next run checks them again
+                        if self.check_cache and location_exists is not None:
+                            self.check_cache.add_location(cache_keys[lookup], location_exists)
+
+        self.__location_check_results.update(lookups)
+
+    def _check_locations(self, lookups: List[Tuple[Tuple[str, ...], str, str]]) -> List[Optional[bool]]:
+        source_base_paths, file_, _ = lookups[0]
         try:
-            return len(get_snippets(source_base_paths, file_, method)) > 0
-        except SnippetUnavailableException:
-            return False
+            return self._locations_exist(list(source_base_paths), file_, [method for _, _, method in lookups])
+        except Exception as e:
+            # like a single location check, a failing check does not find the location, but the others continue
+            self.logger.debug("Failed to check locations in \"%s\": %s", file_, e)
+            return [None] * len(lookups)
+
+    @staticmethod
+    def _locations_exist(source_base_paths, file_, methods) -> List[bool]:
+        snippets = get_snippets_batch(source_base_paths, [(file_, method, -1) for method in methods])
+        return [len(method_snippets) > 0 for method_snippets in snippets]
 
     def _check_violation_types(self, misuse: Misuse):
         violation_types = misuse._yaml.get("violations", [])
@@ -148,14 +322,10 @@ class MisuseCheckTask:
                 self._report_invalid_violation_type(violation_type, file_path)
 
     def _register_existing_dataset_entry(self, misuse_id: str):
-        for dataset, entries in self.datasets.items():
-            if misuse_id in entries:
-                entries.remove(misuse_id)
+        self.registered_entries.add(misuse_id)
 
     def _register_misuse_is_linked_from_version(self, project_id: str, misuse_id: str):
-        misuse = "{}.{}".format(project_id, misuse_id)
-        if misuse in self.misuses_not_listed_in_any_version:
-            self.misuses_not_listed_in_any_version.remove(misuse)
+        self.misuses_not_listed_in_any_version.discard("{}.{}".format(project_id, misuse_id))
 
     def _report_invalid_dataset_entries(self):
         datasets_without_invalid_entries = dict()
@@ -182,20 +352,25 @@ class MisuseCheckTask:
     def _report_unknown_dataset_entries(self):
         for dataset, entries in self.datasets.items():
             for entry in entries:
-                self._report_unknown_dataset_entry(dataset, entry)
+                if entry not in self.registered_entries:
+                    self._report_unknown_dataset_entry(dataset, entry)
 
     def _report_misuses_not_listed_in_any_version(self):
-        for misuse in self.misuses_not_listed_in_any_version:
+        for misuse in sorted(self.misuses_not_listed_in_any_version):
             self._report_misuse_not_listed(misuse)
 
+    def _report(self, report: str):
+        self.logger.warning(report)
+        self.__reports.append(report)
+
     def _report_missing_key(self, tag: str, file_path: str):
-        self.logger.warning('Missing "{}" in "{}".'.format(tag, file_path))
+        self._report('Missing "{}" in "{}".'.format(tag, file_path))
 
     def _report_id_conflict(self, conflicting_id: str):
         self.logger.warning('ID "{}" is used for multiple data entries.'.format(conflicting_id))
 
     def _report_cannot_find_location(self, location: str, misuse_yaml_path: str):
-        self.logger.warning('Cannot find "{}" listed in "{}".'.format(location, misuse_yaml_path))
+        self._report('Cannot find "{}" listed in "{}".'.format(location, misuse_yaml_path))
 
     def _report_unknown_dataset_entry(self, dataset: str, entry: str):
         self.logger.warning('Unknown dataset entry "{}" in dataset "{}".'.format(entry, dataset))
@@ -204,7 +379,7 @@ class MisuseCheckTask:
         self.logger.warning('Misuse "{}" is not listed in any versions.'.format(misuse_id))
 
     def _report_invalid_violation_type(self, violation_type: str, file_path: str):
-        self.logger.warning('Invalid violation type "{}" in "{}"'.format(violation_type, file_path))
+        self._report('Invalid violation type "{}" in "{}"'.format(violation_type, file_path))
 
     def _report_invalid_dataset_entry(self, dataset: str, invalid_entry: str):
         self.logger.warning('Invalid dataset entry "{}" in "{}". '
@@ -7,7 +7,7 @@ class ProjectCheckTask:
     def __init__(self):
         self.logger = logging.getLogger("datasetcheck.project")
 
-    def run(self, project: Project):
+    def run(self, project: Project) -> None:
         self._check_required_keys_in_project_yaml(project)
 
     def _check_required_keys_in_project_yaml(self, project: Project):
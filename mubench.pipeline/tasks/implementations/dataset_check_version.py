@@ -12,7 +12,7 @@ class VersionCheckTask:
     def __init__(self):
         self.logger = logging.getLogger("datasetcheck.project.version")
 
-    def run(self, project: Project, version: ProjectVersion):
+    def run(self, project: Project, version: ProjectVersion) -> None:
         self._check_required_keys_in_version_yaml(project, version)
         self._check_misuses_listed_in_version_exist(project, version)
 
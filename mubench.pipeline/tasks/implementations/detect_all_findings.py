@@ -8,20 +8,23 @@ from data.project_version import ProjectVersion
 from data.version_compile import VersionCompile
 from tasks.configurations.detector_interface_configuration import key_detector_mode, \
     key_target_src_paths, key_target_classes_paths, key_dependency_classpath
+from utils.memory_budget import MemoryBudget
 
 
 class DetectAllFindingsTask:
     __RUN_MODE_NAME = "mine_and_detect"
     __DETECTOR_MODE = 0
 
-    def __init__(self, findings_base_path: str, force_detect: bool, timeout: Optional[int], current_timestamp: int):
+    def __init__(self, findings_base_path: str, force_detect: bool, timeout: Optional[int], current_timestamp: int,
+                 memory_budget: Optional[MemoryBudget] = None):
         self.findings_base_path = findings_base_path
         self.force_detect = force_detect
         self.timeout = timeout
         self.current_timestamp = current_timestamp
+        self.memory_budget = memory_budget
 
-    def run(self, detector: Detector, version: ProjectVersion, version_compile: VersionCompile):
-        run = DetectorRun(detector, version, self._get_findings_path(detector, version))
+    def run(self, detector: Detector, version: ProjectVersion, version_compile: VersionCompile) -> DetectorRun:
+        run = DetectorRun(detector, version, self._get_findings_path(detector, version), self.memory_budget)
 
         run.ensure_executed(self._get_detector_arguments(version_compile),
                             self.timeout, self.force_detect, self.current_timestamp, version_compile.timestamp,
@@ -2,6 +2,6 @@ from data.misuse import Misuse
 
 
 class FilterMisusesWithoutCorrectUsagesTask:
-    def run(self, misuse: Misuse):
+    def run(self, misuse: Misuse) -> None:
         if not misuse.correct_usages:
             raise UserWarning("Skipping {}: no correct usages.".format(misuse))
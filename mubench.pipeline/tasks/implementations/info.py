@@ -11,7 +11,7 @@ class ProjectInfoTask:
         self.__checkouts_path = checkouts_path
         self.__compiles_path = compiles_path
 
-    def run(self, project: Project):
+    def run(self, project: Project) -> None:
         self.__logger.info("- Project    : %s", project.name)
         self.__logger.info("  Repository : %s:%s", project.repository.vcstype, project.repository.url)
 
@@ -22,7 +22,7 @@ class VersionInfoTask:
         self.__checkouts_path = checkouts_path
         self.__compiles_path = compiles_path
 
-    def run(self, project: Project, version: ProjectVersion):
+    def run(self, project: Project, version: ProjectVersion) -> None:
         self.__logger.info("  - Version  : %s", version.version_id)
         revision = "-"
         if project.repository.vcstype == "git":
@@ -51,7 +51,7 @@ class MisuseInfoTask:
         self.__checkouts_path = checkouts_path
         self.__compiles_path = compiles_path
 
-    def run(self, misuse: Misuse):
+    def run(self, misuse: Misuse) -> None:
         self.__logger.info("    - Misuse           : %s", misuse.misuse_id)
         self.__logger.info("      Description      : %s", misuse.description.strip())
         self.__logger.info("      Fix Description  : %s", misuse.fix.description.strip())
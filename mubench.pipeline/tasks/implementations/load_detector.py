@@ -15,7 +15,7 @@ class LoadDetectorTask:
         self.requested_release = requested_release
         self.java_options = java_options
 
-    def run(self):
+    def run(self) -> Detector:
         logger = logging.getLogger("task.download_detector")
         detector = self._get_detector()
 
@@ -0,0 +1,218 @@
+import logging
+from collections import namedtuple
+from typing import List, Optional, Set, Tuple, Union
+
+from data.detector import Detector
+from data.detector_run import DetectorRun
+from data.misuse import Misuse
+from data.misuse_compile import MisuseCompile
+from data.project_checkout import ProjectCheckout
+from data.project_version import ProjectVersion
+from data.runtime_history import RuntimeHistory
+from data.version_compile import VersionCompile
+from tasks.implementations.checkout import CheckoutTask
+from tasks.implementations.compile_misuse import CompileMisuseTask
+from tasks.implementations.compile_version import CompileVersionTask
+from tasks.implementations.detect_all_findings import DetectAllFindingsTask
+from tasks.implementations.detect_provided_correct_usages import DetectProvidedCorrectUsagesTask
+from tasks.implementations.load_detector import LoadDetectorTask
+
+PlanItem = namedtuple("PlanItem", ["action", "subject", "is_executed", "reason", "expected_runtime"])
+
+
+class RunPlan:
+    """
+    Collects the downloads, checkouts, compiles, and detector runs that a run would execute or skip, with the expected
+    runtime of the detector runs.
+    """
+
+    def __init__(self):
+        self.items = []  # type: List[PlanItem]
+        self.__executed = set()  # type: Set[Tuple[str, str]]
+        self.logger = logging.getLogger("tasks.plan")
+
+    def add(self, action: str, subject, is_executed: bool, reason: str, expected_runtime: Optional[float] = None):
+        self.items.append(PlanItem(action, str(subject), is_executed, reason, expected_runtime))
+        if is_executed:
+            self.__executed.add((action, str(subject)))
+
+    def is_executed(self, action: str, subject) -> bool:
+        return (action, str(subject)) in self.__executed
+
+    def get_items(self, action: str, is_executed: bool) -> List[PlanItem]:
+        return [item for item in self.items if item.action == action and item.is_executed == is_executed]
+
+    def get_expected_runtime(self) -> float:
+        return sum(item.expected_runtime or 0 for item in self.items if item.is_executed)
+
+    def report(self):
+        for action in ["download", "checkout", "compile", "compile correct usages", "detect"]:
+            executed_items = self.get_items(action, True)
+            skipped_items = self.get_items(action, False)
+            if not executed_items and not skipped_items:
+                continue
+
+            self.logger.info("%s: %d to execute, %d to skip", action.capitalize(), len(executed_items),
+                             len(skipped_items))
+            # longest first, since these are the ones to start early
+            for item in sorted(executed_items, key=lambda item: -(item.expected_runtime or 0)):
+                self.logger.info("    execute %s (%s)%s", item.subject, item.reason,
+                                 _format_runtime(item.expected_runtime))
+            for item in skipped_items:
+                self.logger.debug("    skip %s (%s)", item.subject, item.reason)
+
+        unestimated_items = [item for item in self.items
+                             if item.is_executed and item.action == "detect" and item.expected_runtime is None]
+        self.logger.info("Expected detector runtime: %.0fs (%d run(s) without previous runtime)",
+                         self.get_expected_runtime(), len(unestimated_items))
+
+
+def _format_runtime(runtime: Optional[float]) -> str:
+    return "" if runtime is None else " ~{:.0f}s".format(runtime)
+
+
+class PlanLoadDetectorTask:
+    def __init__(self, load_detector: LoadDetectorTask, plan: RunPlan):
+        self.load_detector = load_detector
+        self.plan = plan
+
+    def run(self) -> Detector:
+        detector = self.load_detector._get_detector()
+        is_available = LoadDetectorTask._detector_available(detector)
+        self.plan.add("download", detector, not is_available, "available" if is_available else "missing")
+        return detector
+
+
+class PlanCheckoutTask:
+    def __init__(self, checkout: CheckoutTask, plan: RunPlan):
+        self.checkout = checkout
+        self.plan = plan
+
+    def run(self, version: ProjectVersion) -> ProjectCheckout:
+        try:
+            checkout = version.get_checkout(self.checkout.checkouts_path)
+        except ValueError as e:
+            raise UserWarning("Checkout data corrupted: %s", e)
+
+        if self.checkout.force_checkout:
+            self.plan.add("checkout", version, True, "forced")
+        elif checkout.exists():
+            self.plan.add("checkout", version, False, "exists")
+        else:
+            self.plan.add("checkout", version, True, "missing")
+
+        return checkout
+
+
+class PlanCompileVersionTask:
+    def __init__(self, compile_version: CompileVersionTask, plan: RunPlan):
+        self.compile_version = compile_version
+        self.plan = plan
+
+    def run(self, version: ProjectVersion, checkout: ProjectCheckout) -> Union[VersionCompile, List]:
+        version_compile = version.get_compile(self.compile_version.compiles_base_path)
+
+        if not version.is_compilable:
+            self.plan.add("compile", version, False, "not configured")
+            return []
+
+        if self.compile_version.force_compile:
+            self.plan.add("compile", version, True, "forced")
+        elif self.plan.is_executed("checkout", version) or version_compile.is_outdated(checkout.timestamp):
+            self.plan.add("compile", version, True, "checkout changed")
+        elif version_compile.needs_compile():
+            self.plan.add("compile", version, True, "missing")
+        else:
+            self.plan.add("compile", version, False, "up to date")
+
+        return version_compile
+
+
+class PlanCompileMisuseTask:
+    def __init__(self, compile_misuse: CompileMisuseTask, plan: RunPlan):
+        self.compile_misuse = compile_misuse
+        self.plan = plan
+
+    def run(self, version: ProjectVersion, misuse: Misuse, version_compile: VersionCompile) -> MisuseCompile:
+        misuse_compile = misuse.get_misuse_compile(self.compile_misuse.compile_base_path)
+
+        if not misuse.correct_usages:
+            self.plan.add("compile correct usages", misuse, False, "no correct usages")
+        elif self.compile_misuse.force_compile:
+            self.plan.add("compile correct usages", misuse, True, "forced")
+        elif self.plan.is_executed("compile", version) or misuse_compile.is_outdated(version_compile.timestamp):
+            self.plan.add("compile correct usages", misuse, True, "compile changed")
+        elif misuse_compile.needs_copy_sources() or misuse_compile.needs_compile():
+            self.plan.add("compile correct usages", misuse, True, "missing")
+        else:
+            self.plan.add("compile correct usages", misuse, False, "up to date")
+
+        return misuse_compile
+
+
+class _PlanDetectTask:
+    def __init__(self, force_detect: bool, run_timestamp: int, plan: RunPlan):
+        self.force_detect = force_detect
+        self.run_timestamp = run_timestamp
+        self.plan = plan
+
+    def _plan_run(self, run: DetectorRun, subject, compile_timestamp: int, expected_runtime: Optional[float]):
+        if run.needs_execution(self.force_detect, compile_timestamp):
+            if self.force_detect:
+                reason = "forced"
+            elif run.is_outdated(compile_timestamp):
+                reason = "outdated"
+            else:
+                reason = "no previous run"
+            self.plan.add("detect", subject, True, reason, expected_runtime)
+        elif run.is_failure():
+            self.plan.add("detect", subject, False, "previous run failed")
+        else:
+            self.plan.add("detect", subject, False, "previous run succeeded")
+
+    @staticmethod
+    def _get_previous_runtime(run: DetectorRun) -> Optional[float]:
+        if run.result is None:
+            return None
+        try:
+            return float(run.runtime)
+        except (TypeError, ValueError):
+            return None
+
+    def end(self):
+        self.plan.report()
+
+
+class PlanDetectAllFindingsTask(_PlanDetectTask):
+    def __init__(self, detect: DetectAllFindingsTask, runtime_history: RuntimeHistory, plan: RunPlan):
+        super().__init__(detect.force_detect, detect.current_timestamp, plan)
+        self.detect = detect
+        self.runtime_history = runtime_history
+
+    def run(self, detector: Detector, version: ProjectVersion, version_compile: VersionCompile) -> DetectorRun:
+        run = DetectorRun(detector, version, self.detect._get_findings_path(detector, version))
+        compile_timestamp = self.run_timestamp if self.plan.is_executed("compile", version) \
+            else version_compile.timestamp
+
+        expected_runtime = self._get_previous_runtime(run)
+        if expected_runtime is None:
+            # fall back to the runtimes of other detectors or experiments on the same version
+            expected_runtime = self.runtime_history.get_version_runtime(version.id)
+
+        self._plan_run(run, version, compile_timestamp, expected_runtime)
+        return run
+
+
+class PlanDetectProvidedCorrectUsagesTask(_PlanDetectTask):
+    def __init__(self, detect: DetectProvidedCorrectUsagesTask, plan: RunPlan):
+        super().__init__(detect.force_detect, detect.current_timestamp, plan)
+        self.detect = detect
+
+    def run(self, detector: Detector, version: ProjectVersion, misuse: Misuse,
+            misuse_compile: MisuseCompile) -> DetectorRun:
+        run = DetectorRun(detector, version, self.detect._get_findings_path(detector, version, misuse))
+        compile_timestamp = self.run_timestamp if self.plan.is_executed("compile correct usages", misuse) \
+            else misuse_compile.timestamp
+
+        self._plan_run(run, misuse, compile_timestamp, self._get_previous_runtime(run))
+        return run
@@ -13,7 +13,7 @@ from data.detector_specialising.specialising_util import replace_dot_graph_with_
 from data.finding import Finding
 from data.project import Project
 from data.project_version import ProjectVersion
-from data.snippets import SnippetUnavailableException
+from data.snippets import SnippetUnavailableException, Snippet
 from data.version_compile import VersionCompile
 from tasks.implementations.findings_filters import PotentialHits
 from utils.size import total_size
@@ -40,7 +40,7 @@ class PublishFindingsTask:
                 "Enter review-site password for '{}': ".format(self.review_site_user))
 
     def run(self, project: Project, version: ProjectVersion, detector_run: DetectorRun,
-            potential_hits: PotentialHits, version_compile: VersionCompile, detector: Detector):
+            potential_hits: PotentialHits, version_compile: VersionCompile, detector: Detector) -> None:
         logger = logging.getLogger("tasks.publish_findings.version")
         logger.info("Publishing findings of %s in %s on %s for upload to %s...",
                     detector, self.experiment_id, version, self.review_site_url)
@@ -59,9 +59,10 @@ class PublishFindingsTask:
             result = "not run"
 
         run_info = detector_run.get_run_info()
+        snippets = self.__get_snippets(potential_hits.findings, version_compile, logger)
         postable_potential_hits = [
-            self.__to_postable_potential_hit(potential_hit, version_compile, detector_run.findings_path, logger)
-            for potential_hit in potential_hits.findings]
+            self.__to_postable_potential_hit(potential_hit, potential_hit_snippets, detector_run.findings_path)
+            for potential_hit, potential_hit_snippets in zip(potential_hits.findings, snippets)]
 
         try:
             for postable_potential_hits_slice in self.__slice_by_number_of_files_and_post_size(postable_potential_hits):
@@ -99,24 +100,21 @@ class PublishFindingsTask:
 
         return data
 
-    def __to_postable_potential_hit(self, potential_hit: Finding, version_compile: VersionCompile,
-                                    findings_path, logger) -> 'SpecializedFinding':
+    def __to_postable_potential_hit(self, potential_hit: Finding, snippets: List[Snippet],
+                                    findings_path) -> 'SpecializedFinding':
         files = self._convert_graphs_to_files(potential_hit, findings_path)
         postable_potential_hit = self._to_markdown_dict(potential_hit)
-        postable_potential_hit[_SNIPPETS_KEY] = self.__get_postable_snippets(potential_hit, version_compile, logger)
+        postable_potential_hit[_SNIPPETS_KEY] = [snippet.__dict__ for snippet in snippets]
         return SpecializedFinding(postable_potential_hit, files)
 
     @staticmethod
-    def __get_postable_snippets(finding: Finding, version_compile: VersionCompile, logger) -> List[Dict]:
-        return [snippet.__dict__ for snippet in PublishFindingsTask.__get_snippets(finding, version_compile, logger)]
-
-    @staticmethod
-    def __get_snippets(finding, version_compile, logger):
-        try:
-            return finding.get_snippets(version_compile.original_sources_paths)
-        except SnippetUnavailableException as e:
-            logger.warning(e)
-            return []
+    def __get_snippets(findings: List[Finding], version_compile: VersionCompile, logger) -> List[List[Snippet]]:
+        # one batch for all findings, since many findings are in the same few files
+        snippets = Finding.get_snippets_batch(findings, version_compile.original_sources_paths)
+        for finding, finding_snippets in zip(findings, snippets):
+            if not finding_snippets:
+                logger.warning(SnippetUnavailableException(finding.get("file", ""), finding.get("method", "")))
+        return snippets
 
     @staticmethod
     def _to_markdown_dict(finding: Finding) -> Dict[str, str]:
@@ -8,6 +8,7 @@ from urllib.parse import urljoin
 from requests import RequestException
 
 from data.misuse import Misuse
+from data.misuse_version_index import get_misuse_version_index
 from data.project import Project
 from data.snippets import SnippetUnavailableException
 from utils.io import safe_read
@@ -24,6 +25,7 @@ class PublishMetadataTask:
         self.review_site_password = review_site_password
 
         self.__metadata = []  # type: List[Dict]
+        self.__misuse_version_index = get_misuse_version_index()
 
         if self.review_site_user and not self.review_site_password:
             self.review_site_password = getpass.getpass(
@@ -31,9 +33,9 @@ class PublishMetadataTask:
 
         self.__metadata.clear()
 
-    def run(self, project: Project, misuse: Misuse):
+    def run(self, project: Project, misuse: Misuse) -> None:
         logger = logging.getLogger("tasks.publish_metadata")
-        versions = [version for version in project.versions if misuse in version.misuses]
+        versions = self.__misuse_version_index.get_versions(project, misuse)
         if len(versions) == 1:
             version = versions[0]
         else:
@@ -44,7 +46,11 @@ class PublishMetadataTask:
             "project": project.id,
             "version": version.version_id,
             "misuse": misuse.misuse_id,
-            "location": misuse.location.__dict__,
+            "location": {
+                "file": misuse.location.file,
+                "method": misuse.location.method,
+                "line": misuse.location.line
+            },
             "description": misuse.description,
             "violations": misuse.violations,
             "fix": {
@@ -0,0 +1,109 @@
+import json
+import logging
+from statistics import median
+from typing import List, Optional, Set
+
+from data.project_version import ProjectVersion
+from data.runtime_history import RuntimeHistory
+from tasks.implementations.collect_projects import CollectProjectsTask
+from tasks.implementations.collect_versions import CollectVersionsTask
+from utils.data_entity_lists import DataEntityLists
+from utils.io import write_once
+from utils.work_queue import WorkQueue
+
+
+class Shard:
+    def __init__(self, index: int, count: int, is_stealing: bool = False):
+        self.index = index
+        self.count = count
+        self.is_stealing = is_stealing
+
+    def __str__(self):
+        return "shard {}/{}{}".format(self.index, self.count, " (stealing)" if self.is_stealing else "")
+
+
+class CollectShardsTask:
+    """
+    Yields this node's shard. With a work queue, it yields a second pass over the project versions afterwards, in
+    which the node takes over the versions of other shards that no other node claimed so far.
+    """
+
+    def __init__(self, index: int, count: int, work_queue: Optional[WorkQueue] = None):
+        self.index = index
+        self.count = count
+        self.work_queue = work_queue
+
+    def run(self) -> List[Shard]:
+        shards = [Shard(self.index, self.count)]
+        if self.work_queue:
+            shards.append(Shard(self.index, self.count, is_stealing=True))
+        return shards
+
+
+class FilterShardVersionsTask:
+    """
+    Partitions the project versions into shards of about the same expected runtime and keeps the versions of the
+    current shard. Since nodes may see different runtime histories, the first node shares its partition, in the
+    partition file or else in the work queue, and all nodes use that partition. Without either, each node uses its
+    own partition.
+    """
+
+    def __init__(self, collect_projects: CollectProjectsTask, collect_versions: CollectVersionsTask,
+                 runtime_history: RuntimeHistory, work_queue: Optional[WorkQueue] = None,
+                 partition_file_path: Optional[str] = None):
+        self.collect_projects = collect_projects
+        self.collect_versions = collect_versions
+        self.runtime_history = runtime_history
+        self.work_queue = work_queue
+        self.partition_file_path = partition_file_path
+        self.logger = logging.getLogger("tasks.shard")
+        self.__shards = None  # type: Optional[List[Set[str]]]
+
+    def run(self, shard: Shard, version: ProjectVersion, data_entity_lists: DataEntityLists) -> Optional[List]:
+        is_in_shard = version.id in self.__get_shards(shard.count, data_entity_lists)[shard.index - 1]
+        if is_in_shard == shard.is_stealing:
+            return []
+
+        if self.work_queue and not self.work_queue.claim(version.id):
+            self.logger.debug("Skipping %s, which another node claimed.", version)
+            return []
+
+        self.logger.debug("Running %s in %s.", version, shard)
+
+    def __get_shards(self, count: int, data_entity_lists: DataEntityLists) -> List[Set[str]]:
+        if self.__shards is None:
+            versions = [version for project in self.collect_projects.run(data_entity_lists)
+                        for version in self.collect_versions.run(project, data_entity_lists)]
+            self.__shards = self.__share(partition(versions, count, self.runtime_history))
+            if {version.id for version in versions} != set().union(*self.__shards) or len(self.__shards) != count:
+                raise ValueError("shared partition does not split the same project versions into {} shards".format(
+                    count))
+            self.logger.info("Partitioned %d project versions into %d shards.", len(versions), count)
+        return self.__shards
+
+    def __share(self, shards: List[Set[str]]) -> List[Set[str]]:
+        encoded_shards = json.dumps([sorted(shard) for shard in shards])
+        if self.partition_file_path:
+            encoded_shards = write_once(encoded_shards, self.partition_file_path)
+        elif self.work_queue:
+            encoded_shards = self.work_queue.share("partition", encoded_shards)
+        return [set(shard) for shard in json.loads(encoded_shards)]
+
+
+def partition(versions: List[ProjectVersion], count: int, runtime_history: RuntimeHistory) -> List[Set[str]]:
+    """
+    Assigns the versions, longest expected runtime first, to the shard with the least total expected runtime so far.
+    Versions without recorded runtime are expected to take the median of the recorded runtimes.
+    """
+    runtimes = {version.id: runtime_history.get_version_runtime(version.id) for version in versions}
+    recorded_runtimes = [runtime for runtime in runtimes.values() if runtime is not None]
+    default_runtime = median(recorded_runtimes) if recorded_runtimes else 1
+    runtimes = {version_id: default_runtime if runtime is None else runtime for version_id, runtime in runtimes.items()}
+
+    shards = [set() for _ in range(count)]
+    shard_runtimes = [0] * count
+    for version_id in sorted(runtimes, key=lambda version_id: (-runtimes[version_id], version_id)):
+        shard_index = min(range(count), key=lambda index: (shard_runtimes[index], index))
+        shards[shard_index].add(version_id)
+        shard_runtimes[shard_index] += runtimes[version_id]
+    return shards
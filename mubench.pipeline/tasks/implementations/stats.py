@@ -2,15 +2,14 @@
 import logging
 from typing import Optional, List, Dict
 
-import yaml
-
 from data.misuse import Misuse
 from data.project import Project
 from data.project_version import ProjectVersion
+from utils.io import read_yaml
 
 
 class StatCalculatorTask:
-    def run(self, project: Project, version: ProjectVersion, misuse: Misuse):
+    def run(self, project: Project, version: ProjectVersion, misuse: Misuse) -> None:
         raise NotImplementedError
 
     def end(self):
@@ -46,7 +45,7 @@ class general(StatCalculatorTask):
 
         self.logger = logging.getLogger('stats.general')
 
-    def run(self, project: Project, version: ProjectVersion, misuse: Misuse):
+    def run(self, project: Project, version: ProjectVersion, misuse: Misuse) -> None:
         self.sources.add(misuse.source)
         if not project.id.startswith("synthetic_"):
             self.projects.add(project.id)
@@ -93,7 +92,7 @@ class violation(StatCalculatorTask):
         self.total = " total"
         self.logger = logging.getLogger('stats.violation')
 
-    def run(self, project: Project, version: ProjectVersion, misuse: Misuse):
+    def run(self, project: Project, version: ProjectVersion, misuse: Misuse) -> None:
         chars = misuse.violations
         for char in chars:
             seg = char.split('/')
@@ -138,7 +137,7 @@ class project(StatCalculatorTask):
 
         self.logger = logging.getLogger('stats.project')
 
-    def run(self, project: Project, version: ProjectVersion, misuse: Misuse):
+    def run(self, project: Project, version: ProjectVersion, misuse: Misuse) -> None:
         projectname = project.name
         project = self.projects.get(projectname, {"misuses": 0, "crashes": 0})
         project["misuses"] += 1
@@ -163,14 +162,13 @@ class source(StatCalculatorTask):
 
     def start(self):
         filename = "sources.yml"
-        with open(filename) as file:
-            sources = yaml.load(file)
-            for source in sources:
-                sources[source]["misuses"] = 0
-                sources[source]["crashes"] = 0
+        sources = read_yaml(filename)
+        for source in sources:
+            sources[source]["misuses"] = 0
+            sources[source]["crashes"] = 0
         self.sources = sources
 
-    def run(self, project: Project, version: ProjectVersion, misuse: Misuse):
+    def run(self, project: Project, version: ProjectVersion, misuse: Misuse) -> None:
         sourcename = misuse.source
         source = self.sources[sourcename]
         source["misuses"] += 1
@@ -196,7 +194,7 @@ class misusesbytype(StatCalculatorTask):
     def start(self):
         self.index.clear()
 
-    def run(self, project: Project, version: ProjectVersion, misuse: Misuse):
+    def run(self, project: Project, version: ProjectVersion, misuse: Misuse) -> None:
         for violation in misuse.violations:
             if violation not in self.index:
                 self.index[violation] = []
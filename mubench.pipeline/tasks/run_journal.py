@@ -0,0 +1,105 @@
+import json
+import logging
+from hashlib import sha1
+from os import stat
+from os.path import exists
+from threading import Lock
+from typing import List, Optional, Set
+
+from data.data_entity import find_data_entity, get_data_entity_file_stat
+from data.detector import Detector
+from utils.io import safe_open
+
+
+class RunJournal:
+    """
+    Records which branches of the task tree, i.e., the subsequent tasks on a project, version, or misuse, completed
+    without errors. Each record carries a fingerprint of the branch's inputs, namely the tasks, the detector, the
+    metadata files of the branch's entities, and the state that the tasks keep for these entities, e.g., the checkout
+    and compile timestamps. When resuming a run, branches whose fingerprint is unchanged are skipped.
+
+    Tasks contribute their state through an optional `get_journal_state(entity)` method, which returns a value that
+    changes whenever the task would redo its work for the entity, or None, if the task keeps no state for it. Since
+    resuming computes the state of every branch, it should not read files, but only stat them, see `get_file_state`.
+    """
+
+    def __init__(self, file_path: str, resume: bool = False):
+        self.file_path = file_path
+        self.logger = logging.getLogger("task_runner.journal")
+        self.__lock = Lock()
+        self.__completed = set()  # type: Set[str]
+
+        if resume:
+            self.__completed = self.__load()
+            self.logger.info("Resuming run with %d completed branch(es) from %s.", len(self.__completed), file_path)
+        else:
+            # start a new journal
+            safe_open(file_path, 'w').close()
+
+    def get_branch_key(self, tasks: List, task_index: int, previous_results: List) -> Optional[str]:
+        entity = find_data_entity(previous_results[-1:])
+        if not entity:
+            return None
+
+        fingerprint = sha1()
+        for task in tasks:
+            fingerprint.update(type(task).__name__.encode("utf-8"))
+        for result in previous_results:
+            if isinstance(result, Detector):
+                fingerprint.update(_get_detector_fingerprint(result).encode("utf-8"))
+            elif find_data_entity([result]):
+                fingerprint.update("{}@{}".format(result.id, get_data_entity_file_stat(result)).encode("utf-8"))
+                for task in tasks:
+                    get_journal_state = getattr(task, 'get_journal_state', None)
+                    if callable(get_journal_state):
+                        fingerprint.update("{}".format(get_journal_state(result)).encode("utf-8"))
+
+        return "{}:{}:{}:{}".format(task_index, type(tasks[task_index]).__name__, entity.id, fingerprint.hexdigest())
+
+    def is_completed(self, branch_key: str) -> bool:
+        return branch_key in self.__completed
+
+    def record(self, branch_key: str):
+        with self.__lock:
+            self.__completed.add(branch_key)
+            # a single short line per write, such that parallel runs do not interleave records
+            with safe_open(self.file_path, 'a') as file:
+                file.write(json.dumps({"completed": branch_key}) + "\n")
+
+    def __load(self) -> Set[str]:
+        completed = set()
+        if exists(self.file_path):
+            with open(self.file_path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        completed.add(json.loads(line)["completed"])
+                    except (ValueError, KeyError):
+                        # the last line may be incomplete, if the run was killed while writing it
+                        continue
+        return completed
+
+
+def _get_detector_fingerprint(detector: Detector) -> str:
+    jar_stat = None
+    if exists(detector.jar_path):
+        jar_stat = stat(detector.jar_path)
+        jar_stat = (jar_stat.st_mtime_ns, jar_stat.st_size)
+    return "{}@{}:{}:{}".format(detector.id, detector.md5, detector.jar_path, jar_stat)
+
+
+def get_file_state(file_path: str) -> str:
+    """Identifies the state of a file by its path, modification time, and size, without reading it."""
+    try:
+        file_stat = stat(file_path)
+        return "{}@{}:{}".format(file_path, file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        return "{}@-".format(file_path)
+
+
+def get_journal_file_name(arguments: List[str]) -> str:
+    """
+    Identifies the journal of a run by its command-line arguments, such that resuming a run continues the journal of
+    the interrupted run with the same arguments.
+    """
+    arguments = [argument for argument in arguments if argument != "--resume"]
+    return sha1(" ".join(arguments).encode("utf-8")).hexdigest() + ".jsonl"
@@ -0,0 +1,248 @@
+import json
+import logging
+import sys
+import time
+from os import replace
+from threading import Lock, Event, Thread
+from typing import List, Optional, Tuple
+
+from utils.io import safe_open
+
+# the index of a task, the number of results of one run of the task, and whether the run was skipped
+ProgressEvent = Tuple[int, int, bool]
+
+
+class ProgressRecorder:
+    """
+    Records task runs for a `RunProgress` in another process, such as a worker of a parallel run.
+    """
+
+    def __init__(self):
+        self.events = []  # type: List[ProgressEvent]
+
+    def record(self, task_index: int, number_of_results: int, is_skipped: bool = False):
+        self.events.append((task_index, number_of_results, is_skipped))
+
+    def pop_events(self) -> List[ProgressEvent]:
+        events = self.events
+        self.events = []
+        return events
+
+
+class RunProgress:
+    """
+    Tracks how many entities each task completed and estimates how many it has left. The number of runs of a task is
+    extrapolated from the number of results that the previous task yielded per run so far, such that the estimate
+    exists before all project versions or misuses are collected. The remaining time is estimated from the time per
+    completed run of the last task so far, starting from the given expected time per run, e.g., from previous runs.
+    Periodically, even without completed runs, the progress is shown as a status line on a terminal and written to a JSON status file.
+    """
+
+    __PRIOR_WEIGHT = 3
+
+    def __init__(self, tasks: List, status_file_path: Optional[str] = None, show_status_line: bool = False,
+                 expected_runtime: Optional[float] = None, parallelism: int = 1, interval: float = 5.0):
+        self.task_names = [_get_task_name(task) for task in tasks]
+        self.status_file_path = status_file_path
+        self.show_status_line = show_status_line and sys.stderr.isatty()
+        self.status_line = _StatusLine(sys.stderr) if self.show_status_line else None
+        self.expected_runtime = expected_runtime
+        self.parallelism = parallelism
+        self.interval = interval
+        self.logger = logging.getLogger("task_runner.progress")
+
+        self.runs = [0] * len(tasks)
+        self.skips = [0] * len(tasks)
+        self.results = [0] * len(tasks)
+        self.start_time = time.time()
+        self.__last_update_time = 0
+        self.__lock = Lock()
+        self.__update_lock = Lock()
+
+        # updates also while no task completes, e.g., during a long detector run, such that the ETA counts down
+        self.__is_ended = Event()
+        self.__timer = None  # type: Optional[Thread]
+        if (self.status_line or self.status_file_path) and self.interval > 0:
+            self.__timer = Thread(target=self.__update_periodically, name="run-progress", daemon=True)
+            self.__timer.start()
+
+    def record(self, task_index: int, number_of_results: int, is_skipped: bool = False):
+        with self.__lock:
+            self.__add_event(task_index, number_of_results, is_skipped)
+        self.__update()
+
+    def add_events(self, events: List[ProgressEvent]):
+        with self.__lock:
+            for event in events:
+                self.__add_event(*event)
+        self.__update()
+
+    def __add_event(self, task_index: int, number_of_results: int, is_skipped: bool):
+        self.runs[task_index] += 1
+        self.results[task_index] += number_of_results
+        if is_skipped:
+            self.skips[task_index] += 1
+
+    def get_expected_runs(self) -> List[Optional[float]]:
+        expected_runs = []
+        expected = 1.0
+        for task_index in range(len(self.runs)):
+            if task_index > 0:
+                previous_runs = self.runs[task_index - 1]
+                if expected is None or not previous_runs:
+                    expected = None
+                else:
+                    expected *= self.results[task_index - 1] / previous_runs
+            expected_runs.append(None if expected is None else max(expected, self.runs[task_index]))
+        return expected_runs
+
+    def get_throughput(self) -> float:
+        """Completed runs of the last task per hour."""
+        elapsed_time = time.time() - self.start_time
+        return self.runs[-1] / elapsed_time * 3600 if elapsed_time > 0 else 0
+
+    def get_remaining_time(self) -> Optional[float]:
+        expected_runs = self.get_expected_runs()[-1]
+        if expected_runs is None:
+            return None
+
+        completed_runs = self.runs[-1]
+        observed_time = time.time() - self.start_time
+        if self.expected_runtime is None:
+            if not completed_runs:
+                return None
+            time_per_run = observed_time / completed_runs
+        else:
+            # previous runs count as a few observations, until this run observed enough of its own
+            prior_weight = RunProgress.__PRIOR_WEIGHT
+            prior_time_per_run = self.expected_runtime / self.parallelism
+            time_per_run = (observed_time + prior_time_per_run * prior_weight) / (completed_runs + prior_weight)
+
+        return (expected_runs - completed_runs) * time_per_run
+
+    def get_status(self) -> dict:
+        with self.__lock:
+            expected_runs = self.get_expected_runs()
+            return {
+                "timestamp": int(time.time()),
+                "elapsed": time.time() - self.start_time,
+                "stages": [{"task": name, "completed": runs, "skipped": skips,
+                            "expected": None if expected is None else round(expected)}
+                           for name, runs, skips, expected
+                           in zip(self.task_names, self.runs, self.skips, expected_runs)],
+                "throughput_per_hour": self.get_throughput(),
+                "remaining": self.get_remaining_time(),
+            }
+
+    def get_status_line(self) -> str:
+        status = self.get_status()
+        stages = ["{} {}/{}".format(stage["task"], stage["completed"],
+                                    "?" if stage["expected"] is None else stage["expected"])
+                  for stage in status["stages"] if stage["expected"] != 1]
+        return "{} | {:.1f}/h | ETA {}".format(", ".join(stages), status["throughput_per_hour"],
+                                               _format_duration(status["remaining"]))
+
+    def end(self):
+        self.__is_ended.set()
+        if self.__timer:
+            self.__timer.join()
+        self.__update(force=True)
+        if self.status_line:
+            self.status_line.end()
+        self.logger.info("Progress: %s", self.get_status_line())
+
+    def __update_periodically(self):
+        while not self.__is_ended.wait(self.interval):
+            self.__update(force=True)
+
+    def __update(self, force: bool = False):
+        now = time.time()
+        if not force and now - self.__last_update_time < self.interval:
+            return
+        # concurrent stages skip the update, while another one updates
+        if not self.__update_lock.acquire(blocking=force):
+            return
+        try:
+            self.__last_update_time = now
+            if self.status_line:
+                self.status_line.show(self.get_status_line())
+            if self.status_file_path:
+                self.__write_status_file()
+        finally:
+            self.__update_lock.release()
+
+    def __write_status_file(self):
+        # replace the file at once, such that monitoring never reads a partial status
+        temp_file_path = self.status_file_path + ".tmp"
+        with safe_open(temp_file_path, 'w') as file:
+            json.dump(self.get_status(), file, indent=2)
+        replace(temp_file_path, self.status_file_path)
+
+
+class _StatusLine(logging.Handler):
+    """
+    Shows a status line on a terminal below the log. It takes the place of the handlers that log to the same terminal,
+    to clear the status line before they write a record and to redraw it afterwards, such that records and status do
+    not overwrite each other.
+    """
+
+    __CLEAR = "\r\x1b[K"
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+        self.text = ""
+        self.root_logger = logging.getLogger()
+        self.handlers = [handler for handler in self.root_logger.handlers if _is_logging_to(handler, stream)]
+        for handler in self.handlers:
+            self.root_logger.removeHandler(handler)
+        self.root_logger.addHandler(self)
+
+    def show(self, text: str):
+        self.acquire()
+        try:
+            self.text = text
+            self.stream.write(_StatusLine.__CLEAR + text + "\r")
+            self.stream.flush()
+        finally:
+            self.release()
+
+    def emit(self, record: logging.LogRecord):
+        handlers = [handler for handler in self.handlers if record.levelno >= handler.level]
+        if not handlers:
+            return
+        self.stream.write(_StatusLine.__CLEAR)
+        for handler in handlers:
+            handler.handle(record)
+        self.stream.write(self.text + "\r")
+        self.stream.flush()
+
+    def end(self):
+        """Leaves the last status on the terminal and restores the replaced handlers."""
+        self.acquire()
+        try:
+            self.root_logger.removeHandler(self)
+            for handler in self.handlers:
+                self.root_logger.addHandler(handler)
+            self.stream.write("\n")
+            self.stream.flush()
+        finally:
+            self.release()
+
+
+def _is_logging_to(handler: logging.Handler, stream) -> bool:
+    is_stream_handler = isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler)
+    return is_stream_handler and handler.stream is stream
+
+
+def _get_task_name(task) -> str:
+    name = type(task).__name__
+    return name[:-len("Task")] if name.endswith("Task") and name != "Task" else name
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "{}h{:02d}m".format(hours, minutes) if hours else "{}m{:02d}s".format(minutes, seconds)
@@ -0,0 +1,150 @@
+import logging
+from queue import Queue
+from threading import Thread, Lock
+from typing import List, Tuple, Any, Optional
+
+from tasks.run_journal import RunJournal
+from tasks.run_progress import RunProgress
+from tasks.task_profiler import TaskProfiler
+from tasks.task_runner import TaskRunner
+
+
+class Stage:
+    def __init__(self, name: str, task_types: Tuple[type, ...], concurrency: int = 1):
+        self.name = name
+        self.task_types = task_types
+        self.concurrency = concurrency
+
+    def starts_with(self, task) -> bool:
+        return isinstance(task, self.task_types)
+
+    def __str__(self):
+        return "stage '{}'".format(self.name)
+
+
+class StagedTaskRunner(TaskRunner):
+    """
+    Runs the tasks as a pipeline of stages, such that, e.g., one project version is checked out while another one
+    compiles and the detector runs on a third one. Each stage begins with the first task of one of the stage's task
+    types and ends where the next stage begins. Stages exchange branches of the task tree via bounded queues and
+    process up to their configured number of branches concurrently. Tasks with an `end()` hook aggregate over all
+    branches. Therefore, they and all subsequent tasks run in a final stage that processes one branch at a time.
+    """
+
+    _END = None
+
+    def __init__(self, tasks: List, stages: List[Stage], queue_size: int = 2, profiler: Optional[TaskProfiler] = None,
+                 journal: Optional[RunJournal] = None, progress: Optional[RunProgress] = None):
+        super().__init__(tasks, profiler=profiler, journal=journal, progress=progress)
+        self.stages = stages
+        self.queue_size = queue_size
+        self.is_aborted = False
+
+    def run(self, *initial_parameters: Tuple[Any]):
+        if not self.tasks:
+            return
+
+        self._validate(list(initial_parameters))
+
+        stage_runs = self.__get_stage_runs()
+        for stage_run in stage_runs:
+            stage_run.start()
+
+        stage_runs[0].queue.put((0, list(initial_parameters)))
+        stage_runs[0].end()
+
+        for stage_run in stage_runs:
+            stage_run.join()
+
+        for stage_run in stage_runs:
+            if stage_run.error:
+                raise stage_run.error
+
+        self._end()
+
+    def __get_stage_runs(self) -> List['_StageRun']:
+        boundaries = [(0, Stage("prepare", (), 1))]
+        for stage in self.stages:
+            task_index = self.__find_first_task_index(stage, boundaries[-1][0])
+            if task_index is None:
+                continue
+            if task_index == boundaries[-1][0]:
+                boundaries.pop()
+            boundaries.append((task_index, stage))
+
+        first_aggregating_task_index = self._get_first_aggregating_task_index()
+        boundaries = [(index, stage) for index, stage in boundaries if index < first_aggregating_task_index]
+        if first_aggregating_task_index < len(self.tasks):
+            boundaries.append((first_aggregating_task_index, Stage("aggregate", (), 1)))
+
+        stage_runs = []
+        next_stage_run = None
+        for first_task_index, stage in reversed(boundaries):
+            stage_run = _StageRun(self, stage, first_task_index, self.queue_size * stage.concurrency, next_stage_run)
+            stage_runs.insert(0, stage_run)
+            next_stage_run = stage_run
+        return stage_runs
+
+    def __find_first_task_index(self, stage: Stage, start_index: int) -> Optional[int]:
+        for index in range(start_index, len(self.tasks)):
+            if stage.starts_with(self.tasks[index]):
+                return index
+        return None
+
+
+class _StageRun:
+    def __init__(self, runner: StagedTaskRunner, stage: Stage, first_task_index: int, queue_size: int,
+                 next_stage_run: Optional['_StageRun']):
+        self.runner = runner
+        self.stage = stage
+        self.first_task_index = first_task_index
+        self.next_stage_run = next_stage_run
+        self.queue = Queue(queue_size)
+        self.error = None  # type: Optional[BaseException]
+        self.logger = logging.getLogger("task_runner.stages.{}".format(stage.name))
+        self.__threads = [Thread(target=self.__work, name="{}-{}".format(stage.name, number))
+                          for number in range(stage.concurrency)]
+        self.__number_of_active_threads = stage.concurrency
+        self.__lock = Lock()
+
+    def start(self):
+        self.logger.debug("Starting %s with %d thread(s) at task %d", self.stage, self.stage.concurrency,
+                          self.first_task_index)
+        for thread in self.__threads:
+            thread.start()
+
+    def join(self):
+        for thread in self.__threads:
+            thread.join()
+
+    def end(self):
+        for _ in self.__threads:
+            self.queue.put(StagedTaskRunner._END)
+
+    def __work(self):
+        while True:
+            branch = self.queue.get()
+            if branch is StagedTaskRunner._END:
+                break
+            if self.runner.is_aborted:
+                continue  # drain the queue to not block upstream stages
+
+            task_index, previous_results = branch
+            try:
+                self.runner._run(task_index, previous_results, self.__hand_off)
+            except BaseException as error:
+                self.logger.debug("Aborting pipeline due to error in %s", self.stage, exc_info=True)
+                self.error = error
+                self.runner.is_aborted = True
+
+        with self.__lock:
+            self.__number_of_active_threads -= 1
+            is_last_thread = self.__number_of_active_threads == 0
+        if is_last_thread and self.next_stage_run:
+            self.next_stage_run.end()
+
+    def __hand_off(self, next_task_index: int, next_results: List, _: bool) -> bool:
+        if self.next_stage_run and next_task_index >= self.next_stage_run.first_task_index:
+            self.next_stage_run.queue.put((next_task_index, next_results))
+            return True
+        return False
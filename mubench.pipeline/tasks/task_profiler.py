@@ -0,0 +1,102 @@
+import csv
+import json
+import logging
+import time
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import List, Optional
+
+from data.data_entity import find_data_entity
+from utils.io import safe_open
+from utils.shell import record_child_usage, get_process_peak_rss
+
+TaskMeasurement = namedtuple("TaskMeasurement",
+                             ["task", "entity", "wall_time", "cpu_time", "peak_rss", "process_peak_rss"])
+
+
+class TaskProfiler:
+    """
+    Measures wall time, CPU time, and peak resident set size of every task run, keyed by the task and the most specific
+    entity (project, version, or misuse) it runs on. CPU time is that of the thread running the task plus that of the
+    child processes, such as compilers and detectors, that the task executes. Peak RSS is the largest peak among these
+    child processes, or 0, if the task executes none. Since tasks that run in-process have no peak of their own, the
+    process peak RSS is the peak of the process that runs the task up to the end of the task, or None, if the platform
+    does not report it. At the end, it writes all measurements to a JSON and a CSV report and logs the slowest entities.
+    """
+
+    def __init__(self, report_path: Optional[str] = None, top_n: int = 10):
+        self.report_path = report_path
+        self.top_n = top_n
+        self.measurements = []  # type: List[TaskMeasurement]
+        self.logger = logging.getLogger("task_runner.profile")
+        self.__lock = Lock()
+
+    @contextmanager
+    def measure(self, task, previous_results: List):
+        start_wall_time = time.perf_counter()
+        start_cpu_time = time.thread_time()
+        with record_child_usage() as child_usage:
+            try:
+                yield
+            finally:
+                cpu_time = time.thread_time() - start_cpu_time + child_usage.cpu_time
+                measurement = TaskMeasurement(type(task).__name__, _get_entity_id(previous_results),
+                                              time.perf_counter() - start_wall_time, cpu_time, child_usage.peak_rss,
+                                              get_process_peak_rss())
+                self.add_measurements([measurement])
+
+    def add_measurements(self, measurements: List[TaskMeasurement]):
+        with self.__lock:
+            self.measurements.extend(measurements)
+
+    def pop_measurements(self) -> List[TaskMeasurement]:
+        with self.__lock:
+            measurements = self.measurements
+            self.measurements = []
+            return measurements
+
+    def end(self):
+        if self.report_path:
+            self.__write_json_report(self.report_path + ".json")
+            self.__write_csv_report(self.report_path + ".csv")
+            self.logger.info("Wrote profile to %s.json and %s.csv", self.report_path, self.report_path)
+        self.__log_summary()
+
+    def get_wall_time_by_task(self) -> OrderedDict:
+        return self.__sum_wall_time(lambda measurement: measurement.task)
+
+    def get_wall_time_by_entity(self) -> OrderedDict:
+        return self.__sum_wall_time(lambda measurement: measurement.entity)
+
+    def __sum_wall_time(self, get_key) -> OrderedDict:
+        wall_times = {}
+        for measurement in self.measurements:
+            key = get_key(measurement)
+            wall_times[key] = wall_times.get(key, 0) + measurement.wall_time
+        return OrderedDict(sorted(wall_times.items(), key=lambda item: item[1], reverse=True))
+
+    def __write_json_report(self, file_path: str):
+        with safe_open(file_path, 'w') as file:
+            json.dump({"measurements": [measurement._asdict() for measurement in self.measurements]}, file, indent=2)
+
+    def __write_csv_report(self, file_path: str):
+        with safe_open(file_path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(TaskMeasurement._fields)
+            writer.writerows(self.measurements)
+
+    def __log_summary(self):
+        self.logger.info("Time per task:")
+        for task, wall_time in self.get_wall_time_by_task().items():
+            self.logger.info("    %s: %.2fs", task, wall_time)
+
+        self.logger.info("Top %d slowest entities:", self.top_n)
+        entity_wall_times = [item for item in self.get_wall_time_by_entity().items() if item[0] is not None]
+        for entity, wall_time in entity_wall_times[:self.top_n]:
+            self.logger.info("    %s: %.2fs", entity, wall_time)
+
+
+def _get_entity_id(previous_results: List) -> Optional[str]:
+    entity = find_data_entity(previous_results)
+    return entity.id if entity else None
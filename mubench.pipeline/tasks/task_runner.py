@@ -1,8 +1,16 @@
 import collections
 import logging
-from inspect import signature, Parameter
+from collections import deque
+from collections.abc import Sized
+from contextlib import ExitStack
+from inspect import signature, Parameter, Signature
+from multiprocessing import Pool, Event
 
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Optional, Callable, Dict, Iterator, Iterable, Generator, TypeVar, Union
+
+from tasks.run_journal import RunJournal
+from tasks.run_progress import RunProgress, ProgressRecorder
+from tasks.task_profiler import TaskProfiler
 
 
 class Continue:
@@ -10,68 +18,220 @@ class Continue:
 
 
 class TaskRunner:
-    def __init__(self, tasks: List):
+    def __init__(self, tasks: List, jobs: int = 1, profiler: Optional[TaskProfiler] = None,
+                 journal: Optional[RunJournal] = None, progress: Optional[RunProgress] = None):
         self.tasks = tasks
+        self.jobs = jobs
+        self.profiler = profiler
+        self.journal = journal
+        self.progress = progress
         self.logger = logging.getLogger("task_runner")
+        self.__plan = _plan_tasks(tasks)
+        # skipping a branch must not withhold results from tasks that aggregate over all branches
+        self.__first_journaled_task_index = self.__get_last_aggregating_task_index() + 1
 
     def run(self, *initial_parameters: Tuple[Any]):
         if not self.tasks:
             return
 
-        self.__run(0, list(initial_parameters))
+        self._validate(list(initial_parameters))
+
+        if self.jobs > 1 and self._get_first_aggregating_task_index() > 0:
+            self.__run_parallel(list(initial_parameters))
+        else:
+            self._run(0, list(initial_parameters))
+
+        self._end()
+
+    def _validate(self, initial_parameters: List):
+        for planned_task in self.__plan:
+            planned_task.validate(initial_parameters)
+
+    def _end(self):
         for task in self.tasks:
             if callable(getattr(task, 'end', None)):
                 task.end()
 
-    def __run(self, current_task_index: int, previous_results: List):
-        task = self.tasks[current_task_index]
-        parameter_values = self.__get_parameter_values(task, previous_results)
+        if self.profiler:
+            self.profiler.end()
 
-        task_name = type(task).__name__
-        self.logger.debug("Running task {}".format(task_name))
-        self.logger.debug("Parameters: {}".format([str(v) for v in parameter_values]))
+        if self.progress:
+            self.progress.end()
 
+    def __run_parallel(self, initial_parameters: List):
+        """
+        Runs independent branches of the task tree in a pool of worker processes. A worker runs a branch until a task
+        yields multiple results, e.g., one per project version or misuse, and hands the resulting branches back, to
+        distribute them across the pool. Tasks with an `end()` hook aggregate over all branches. Therefore, they and
+        all subsequent tasks run in this process.
+        """
+        first_aggregating_task_index = self._get_first_aggregating_task_index()
+        is_aborted = Event()
+        pool = Pool(self.jobs, initializer=_init_worker, initargs=(self, is_aborted))
         try:
-            results = task.run(*parameter_values)
-        except BaseException as exception:
-            logger = logging.getLogger("task_runner.{}".format(task_name))
-            logger.error("Exception in %s: %s", task_name, exception)
-            logger.debug("Full exception:", exc_info=True)
-            return
+            pending_branches = deque()
+            pending_branches.append(pool.apply_async(_run_branch, (0, initial_parameters)))
+            while pending_branches:
+                branches, log_records, measurements, progress_events = pending_branches.popleft().get()
+                _replay_log_records(log_records)
+                if self.profiler:
+                    self.profiler.add_measurements(measurements)
+                if self.progress:
+                    self.progress.add_events(progress_events)
+                for task_index, previous_results in branches:
+                    if task_index < first_aggregating_task_index:
+                        pending_branches.append(pool.apply_async(_run_branch, (task_index, previous_results)))
+                    else:
+                        self._run(task_index, previous_results)
+        except BaseException:
+            # Skip the pending branches, instead of terminating the pool, since terminating a worker while it hands
+            # back its results leaves the pool's result queue locked and deadlocks the pool.
+            is_aborted.set()
+            raise
+        finally:
+            pool.close()
+            pool.join()
 
-        if results is None:
-            results = [Continue()]
+    def __get_last_aggregating_task_index(self) -> int:
+        aggregating_task_indices = [index for index, task in enumerate(self.tasks)
+                                    if callable(getattr(task, 'end', None))]
+        return aggregating_task_indices[-1] if aggregating_task_indices else -1
+
+    def _get_first_aggregating_task_index(self) -> int:
+        for index, task in enumerate(self.tasks):
+            if callable(getattr(task, 'end', None)):
+                return index
+        return len(self.tasks)
+
+    def _run_branch(self, current_task_index: int, previous_results: List) -> List[Tuple[int, List]]:
+        first_aggregating_task_index = self._get_first_aggregating_task_index()
+        branches = []
+
+        def hand_off(next_task_index: int, next_results: List, is_branching: bool) -> bool:
+            if is_branching or next_task_index >= first_aggregating_task_index:
+                branches.append((next_task_index, next_results))
+                return True
+            return False
 
-        results = TaskRunner.__as_iterable(results)
+        self._run(current_task_index, previous_results, hand_off)
+        return branches
 
-        for result in results:
-            result_type_already_exists = type(result) in [type(previous_result) for previous_result in previous_results]
-            if result_type_already_exists:
-                raise TaskParameterDuplicateTypeWarning(task, type(result))
+    def _run(self, current_task_index: int, previous_results: List,
+             hand_off: Optional[Callable[[int, List, bool], bool]] = None):
+        """
+        Runs the task at the given index and all subsequent tasks on each of its results, depth first. If a `hand_off`
+        function is given, it may take over the execution of subsequent tasks for individual results, by returning
+        `True`.
+        """
+        previous_types = tuple(type(previous_result) for previous_result in previous_results)
+        branches = [self.__start_branch(current_task_index, previous_results, previous_types, hand_off, None)]
+        while branches:
+            branch = branches[-1]
+            if branch is None:
+                branches.pop()
+                continue
 
-            if current_task_index + 1 < len(self.tasks):
+            result = next(branch.results, _NO_RESULT)
+            if result is _NO_RESULT:
+                branches.pop()
+                self.__end_branch(branch)
+                continue
+            if branch.number_of_results is not None:
+                branch.number_of_results += 1
+
+            result_type = type(result)
+            if result_type in branch.previous_types:
+                raise TaskParameterDuplicateTypeWarning(self.tasks[branch.task_index], result_type)
+
+            next_task_index = branch.task_index + 1
+            if next_task_index < len(self.tasks):
                 if isinstance(result, Continue):
-                    next_results = previous_results
+                    next_results = branch.previous_results
+                    next_types = branch.previous_types
                 else:
-                    next_results = previous_results + [result]
+                    next_results = branch.previous_results + [result]
+                    next_types = branch.previous_types + (result_type,)
 
-                self.__run(current_task_index + 1, next_results)
+                if hand_off and hand_off(next_task_index, next_results, branch.is_branching):
+                    # the branch completes elsewhere
+                    _JournalEntry.fail(branch.journal_entry)
+                else:
+                    branches.append(self.__start_branch(next_task_index, next_results, next_types, hand_off,
+                                                        branch.journal_entry))
 
-    @staticmethod
-    def __get_parameter_values(task, previous_results):
-        parameter_values = []
-        for parameter in TaskRunner.__get_parameters(task):
-            if parameter.kind == Parameter.VAR_POSITIONAL:
-                return previous_results
+    def __start_branch(self, task_index: int, previous_results: List, previous_types: Tuple[type, ...],
+                       hand_off: Optional[Callable],
+                       parent_journal_entry: Optional['_JournalEntry']) -> Optional['_Branch']:
+        journal_entry = parent_journal_entry
+        if self.journal and task_index >= self.__first_journaled_task_index:
+            branch_key = self.journal.get_branch_key(self.tasks, task_index, previous_results)
+            if branch_key and self.journal.is_completed(branch_key):
+                self.logger.debug("Skipping branch %s, which completed in a previous run.", branch_key)
+                self.__record_progress(task_index, 0, is_skipped=True)
+                return None
+            if branch_key:
+                journal_entry = _JournalEntry(branch_key, parent_journal_entry)
 
-            parameter_value = TaskRunner.__find_value(parameter, previous_results)
-            if parameter_value:
-                if type(parameter_value) in [type(existing_value) for existing_value in parameter_values]:
-                    raise TaskRequestsDuplicateTypeWarning(task, type(parameter_value))
-                parameter_values.append(parameter_value)
-            else:
-                raise TaskParameterUnavailableWarning(task, parameter)
-        return parameter_values
+        results = self.__run_task(task_index, previous_results, previous_types)
+        if results is None:
+            _JournalEntry.fail(journal_entry)
+            self.__record_progress(task_index, 0)
+            return None
+
+        is_branching = False
+        if hand_off:
+            results = list(results)
+            is_branching = len(results) > 1
+
+        # the results of generators are counted as the branch consumes them
+        number_of_results = None
+        if isinstance(results, Sized):
+            self.__record_progress(task_index, len(results))
+        else:
+            number_of_results = 0
+
+        return _Branch(task_index, previous_results, previous_types, iter(results), is_branching, journal_entry,
+                       journal_entry is not parent_journal_entry, number_of_results)
+
+    def __end_branch(self, branch: '_Branch'):
+        if branch.owns_journal_entry and branch.journal_entry.is_complete:
+            # fingerprints the branch again, since its tasks change the state they contribute, e.g., by compiling
+            self.journal.record(self.journal.get_branch_key(self.tasks, branch.task_index, branch.previous_results))
+        if branch.number_of_results is not None:
+            self.__record_progress(branch.task_index, branch.number_of_results)
+
+    def __record_progress(self, task_index: int, number_of_results: int, is_skipped: bool = False):
+        if self.progress:
+            self.progress.record(task_index, number_of_results, is_skipped)
+
+    def __run_task(self, task_index: int, previous_results: List,
+                   previous_types: Tuple[type, ...]) -> Optional[Iterable]:
+        planned_task = self.__plan[task_index]
+        task = planned_task.task
+        parameter_values = planned_task.get_parameter_values(previous_results, previous_types)
+
+        self.logger.debug("Running task %s", planned_task.name)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Parameters: {}".format([str(v) for v in parameter_values]))
+
+        try:
+            with self.__measure(task, previous_results):
+                results = task.run(*parameter_values)
+        except BaseException as exception:
+            logger = logging.getLogger("task_runner.{}".format(planned_task.name))
+            logger.error("Exception in %s: %s", planned_task.name, exception)
+            logger.debug("Full exception:", exc_info=True)
+            return None
+
+        if results is None:
+            results = [Continue()]
+
+        return TaskRunner.__as_iterable(results)
+
+    def __measure(self, task, previous_results: List):
+        if self.profiler:
+            return self.profiler.measure(task, previous_results)
+        return ExitStack()
 
     @staticmethod
     def __as_iterable(previous_results):
@@ -80,31 +240,280 @@ class TaskRunner:
         else:
             return [previous_results]
 
+
+_NO_RESULT = object()
+
+
+class _Branch:
+    def __init__(self, task_index: int, previous_results: List, previous_types: Tuple[type, ...], results: Iterator,
+                 is_branching: bool, journal_entry: Optional['_JournalEntry'], owns_journal_entry: bool,
+                 number_of_results: Optional[int]):
+        self.task_index = task_index
+        self.previous_results = previous_results
+        self.previous_types = previous_types
+        self.results = results
+        self.is_branching = is_branching
+        self.journal_entry = journal_entry
+        self.owns_journal_entry = owns_journal_entry
+        self.number_of_results = number_of_results
+
+
+class _JournalEntry:
+    def __init__(self, key: str, parent: Optional['_JournalEntry']):
+        self.key = key
+        self.parent = parent
+        self.is_complete = True
+
     @staticmethod
-    def __get_parameters(task):
-        return signature(task.run).parameters.values()
+    def fail(entry: Optional['_JournalEntry']):
+        while entry:
+            entry.is_complete = False
+            entry = entry.parent
+
+
+def _plan_tasks(tasks: List) -> List['_PlannedTask']:
+    plan = []
+    result_types = ()  # type: Optional[Tuple[type, ...]]
+    for task in tasks:
+        plan.append(_PlannedTask(task, result_types))
+        if result_types is not None:
+            result_type = _get_declared_result_type(task)
+            if result_type is _UNDECLARED:
+                result_types = None
+            elif isinstance(result_type, type):
+                result_types += (result_type,)
+    return plan
+
+
+_UNDECLARED = object()
+_NO_RESULTS = object()
+_RESULT_COLLECTIONS = (list, List, collections.abc.Iterable, Iterable, collections.abc.Iterator, Iterator,
+                       collections.abc.Generator, Generator)
+
+
+def _get_declared_result_type(task):
+    """
+    The type of the results that the task's `run()` declares to return. `None` declares that the task adds no result,
+    such that subsequent tasks run on the previous results. An untyped list declares that the task only returns empty
+    lists, which end the branch, e.g., to filter entities, and returns `_NO_RESULTS`. Without a single declared type,
+    e.g., for `Optional[X]`, which may or may not add a result, it returns `_UNDECLARED`.
+    """
+    return _get_result_type(signature(task.run).return_annotation)
+
+
+def _get_result_type(annotation):
+    if annotation is Signature.empty:
+        return _UNDECLARED
+    if annotation is None or annotation is type(None):
+        return None
+
+    origin = getattr(annotation, '__origin__', None)
+    arguments = getattr(annotation, '__args__', None) or ()
+    if origin is Union:
+        result_types = {_get_result_type(argument) for argument in arguments} - {_NO_RESULTS}
+        if not result_types:
+            return _NO_RESULTS
+        return result_types.pop() if len(result_types) == 1 else _UNDECLARED
+    if origin in _RESULT_COLLECTIONS:
+        if not arguments or isinstance(arguments[0], TypeVar):
+            return _NO_RESULTS
+        return arguments[0] if isinstance(arguments[0], type) else _UNDECLARED
+
+    is_result_type = isinstance(annotation, type) and (annotation is str or
+                                                       not issubclass(annotation, collections.abc.Iterable))
+    return annotation if is_result_type else _UNDECLARED
+
+
+class _PlannedTask:
+    """
+    A task with its parameters resolved once. The runner passes results to tasks by type. If all previous tasks declare
+    the types of their results, the positions of the parameter values among these results are compiled when planning
+    the task, and the positions of the values that come from the initial parameters are resolved once before the run,
+    such that a missing parameter stops the run before any task runs. Otherwise, since the types of the results of
+    previous tasks are the same for all entities of a kind, the positions are computed once per combination of result
+    types and reused afterwards.
+    """
+
+    def __init__(self, task, previous_result_types: Optional[Tuple[type, ...]] = None):
+        self.task = task
+        self.name = type(task).__name__
+        self.parameters = tuple(signature(task.run).parameters.values())
+        self.__slots_by_types = {}  # type: Dict[Tuple[type, ...], Tuple[Optional[int], ...]]
+        # negative positions among the results of previous tasks, or `None` for values from the initial parameters
+        self.__compiled_slots = None  # type: Optional[List[Optional[int]]]
+        self.__slots = None  # type: Optional[Tuple[Optional[int], ...]]
+        if previous_result_types is not None:
+            self.__compiled_slots = self.__compile_slots(previous_result_types)
+
+    def __compile_slots(self, previous_result_types: Tuple[type, ...]) -> Optional[List[Optional[int]]]:
+        slots = []
+        slot_types = []
+        for parameter in self.parameters:
+            if parameter.kind == Parameter.VAR_POSITIONAL or not isinstance(parameter.annotation, type):
+                return None
+
+            slot = None
+            for index, result_type in enumerate(previous_result_types):
+                if issubclass(result_type, parameter.annotation):
+                    slot = index - len(previous_result_types)
+                    if result_type in slot_types:
+                        raise TaskRequestsDuplicateTypeWarning(self.task, result_type)
+                    slot_types.append(result_type)
+                    break
+            slots.append(slot)
+        return slots
+
+    def validate(self, initial_parameters: List):
+        annotations = []
+        for parameter in self.parameters:
+            if parameter.kind == Parameter.VAR_POSITIONAL:
+                break
+            if not isinstance(parameter.annotation, type):
+                continue
+            if parameter.annotation in annotations:
+                raise TaskRequestsDuplicateTypeWarning(self.task, parameter.annotation)
+            annotations.append(parameter.annotation)
+
+        if self.__compiled_slots is not None:
+            slots = []
+            for parameter, slot in zip(self.parameters, self.__compiled_slots):
+                if slot is None:
+                    slot = self.__find_slot(parameter, initial_parameters)
+                    if slot is None:
+                        raise TaskParameterUnavailableWarning(self.task, parameter)
+                slots.append(slot)
+            self.__slots = tuple(slots)
+
+    def get_parameter_values(self, previous_results: List, previous_types: Tuple[type, ...]) -> List:
+        slots = self.__slots
+        if slots is None or not self.__fits(slots, previous_results):
+            slots = self.__slots_by_types.get(previous_types)
+            if slots is None:
+                slots = self.__get_slots(previous_results)
+                self.__slots_by_types[previous_types] = slots
+
+        parameter_values = []
+        for parameter, slot in zip(self.parameters, slots):
+            if slot is None:
+                return previous_results
+            parameter_value = previous_results[slot]
+            if not parameter_value:
+                raise TaskParameterUnavailableWarning(self.task, parameter)
+            parameter_values.append(parameter_value)
+        return parameter_values
+
+    def __fits(self, slots: Tuple[Optional[int], ...], previous_results: List) -> bool:
+        # guards against tasks that return other results than they declare
+        for parameter, slot in zip(self.parameters, slots):
+            if not -len(previous_results) <= slot < len(previous_results):
+                return False
+            if not isinstance(previous_results[slot], parameter.annotation):
+                return False
+        return True
+
+    def __get_slots(self, previous_results: List) -> Tuple[Optional[int], ...]:
+        slots = []
+        slot_types = []
+        for parameter in self.parameters:
+            if parameter.kind == Parameter.VAR_POSITIONAL:
+                slots.append(None)
+                break
+
+            slot = self.__find_slot(parameter, previous_results)
+            if slot is None or not previous_results[slot]:
+                raise TaskParameterUnavailableWarning(self.task, parameter)
+            slot_type = type(previous_results[slot])
+            if slot_type in slot_types:
+                raise TaskRequestsDuplicateTypeWarning(self.task, slot_type)
+            slots.append(slot)
+            slot_types.append(slot_type)
+        return tuple(slots)
 
     @staticmethod
-    def __find_value(parameter: Parameter, previous_results):
-        for value in previous_results:
+    def __find_slot(parameter: Parameter, previous_results: List) -> Optional[int]:
+        for index, value in enumerate(previous_results):
             if isinstance(value, parameter.annotation):
-                return value
+                return index
         return None
 
 
-class TaskParameterUnavailableWarning(UserWarning):
+_worker_runner = None  # type: Optional[TaskRunner]
+_worker_log_handler = None  # type: Optional[_BranchLogHandler]
+_worker_is_aborted = None
+
+
+def _init_worker(runner: TaskRunner, is_aborted):
+    global _worker_runner, _worker_log_handler, _worker_is_aborted
+    _worker_runner = runner
+    _worker_is_aborted = is_aborted
+    if runner.progress:
+        # the main process tracks the progress, the worker records its part
+        runner.progress = ProgressRecorder()
+    _worker_log_handler = _BranchLogHandler()
+
+    # The worker collects the log of each branch and hands it to the main process, such that the log of one project
+    # version or misuse does not interleave with the logs of others.
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(_worker_log_handler)
+
+
+def _run_branch(task_index: int, previous_results: List):
+    if _worker_is_aborted.is_set():
+        return [], [], [], []
+
+    _worker_log_handler.records = []
+    branches = _worker_runner._run_branch(task_index, previous_results)
+    measurements = _worker_runner.profiler.pop_measurements() if _worker_runner.profiler else []
+    progress_events = _worker_runner.progress.pop_events() if _worker_runner.progress else []
+    return branches, _worker_log_handler.records, measurements, progress_events
+
+
+def _replay_log_records(records: List[logging.LogRecord]):
+    for record in records:
+        logging.getLogger(record.name).handle(record)
+
+
+class _BranchLogHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []  # type: List[logging.LogRecord]
+
+    def emit(self, record: logging.LogRecord):
+        # format arguments and exception information now, since they might not be picklable
+        record.msg = self.format(record)
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        self.records.append(record)
+
+
+class _TaskRunnerWarning(UserWarning):
+    def __reduce__(self):
+        # warnings raised in worker processes are pickled, which requires restoring them from their message only
+        return _restore_warning, (type(self), str(self))
+
+
+def _restore_warning(type_: type, message: str):
+    warning = type_.__new__(type_)
+    UserWarning.__init__(warning, message)
+    return warning
+
+
+class TaskParameterUnavailableWarning(_TaskRunnerWarning):
     def __init__(self, task, parameter: Parameter):
         super().__init__("Missing parameter {} for task {}".format(parameter.name, type(task).__name__))
         self.task = task
         self.parameter = parameter
 
 
-class TaskParameterDuplicateTypeWarning(UserWarning):
+class TaskParameterDuplicateTypeWarning(_TaskRunnerWarning):
     def __init__(self, task, type_: type):
         super().__init__(
             "Parameter type {} provided by task {} already exists".format(type_.__name__, type(task).__name__))
 
 
-class TaskRequestsDuplicateTypeWarning(UserWarning):
+class TaskRequestsDuplicateTypeWarning(_TaskRunnerWarning):
     def __init__(self, task, type_: type):
         super().__init__("Task {} requests multiple parameters of type {}".format(type(task).__name__, type_.__name__))
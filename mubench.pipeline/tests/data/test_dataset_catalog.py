@@ -0,0 +1,138 @@
+from os import remove
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest.mock import patch
+
+from nose.tools import assert_equals
+
+from data.correct_usage import CorrectUsage
+from data.dataset_catalog import DatasetCatalog, use_dataset_catalog
+from data.misuse import Misuse
+from data.project import Project
+from data.project_version import ProjectVersion
+from utils.io import write_yaml, safe_write
+
+
+class TestDatasetCatalog:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-catalog-test_")
+        self.data_path = join(self.temp_dir, "data")
+        self.catalog_file_path = join(self.temp_dir, "catalog.sqlite")
+
+    def teardown(self):
+        use_dataset_catalog(None)
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reads_metadata_files(self):
+        write_yaml({"name": "-name-"}, join(self.data_path, "-p-", "project.yml"))
+        write_yaml({"revision": "-r-"}, join(self.data_path, "-p-", "versions", "-v-", "version.yml"))
+        write_yaml({"description": "-d-"}, join(self.data_path, "-p-", "misuses", "-m-", "misuse.yml"))
+
+        uut = self.open_catalog()
+
+        assert_equals({"name": "-name-"}, uut.get(join(self.data_path, "-p-", "project.yml")))
+        assert_equals({"revision": "-r-"}, uut.get(join(self.data_path, "-p-", "versions", "-v-", "version.yml")))
+        assert_equals({"description": "-d-"}, uut.get(join(self.data_path, "-p-", "misuses", "-m-", "misuse.yml")))
+
+    def test_does_not_parse_unchanged_files_again(self):
+        project_file = join(self.data_path, "-p-", "project.yml")
+        write_yaml({"name": "-name-"}, project_file)
+        self.open_catalog()
+
+        with patch("data.dataset_catalog.read_yaml") as read_yaml_mock:
+            uut = self.open_catalog()
+
+        read_yaml_mock.assert_not_called()
+        assert_equals({"name": "-name-"}, uut.get(project_file))
+
+    def test_updates_changed_file(self):
+        project_file = join(self.data_path, "-p-", "project.yml")
+        write_yaml({"name": "-old-"}, project_file)
+        self.open_catalog()
+        write_yaml({"name": "-new-name-"}, project_file)
+
+        uut = self.open_catalog()
+
+        assert_equals({"name": "-new-name-"}, uut.get(project_file))
+
+    def test_drops_deleted_file(self):
+        project_file = join(self.data_path, "-p-", "project.yml")
+        write_yaml({"name": "-name-"}, project_file)
+        self.open_catalog()
+        remove(project_file)
+
+        uut = self.open_catalog()
+
+        assert project_file not in uut
+        assert_equals(0, len(uut))
+
+    def test_ignores_other_files(self):
+        write_yaml({"name": "-name-"}, join(self.data_path, "-p-", "other.yml"))
+
+        uut = self.open_catalog()
+
+        assert_equals(0, len(uut))
+
+    def test_skips_malformed_file(self):
+        safe_write("name: [", join(self.data_path, "-p-", "project.yml"), append=False)
+
+        uut = self.open_catalog()
+
+        assert_equals(0, len(uut))
+
+    def test_returns_copies(self):
+        project_file = join(self.data_path, "-p-", "project.yml")
+        write_yaml({"name": "-name-"}, project_file)
+        uut = self.open_catalog()
+
+        uut.get(project_file)["name"] = "-modified-"
+
+        assert_equals({"name": "-name-"}, uut.get(project_file))
+
+    def test_entities_read_from_catalog(self):
+        write_yaml({"name": "-name-"}, join(self.data_path, "-p-", "project.yml"))
+        write_yaml({"revision": "-r-"}, join(self.data_path, "-p-", "versions", "-v-", "version.yml"))
+        write_yaml({"description": "-d-"}, join(self.data_path, "-p-", "misuses", "-m-", "misuse.yml"))
+        use_dataset_catalog(self.open_catalog())
+        # the entities must not parse the files themselves
+        rmtree(self.data_path)
+
+        assert_equals("-name-", Project(self.data_path, "-p-").name)
+        assert_equals("-r-", ProjectVersion(self.data_path, "-p-", "-v-").revision)
+        assert_equals("-d-", Misuse(self.data_path, "-p-", "-v-", "-m-").description)
+
+    def test_indexes_correct_usages(self):
+        misuse_path = join(self.data_path, "-p-", "misuses", "-m-")
+        write_yaml({}, join(misuse_path, "misuse.yml"))
+        safe_write("", join(misuse_path, "correct-usages", "A.java"), append=False)
+        safe_write("", join(misuse_path, "correct-usages", "pkg", "B.java"), append=False)
+        safe_write("", join(misuse_path, "correct-usages", "README.md"), append=False)
+
+        uut = self.open_catalog()
+
+        assert_equals(["A.java", join("pkg", "B.java")],
+                      uut.get_correct_usage_files(join(misuse_path, "correct-usages")))
+
+    def test_indexes_misuse_without_correct_usages(self):
+        misuse_path = join(self.data_path, "-p-", "misuses", "-m-")
+        write_yaml({}, join(misuse_path, "misuse.yml"))
+
+        uut = self.open_catalog()
+
+        assert_equals([], uut.get_correct_usage_files(join(misuse_path, "correct-usages")))
+
+    def test_misuse_reads_correct_usages_from_catalog(self):
+        misuse_path = join(self.data_path, "-p-", "misuses", "-m-")
+        write_yaml({}, join(misuse_path, "misuse.yml"))
+        safe_write("", join(misuse_path, "correct-usages", "A.java"), append=False)
+        use_dataset_catalog(self.open_catalog())
+        rmtree(self.data_path)
+
+        correct_usages = Misuse(self.data_path, "-p-", "-v-", "-m-").correct_usages
+
+        assert_equals({CorrectUsage(join(misuse_path, "correct-usages"), "A.java")}, correct_usages)
+
+    def open_catalog(self) -> DatasetCatalog:
+        return DatasetCatalog(self.data_path, self.catalog_file_path).open()
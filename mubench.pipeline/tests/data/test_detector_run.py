@@ -103,6 +103,39 @@ class TestDetectorRun:
 
         assert_equals(Result.timeout, self.uut.result)
 
+    def test_execute_reserves_max_heap_size(self, write_yaml_mock):
+        self.detector.runner_interface.java_options = ["-Xmx2G"]
+        memory_budget = MagicMock()
+        uut = DetectorRun(self.detector, self.version, self.findings_path, memory_budget)
+        uut.expected_runtime = 42
+
+        uut._execute("-compiles-", 42, 0, self.logger)
+
+        memory_budget.acquire.assert_called_once_with(2 * 1024 ** 3, 42)
+        memory_budget.release.assert_called_once_with(2 * 1024 ** 3)
+
+    def test_execute_releases_memory_on_failure(self, write_yaml_mock):
+        self.detector.runner_interface.java_options = ["-Xmx2G"]
+        self.detector.runner_interface.execute = MagicMock(side_effect=CommandFailedError("-cmd-", "-out-"))
+        memory_budget = MagicMock()
+        uut = DetectorRun(self.detector, self.version, self.findings_path, memory_budget)
+
+        uut._execute("-compiles-", 42, 0, self.logger)
+
+        memory_budget.release.assert_called_once_with(2 * 1024 ** 3)
+
+    @patch("data.detector_run.remove_tree")
+    @patch("data.detector_run.makedirs")
+    @patch("data.detector_run.read_yaml_if_exists")
+    def test_expects_runtime_of_previous_run(self, read_run_info, _, __, ___):
+        read_run_info.return_value = {"result": "success", "runtime": "23.42"}
+        uut = DetectorRun(self.detector, self.version, self.findings_path)
+        uut._execute = MagicMock()
+
+        uut.ensure_executed(self.detector_args, None, True, 0, 0, self.logger)
+
+        assert_equals(23.42, uut.expected_runtime)
+
     def test_saves_after_execution(self, write_yaml_mock):
         self.uut._execute("-compiles-", 42, 1337, self.logger)
 
@@ -145,6 +178,26 @@ class TestDetectorRun:
 
         uut._execute.assert_called_with(ANY, None, 0, ANY)
 
+    def test_needs_execution_without_previous_run(self, _):
+        uut = DetectorRun(self.detector, self.version, self.findings_path)
+        uut.is_outdated = lambda _: False
+
+        assert uut.needs_execution(False, 0)
+
+    def test_needs_no_execution_if_previous_run_failed(self, _):
+        uut = DetectorRun(self.detector, self.version, self.findings_path)
+        uut.is_outdated = lambda _: False
+        uut.is_error = lambda: True
+
+        assert not uut.needs_execution(False, 0)
+
+    def test_needs_execution_if_forced(self, _):
+        uut = DetectorRun(self.detector, self.version, self.findings_path)
+        uut.is_outdated = lambda _: False
+        uut.is_success = lambda: True
+
+        assert uut.needs_execution(True, 0)
+
     def test_adds_run_file_path_arg(self, _):
         uut = DetectorRun(self.detector, self.version, self.findings_path)
         uut._execute = MagicMock()
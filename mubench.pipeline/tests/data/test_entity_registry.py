@@ -0,0 +1,75 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from nose.tools import assert_equals
+
+from data.entity_registry import EntityRegistry, use_entity_registry, get_entity
+from data.misuse import Misuse
+from data.project import Project
+from data.project_version import ProjectVersion
+from utils.io import write_yaml
+
+
+class TestEntityRegistry:
+    def test_creates_entity_once(self):
+        uut = EntityRegistry()
+
+        project = uut.get(Project, "-base-", "-p-")
+
+        assert uut.get(Project, "-base-", "-p-") is project
+        assert_equals("-p-", project.id)
+
+    def test_distinguishes_entities(self):
+        uut = EntityRegistry()
+
+        assert uut.get(Project, "-base-", "-p1-") is not uut.get(Project, "-base-", "-p2-")
+
+    def test_invalidates_entity(self):
+        uut = EntityRegistry()
+        project = uut.get(Project, "-base-", "-p-")
+
+        uut.invalidate(project)
+
+        assert uut.get(Project, "-base-", "-p-") is not project
+
+    def test_clears_entities(self):
+        uut = EntityRegistry()
+        uut.get(Project, "-base-", "-p-")
+
+        uut.clear()
+
+        assert_equals(0, len(uut))
+
+    def test_creates_new_entities_without_active_registry(self):
+        assert get_entity(Project, "-base-", "-p-") is not get_entity(Project, "-base-", "-p-")
+
+
+class TestSharedEntities:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.data_path = mkdtemp(prefix="mubench-registry-test_")
+        write_yaml({"name": "-name-"}, join(self.data_path, "-p-", "project.yml"))
+        write_yaml({"misuses": ["-m-"]}, join(self.data_path, "-p-", "versions", "-v-", "version.yml"))
+        write_yaml({}, join(self.data_path, "-p-", "misuses", "-m-", "misuse.yml"))
+        use_entity_registry(EntityRegistry())
+
+    def teardown(self):
+        use_entity_registry(None)
+        rmtree(self.data_path, ignore_errors=True)
+
+    def test_versions_share_project(self):
+        project = get_entity(Project, self.data_path, "-p-")
+
+        version = project.versions[0]
+
+        assert version._ProjectVersion__project is project
+        assert get_entity(ProjectVersion, self.data_path, "-p-", "-v-") is version
+
+    def test_misuses_share_project(self):
+        version = get_entity(ProjectVersion, self.data_path, "-p-", "-v-")
+
+        misuse = version.misuses[0]
+
+        assert misuse._Misuse__project is version._ProjectVersion__project
+        assert get_entity(Misuse, self.data_path, "-p-", "-v-", "-m-") is misuse
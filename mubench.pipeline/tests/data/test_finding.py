@@ -1,9 +1,10 @@
 from typing import Dict
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from nose.tools import assert_equals, assert_raises
 
 from data.finding import Finding
+from data.misuse import Misuse
 from data.snippets import Snippet, SnippetUnavailableException
 from tests.test_utils.data_util import create_misuse
 from utils.shell import CommandFailedError
@@ -14,7 +15,11 @@ class TestPotentialHit:
     def setup(self):
         self.misuse = create_misuse('misuse', meta={"location": {"file": "a", "method": "m()"}})
         self.snippets = []
-        self.misuse.get_snippets = lambda *_: self.snippets
+        self.get_snippets_patch = patch.object(Misuse, "get_snippets", MagicMock(side_effect=lambda *_: self.snippets))
+        self.get_snippets_mock = self.get_snippets_patch.start()
+
+    def teardown(self):
+        self.get_snippets_patch.stop()
 
     def test_matches_on_file(self):
         self.misuse.location.file = "some-class.java"
@@ -73,6 +78,16 @@ class TestPotentialHit:
         self.snippets = [Snippet("{\n-some-\n-code-\n}", self.misuse.location.line)]
         self.assert_no_potential_hit({"method": "method(A)", "startline": 1337})
 
+    def test_extracts_misuse_snippets_once_for_all_findings(self):
+        self.misuse.location.method = "method(A)"
+        self.misuse.location.line = 40
+        self.snippets = [Snippet("{\n-some-\n-code-\n}", self.misuse.location.line)]
+
+        self.assert_potential_hit({"method": "method(A)", "startline": 41})
+        self.assert_no_potential_hit({"method": "method(A)", "startline": 1337})
+
+        assert_equals(1, self.get_snippets_mock.call_count)
+
     def assert_potential_hit(self, finding_data: Dict[str, str], method_name_only: bool=False):
         finding = self.create_finding(finding_data)
         assert finding.is_potential_hit(self.misuse, [], method_name_only)
@@ -90,7 +105,7 @@ class TestPotentialHit:
         return Finding(finding_data)
 
 
-@patch("data.snippets.exec_util")
+@patch("data.snippets.extract_methods")
 class TestTargetCode:
     def test_no_code(self, utils_mock):
         utils_mock.return_value = ""
@@ -101,16 +116,16 @@ class TestTargetCode:
             finding.get_snippets(["/base"])
 
     def test_loads_snippet(self, utils_mock):
-        utils_mock.side_effect = lambda tool, args:\
-                "42:T:-code-" if tool == "MethodExtractor" and args == '"/base/-file-" "-method-"' else ""
+        utils_mock.side_effect = lambda file, method:\
+                "42:T:-code-" if file == "/base/-file-" and method == "-method-" else ""
 
         finding = Finding({"file": "-file-", "method": "-method-"})
 
         assert_equals([Snippet("class T {\n-code-\n}", 41)], finding.get_snippets(["/base"]))
 
     def test_loads_snippet_absolute_path(self, utils_mock):
-        utils_mock.side_effect = lambda tool, args: \
-            "42:T:-code-" if tool == "MethodExtractor" and args == '"/-absolute-file-" "-method-"' else ""
+        utils_mock.side_effect = lambda file, method: \
+            "42:T:-code-" if file == "/-absolute-file-" and method == "-method-" else ""
 
         finding = Finding({"file": "/-absolute-file-", "method": "-method-"})
 
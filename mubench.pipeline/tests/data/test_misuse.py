@@ -1,13 +1,18 @@
+import pickle
 from os import makedirs
 from os.path import join, dirname, exists
 from shutil import rmtree
 from tempfile import mkdtemp
+from unittest.mock import MagicMock, patch
 
-from nose.tools import assert_equals
+import yaml
+from nose.tools import assert_equals, assert_raises
 
 from data.misuse import Misuse, Location
 from data.correct_usage import CorrectUsage
+from data.snippets import Snippet, SnippetUnavailableException
 from tests.test_utils.data_util import create_misuse
+from utils.io import safe_open
 
 
 # noinspection PyAttributeOutsideInit
@@ -57,6 +62,50 @@ class TestMisuse:
         assert_equals("blub", misuse.fix.description)
         assert_equals("42", misuse.fix.revision)
 
+    def test_keeps_only_read_fields_of_metadata(self):
+        with safe_open(self.uut.misuse_file, 'w') as file:
+            yaml.dump({"description": "-description-", "characteristics": ["-unused-"]}, file)
+
+        assert_equals("-description-", self.uut.description)
+        assert_equals(None, self.uut._YAML)
+        assert not hasattr(self.uut, "__dict__")
+
+    def test_survives_pickling(self):
+        misuse = create_misuse("-m-", meta={"api": ["java.util.List"]})
+
+        copy = pickle.loads(pickle.dumps(misuse))
+
+        assert_equals(misuse, copy)
+        assert_equals(["java.util.List"], copy.apis)
+        assert_equals(Location("-dummy-/-file-", "-method-()", -1), copy.location)
+
+    def test_extracts_snippet_line_ranges_once(self):
+        misuse = create_misuse("-m-")
+        with patch.object(Misuse, "get_snippets", MagicMock(return_value=[Snippet("class C {\n-code-\n}", 41)])) \
+                as get_snippets_mock:
+            misuse.get_snippet_line_ranges(["/base"])
+            line_ranges = misuse.get_snippet_line_ranges(["/base"])
+
+        assert_equals([(41, 43)], line_ranges)
+        get_snippets_mock.assert_called_once_with(["/base"])
+
+    def test_extracts_snippet_line_ranges_per_source_paths(self):
+        misuse = create_misuse("-m-")
+        with patch.object(Misuse, "get_snippets", MagicMock(return_value=[])) as get_snippets_mock:
+            misuse.get_snippet_line_ranges(["/base1"])
+            misuse.get_snippet_line_ranges(["/base2"])
+
+        assert_equals(2, get_snippets_mock.call_count)
+
+    def test_remembers_unavailable_snippets(self):
+        misuse = create_misuse("-m-")
+        with patch.object(Misuse, "get_snippets",
+                          MagicMock(side_effect=SnippetUnavailableException("-file-", "-method-"))) as get_snippets_mock:
+            assert_raises(SnippetUnavailableException, misuse.get_snippet_line_ranges, ["/base"])
+            assert_raises(SnippetUnavailableException, misuse.get_snippet_line_ranges, ["/base"])
+
+        get_snippets_mock.assert_called_once_with(["/base"])
+
     @staticmethod
     def create_correct_usage_file(misuse: Misuse, filename: str) -> CorrectUsage:
         correct_usages_path = join(misuse.path, "correct-usages")
@@ -0,0 +1,44 @@
+from unittest.mock import PropertyMock, patch
+
+from nose.tools import assert_equals
+
+from data.misuse_version_index import MisuseVersionIndex
+from data.project_version import ProjectVersion
+from tests.test_utils.data_util import create_misuse, create_project, create_version
+
+
+class TestMisuseVersionIndex:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.project = create_project("-p-")
+        self.version1 = create_version("-v1-", misuses=[], meta={}, project=self.project)
+        self.version2 = create_version("-v2-", misuses=[], meta={}, project=self.project)
+        self.misuse = create_misuse("-m-", project=self.project, version=self.version1)
+        self.version2._MISUSES.append(self.misuse)
+        self.other_misuse = create_misuse("-m2-", project=self.project, version=self.version2)
+
+    def test_finds_versions_of_misuse(self):
+        uut = MisuseVersionIndex()
+
+        assert_equals([self.version1, self.version2], uut.get_versions(self.project, self.misuse))
+        assert_equals([self.version2], uut.get_versions(self.project, self.other_misuse))
+
+    def test_finds_misuses_of_version(self):
+        uut = MisuseVersionIndex()
+
+        assert_equals([self.misuse, self.other_misuse], uut.get_misuses(self.project, self.version2))
+
+    def test_finds_no_versions_of_unlisted_misuse(self):
+        uut = MisuseVersionIndex()
+
+        assert_equals([], uut.get_versions(self.project, create_misuse("-unlisted-", project=create_project("-p2-"))))
+
+    def test_indexes_project_once(self):
+        uut = MisuseVersionIndex()
+        uut.get_versions(self.project, self.misuse)
+
+        with patch.object(ProjectVersion, "misuses", new_callable=PropertyMock) as misuses_mock:
+            uut.get_versions(self.project, self.other_misuse)
+            uut.get_misuses(self.project, self.version1)
+
+        misuses_mock.assert_not_called()
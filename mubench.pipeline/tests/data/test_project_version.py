@@ -40,6 +40,14 @@ class TestProjectVersion:
 
         assert_equals(test_dict, self.uut._yaml)
 
+    def test_keeps_only_read_fields_of_metadata(self):
+        with safe_open(self.uut.version_file, 'w+') as stream:
+            yaml.dump({"revision": "42", "characteristics": ["-unused-"]}, stream)
+
+        assert_equals("42", self.uut.revision)
+        assert_equals(None, self.uut._YAML)
+        assert not hasattr(self.uut, "__dict__")
+
     def test_finds_misuses(self):
         misuse = create_misuse("1", project=create_project(self.project_id, base_path=self.temp_dir))
         create_file(misuse.misuse_file)
@@ -0,0 +1,58 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from nose.tools import assert_equals
+
+from data.runtime_history import RuntimeHistory
+from utils.io import write_yaml
+
+
+class TestRuntimeHistory:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.findings_path = mkdtemp(prefix="mubench-runtime-history-test_")
+        self.uut = RuntimeHistory(self.findings_path)
+
+    def teardown(self):
+        rmtree(self.findings_path, ignore_errors=True)
+
+    def test_reads_version_runtime(self):
+        self.write_run_file(["ex2", "-detector-", "-project-", "-version-"], 42)
+
+        assert_equals(42, self.uut.get_version_runtime("-project-.-version-"))
+
+    def test_sums_misuse_runtimes(self):
+        self.write_run_file(["ex1", "-detector-", "-project-", "-version-", "-m1-"], 2)
+        self.write_run_file(["ex1", "-detector-", "-project-", "-version-", "-m2-"], 3)
+
+        assert_equals(5, self.uut.get_version_runtime("-project-.-version-"))
+
+    def test_takes_longest_detector_runtime(self):
+        self.write_run_file(["ex2", "-detector1-", "-project-", "-version-"], 2)
+        self.write_run_file(["ex2", "-detector2-", "-project-", "-version-"], 3)
+
+        assert_equals(3, self.uut.get_version_runtime("-project-.-version-"))
+
+    def test_no_runtime_without_run(self):
+        assert_equals(None, self.uut.get_version_runtime("-project-.-version-"))
+
+    def test_reads_misuse_runtime(self):
+        self.write_run_file(["ex1", "-detector1-", "-project-", "-version-", "-m1-"], 2)
+        self.write_run_file(["ex1", "-detector2-", "-project-", "-version-", "-m1-"], 3)
+
+        assert_equals(3, self.uut.get_misuse_runtime("-project-.-version-.-m1-"))
+
+    def test_median_version_runtime(self):
+        self.write_run_file(["ex2", "-detector-", "-project-", "-v1-"], 1)
+        self.write_run_file(["ex2", "-detector-", "-project-", "-v2-"], 2)
+        self.write_run_file(["ex2", "-detector-", "-project-", "-v3-"], 9)
+
+        assert_equals(2, self.uut.get_median_version_runtime())
+
+    def test_no_median_runtime_without_runs(self):
+        assert_equals(None, self.uut.get_median_version_runtime())
+        assert_equals(None, self.uut.get_median_misuse_runtime())
+
+    def write_run_file(self, path_segments, runtime):
+        write_yaml({"runtime": runtime}, join(self.findings_path, *path_segments, "run.yml"))
@@ -0,0 +1,149 @@
+import pickle
+import sqlite3
+from contextlib import closing
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest.mock import patch
+
+from nose.tools import assert_equals
+
+from data.snippet_cache import SnippetCache, use_snippet_cache
+from data.snippets import Snippet, get_snippets, get_snippets_batch
+from utils.io import safe_write
+from utils.java_method_index import UnsupportedJavaSourceError
+
+
+class TestSnippetCache:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-snippet-cache-test_")
+        self.cache_file_path = join(self.temp_dir, "snippet-cache.sqlite")
+        self.source_file = join(self.temp_dir, "src", "C.java")
+        safe_write("class C {}", self.source_file, append=False)
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_misses_unknown_key(self):
+        uut = SnippetCache(self.cache_file_path)
+
+        assert_equals(None, uut.get(uut.get_key(self.source_file, "m()", -1, "-extractor-")))
+        assert_equals(1, uut.misses)
+
+    def test_stores_snippets_across_runs(self):
+        key = SnippetCache(self.cache_file_path).get_key(self.source_file, "m()", -1, "-extractor-")
+        SnippetCache(self.cache_file_path).add(key, [Snippet("-code-", 42)])
+
+        uut = SnippetCache(self.cache_file_path)
+
+        assert_equals([Snippet("-code-", 42)], uut.get(key))
+        assert_equals(1, uut.hits)
+
+    def test_key_changes_with_file_content(self):
+        uut = SnippetCache(self.cache_file_path)
+        key = uut.get_key(self.source_file, "m()", -1, "-extractor-")
+
+        safe_write("class C { void m() {} }", self.source_file, append=False)
+
+        assert uut.get_key(self.source_file, "m()", -1, "-extractor-") != key
+
+    def test_key_differs_by_method_and_line(self):
+        uut = SnippetCache(self.cache_file_path)
+
+        keys = {uut.get_key(self.source_file, "m()", -1, "-extractor-"),
+                uut.get_key(self.source_file, "n()", -1, "-extractor-"),
+                uut.get_key(self.source_file, "m()", 42, "-extractor-")}
+
+        assert_equals(3, len(keys))
+
+    def test_key_differs_by_extractor_version(self):
+        uut = SnippetCache(self.cache_file_path)
+
+        assert uut.get_key(self.source_file, "m()", -1, "-extractor-") != \
+            uut.get_key(self.source_file, "m()", -1, "-other-extractor-")
+
+    def test_no_key_for_missing_file(self):
+        uut = SnippetCache(self.cache_file_path)
+
+        assert_equals(None, uut.get_key(join(self.temp_dir, "-missing-.java"), "m()", -1, "-extractor-"))
+
+    @patch("data.snippet_cache.time.time")
+    def test_evicts_least_recently_used_snippets(self, time_mock):
+        time_mock.side_effect = range(100)
+        entry_size = len(pickle.dumps([Snippet("-code-", 1)], pickle.HIGHEST_PROTOCOL))
+        uut = SnippetCache(self.cache_file_path, max_size_in_bytes=2 * entry_size)
+        uut.add("-k1-", [Snippet("-code-", 1)])
+        uut.add("-k2-", [Snippet("-code-", 1)])
+        uut.get("-k1-")
+
+        uut.add("-k3-", [Snippet("-code-", 1)])
+
+        assert_equals(2, len(uut))
+        assert_equals(None, uut.get("-k2-"))
+        assert uut.get("-k1-") is not None
+
+    def test_reuses_connection(self):
+        uut = SnippetCache(self.cache_file_path)
+
+        with patch("data.snippet_cache.sqlite3.connect", wraps=sqlite3.connect) as connect_mock:
+            uut.add("-k1-", [Snippet("-code-", 1)])
+            uut.add("-k2-", [Snippet("-code-", 1)])
+            uut.get("-k1-")
+
+        assert_equals(1, connect_mock.call_count)
+
+    @patch("data.snippet_cache.time.time")
+    def test_records_uses_in_batches(self, time_mock):
+        time_mock.return_value = 1
+        uut = SnippetCache(self.cache_file_path)
+        uut.add("-k-", [Snippet("-code-", 1)])
+        time_mock.return_value = 2
+
+        uut.get("-k-")
+        last_used_before_flush = self._get_last_used("-k-")
+        uut.flush()
+
+        assert_equals(1, last_used_before_flush)
+        assert_equals(2, self._get_last_used("-k-"))
+
+    def _get_last_used(self, key):
+        with closing(sqlite3.connect(self.cache_file_path)) as connection:
+            return connection.execute("SELECT last_used FROM snippets WHERE key = ?", (key,)).fetchone()[0]
+
+
+@patch("data.snippets.extract_methods")
+class TestGetSnippetsWithCache:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-snippet-cache-test_")
+        safe_write("class C {}", join(self.temp_dir, "C.java"), append=False)
+        use_snippet_cache(SnippetCache(join(self.temp_dir, "snippet-cache.sqlite")))
+        self.index_patch = patch("data.snippets.get_java_method_index",
+                                 side_effect=UnsupportedJavaSourceError("-unsupported-"))
+        self.index_patch.start()
+
+    def teardown(self):
+        self.index_patch.stop()
+        use_snippet_cache(None)
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_extracts_snippet_once(self, extract_mock):
+        extract_mock.return_value = "1:C:-code-"
+
+        get_snippets([self.temp_dir], "C.java", "m()")
+        snippets = get_snippets([self.temp_dir], "C.java", "m()")
+
+        assert_equals([Snippet("class C {\n-code-\n}", 0)], snippets)
+        extract_mock.assert_called_once_with(join(self.temp_dir, "C.java"), "m()")
+
+    @patch("data.snippets.extract_all_methods")
+    def test_batch_extracts_only_uncached_snippets(self, extract_all_mock, extract_mock):
+        extract_mock.return_value = "1:C:-code-"
+        extract_all_mock.side_effect = lambda file, methods: ["2:C:-other-code-"] * len(methods)
+        get_snippets([self.temp_dir], "C.java", "m()")
+
+        snippets = get_snippets_batch([self.temp_dir], [("C.java", "m()", -1), ("C.java", "n()", -1)])
+
+        assert_equals([[Snippet("class C {\n-code-\n}", 0)], [Snippet("class C {\n-other-code-\n}", 1)]], snippets)
+        extract_all_mock.assert_called_once_with(join(self.temp_dir, "C.java"), ["n()"])
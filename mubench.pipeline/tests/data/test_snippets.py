@@ -0,0 +1,104 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest.mock import patch
+
+from nose.tools import assert_equals, assert_raises
+
+from data.snippets import get_snippets, get_snippets_batch, Snippet, use_java_method_index
+from utils.io import safe_write
+from utils.java_utils import MethodExtractorServer
+from utils.shell import CommandFailedError
+
+
+@patch("data.snippets.extract_all_methods")
+class TestGetSnippetsBatch:
+    def test_extracts_methods_of_each_file_at_once(self, extract_mock):
+        extract_mock.side_effect = lambda file, methods: ["1:C:{}".format(method) for method in methods]
+
+        snippets = get_snippets_batch(["/base"], [("A.java", "m()", -1), ("B.java", "n()", -1), ("A.java", "o()", -1)])
+
+        assert_equals([[Snippet("class C {\nm()\n}", 0)], [Snippet("class C {\nn()\n}", 0)],
+                       [Snippet("class C {\no()\n}", 0)]], snippets)
+        assert_equals(2, extract_mock.call_count)
+        extract_mock.assert_any_call("/base/A.java", ["m()", "o()"])
+
+    def test_prefers_snippets_with_target_line(self, extract_mock):
+        extract_mock.return_value = ["1:C:-code-\n===\n5:C:-other-code-"]
+
+        snippets = get_snippets_batch(["/base"], [("A.java", "m()", 5)])
+
+        assert_equals([[Snippet("class C {\n-other-code-\n}", 4)]], snippets)
+
+    def test_no_snippets_if_extraction_fails(self, extract_mock):
+        extract_mock.side_effect = ValueError("-error-")
+
+        assert_equals([[]], get_snippets_batch(["/base"], [("A.java", "m()", -1)]))
+
+    def test_raises_programming_errors(self, extract_mock):
+        extract_mock.side_effect = TypeError("-error-")
+
+        assert_raises(TypeError, get_snippets_batch, ["/base"], [("A.java", "m()", -1)])
+
+    def test_collects_snippets_from_all_source_paths(self, extract_mock):
+        extract_mock.return_value = ["1:C:-code-"]
+
+        snippets = get_snippets_batch(["/base1", "/base2"], [("A.java", "m()", -1)])
+
+        assert_equals(2, len(snippets[0]))
+
+    @patch("utils.java_utils.exec_util")
+    def test_collects_snippets_from_other_source_paths_if_fallback_fails(self, exec_util_mock, extract_mock):
+        def exec_util(main, args):
+            if "/base1/" in args:
+                raise CommandFailedError("-command-", "-output-")
+            return "1:C:-code-"
+        exec_util_mock.side_effect = exec_util
+        server = MethodExtractorServer(lambda: ["-unavailable-server-"])
+        extract_mock.side_effect = server.extract_all
+
+        snippets = get_snippets_batch(["/base1", "/base2"], [("A.java", "m()", -1)])
+
+        assert_equals([[Snippet("class C {\n-code-\n}", 0)]], snippets)
+
+
+class TestGetSnippetsFromIndex:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-snippets-test_")
+        use_java_method_index(True)
+
+    def teardown(self):
+        use_java_method_index(False)
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch("data.snippets.extract_methods")
+    def test_extracts_method_without_utils(self, extract_mock):
+        safe_write("class C {\n  void m() {}\n}", join(self.temp_dir, "C.java"), append=False)
+
+        snippets = get_snippets([self.temp_dir], "C.java", "m()")
+
+        assert_equals([Snippet("class C {\n  void m() {}\n}", 1)], snippets)
+        extract_mock.assert_not_called()
+
+    @patch("data.snippets.extract_all_methods")
+    def test_falls_back_to_utils_for_unsupported_code(self, extract_mock):
+        extract_mock.return_value = ["1:C:-code-"]
+        safe_write("class C {\n  void m() {\n}", join(self.temp_dir, "C.java"), append=False)
+
+        snippets = get_snippets_batch([self.temp_dir], [("C.java", "m()", -1)])
+
+        assert_equals([[Snippet("class C {\n-code-\n}", 0)]], snippets)
+        extract_mock.assert_called_once_with(join(self.temp_dir, "C.java"), ["m()"])
+
+
+@patch("data.snippets.extract_methods")
+@patch("data.snippets.get_java_method_index")
+class TestGetSnippetsWithoutIndex:
+    def test_extracts_method_with_utils_by_default(self, index_mock, extract_mock):
+        extract_mock.return_value = "1:C:-code-"
+
+        snippets = get_snippets(["/base"], "C.java", "m()")
+
+        assert_equals([Snippet("class C {\n-code-\n}", 0)], snippets)
+        index_mock.assert_not_called()
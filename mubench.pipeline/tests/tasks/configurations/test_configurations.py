@@ -1,8 +1,14 @@
+from argparse import Namespace
 from typing import List, Optional
 
 from nose.tools import assert_raises, assert_equals
 
-from tasks.configurations.configurations import TaskConfiguration, get_task_configuration
+from tasks.configurations.configurations import TaskConfiguration, get_task_configuration, \
+    CheckoutTaskConfiguration
+from tasks.implementations.checkout import CheckoutTask
+from tasks.implementations.collect_projects import CollectProjectsTask
+from tasks.implementations.collect_versions import CollectVersionsTask, CollectAllVersionsTask, \
+    CollectVersionProjectTask
 
 
 class ConfigDummy:
@@ -28,6 +34,36 @@ class TestTaskConfigurations:
         assert_equals(configuration, SubModeTaskConfiguration.TASKS)
 
 
+def create_checkout_config(**kwargs):
+    config = Namespace(data_path="-data-", development_mode=False, checkouts_path="-checkouts-", run_timestamp=0,
+                       force_checkout=False, use_tmp_wrkdir=False, shard=None, findings_path="-findings-",
+                       compiles_path="-compiles-", jobs=1, pipeline=None, longest_first=False)
+    vars(config).update(kwargs)
+    return config
+
+
+class TestCheckoutTaskConfiguration:
+    def test_collects_versions_per_project(self):
+        tasks = CheckoutTaskConfiguration().tasks(create_checkout_config(longest_first=True))
+
+        assert_equals([CollectProjectsTask, CollectVersionsTask, CheckoutTask], [type(task) for task in tasks])
+
+    def test_collects_all_versions_at_once_in_parallel_longest_first_run(self):
+        tasks = CheckoutTaskConfiguration().tasks(create_checkout_config(longest_first=True, jobs=2))
+
+        assert_equals([CollectAllVersionsTask, CollectVersionProjectTask, CheckoutTask], [type(task) for task in tasks])
+
+    def test_collects_all_versions_at_once_in_pipelined_longest_first_run(self):
+        tasks = CheckoutTaskConfiguration().tasks(create_checkout_config(longest_first=True, pipeline=[]))
+
+        assert_equals([CollectAllVersionsTask, CollectVersionProjectTask, CheckoutTask], [type(task) for task in tasks])
+
+    def test_collects_versions_per_project_in_parallel_run(self):
+        tasks = CheckoutTaskConfiguration().tasks(create_checkout_config(jobs=2))
+
+        assert_equals([CollectProjectsTask, CollectVersionsTask, CheckoutTask], [type(task) for task in tasks])
+
+
 class TaskConfigurationTestImpl(TaskConfiguration):
     TASKS = ["-a-", "-b-", "-c-"]
 
@@ -1,9 +1,10 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from nose.tools import assert_equals, assert_raises
 
 from data.project_checkout import ProjectCheckout
+from data.project_version import ProjectVersion
 from tasks.implementations.checkout import CheckoutTask
 from tests.test_utils.data_util import create_project, create_version
 from utils.shell import CommandFailedError
@@ -18,7 +19,9 @@ class TestCheckout(unittest.TestCase):
 
         self.project = create_project("-project-")
         self.version = create_version("-version-", project=self.project)
-        self.version.get_checkout = MagicMock(return_value=self.checkout)
+        self.get_checkout_patch = patch.object(ProjectVersion, "get_checkout", MagicMock(return_value=self.checkout))
+        self.get_checkout_mock = self.get_checkout_patch.start()
+        self.addCleanup(self.get_checkout_patch.stop)
 
         self.run_timestamp = 1516186439
 
@@ -43,7 +46,7 @@ class TestCheckout(unittest.TestCase):
         assert_equals(self.checkout, response)
 
     def test_error_get_checkout(self):
-        self.version.get_checkout = MagicMock(side_effect=ValueError)
+        self.get_checkout_mock.side_effect = ValueError
 
         assert_raises(UserWarning, self.uut.run, self.version)
 
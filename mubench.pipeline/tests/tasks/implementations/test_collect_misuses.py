@@ -1,8 +1,11 @@
+from unittest.mock import MagicMock
+
 from nose.tools import assert_equals
 
 from tasks.implementations.collect_misuses import CollectMisusesTask
 from tests.test_utils.data_util import create_version, create_misuse, create_project
 from utils.data_entity_lists import DataEntityLists
+from utils.longest_first_order import LongestFirstOrder
 
 
 class TestCollectMisuses:
@@ -66,3 +69,15 @@ class TestCollectMisuses:
         actual = uut.run(version, DataEntityLists([], ["-project-.-version-.-id-"]))
 
         assert_equals([], actual)
+
+    def test_sorts_misuses(self):
+        m1 = create_misuse("-m1-")
+        m2 = create_misuse("-m2-")
+        version = create_version("-version-", misuses=[m1, m2], project=create_project("-project-"))
+        order = MagicMock(LongestFirstOrder)
+        order.sort_misuses.return_value = [m2, m1]
+        uut = CollectMisusesTask(order)
+
+        actual = uut.run(version, DataEntityLists([], []))
+
+        assert_equals([m2, m1], actual)
@@ -1,10 +1,13 @@
-from unittest.mock import patch, PropertyMock
+from unittest.mock import patch, PropertyMock, MagicMock
 
 from nose.tools import assert_equals
 
-from tasks.implementations.collect_versions import CollectVersionsTask
+from tasks.implementations.collect_projects import CollectProjectsTask
+from tasks.implementations.collect_versions import CollectVersionsTask, CollectAllVersionsTask, \
+    CollectVersionProjectTask
 from tests.test_utils.data_util import create_project, create_version
 from utils.data_entity_lists import DataEntityLists
+from utils.longest_first_order import LongestFirstOrder
 
 
 @patch("data.project_version.ProjectVersion.is_compilable", new_callable=PropertyMock)
@@ -69,3 +72,60 @@ class TestCollectVersions:
         actual = uut.run(project, DataEntityLists([], []))
 
         assert_equals([], actual)
+
+    def test_sorts_versions(self, version_is_compilable_mock):
+        project = create_project("-project-")
+        v1 = create_version("-v1-", project=project)
+        v2 = create_version("-v2-", project=project)
+        version_is_compilable_mock.return_value = True
+        order = MagicMock(LongestFirstOrder)
+        order.sort_versions.return_value = [v2, v1]
+        uut = CollectVersionsTask(False, order)
+
+        actual = uut.run(project, DataEntityLists([], []))
+
+        assert_equals([v2, v1], actual)
+        order.sort_versions.assert_called_with([v1, v2])
+
+
+class TestCollectAllVersions:
+    def test_collects_versions_of_all_projects(self):
+        p1 = create_project("-p1-")
+        p2 = create_project("-p2-")
+        v1 = create_version("-v1-", project=p1)
+        v2 = create_version("-v2-", project=p2)
+        collect_projects = MagicMock(CollectProjectsTask)
+        collect_projects.run.return_value = [p1, p2]
+        collect_versions = MagicMock(CollectVersionsTask)
+        collect_versions.run.side_effect = lambda project, _: project.versions
+        uut = CollectAllVersionsTask(collect_projects, collect_versions)
+
+        actual = uut.run(DataEntityLists([], []))
+
+        assert_equals([v1, v2], actual)
+
+    def test_sorts_versions_across_projects(self):
+        p1 = create_project("-p1-")
+        p2 = create_project("-p2-")
+        v1 = create_version("-v1-", project=p1)
+        v2 = create_version("-v2-", project=p2)
+        collect_projects = MagicMock(CollectProjectsTask)
+        collect_projects.run.return_value = [p1, p2]
+        collect_versions = MagicMock(CollectVersionsTask)
+        collect_versions.run.side_effect = lambda project, _: project.versions
+        order = MagicMock(LongestFirstOrder)
+        order.sort_versions.return_value = [v2, v1]
+        uut = CollectAllVersionsTask(collect_projects, collect_versions, order)
+
+        actual = uut.run(DataEntityLists([], []))
+
+        assert_equals([v2, v1], actual)
+        order.sort_versions.assert_called_with([v1, v2])
+
+
+class TestCollectVersionProject:
+    def test_returns_project_of_version(self):
+        project = create_project("-project-")
+        version = create_version("-version-", project=project)
+
+        assert_equals(project, CollectVersionProjectTask().run(version))
@@ -4,6 +4,7 @@ from tempfile import mkdtemp
 from unittest.mock import patch, MagicMock, PropertyMock
 
 from data.correct_usage import CorrectUsage
+from data.misuse import Misuse
 from tasks.implementations.compile_misuse import CompileMisuseTask
 from tests.test_utils.data_util import create_misuse, create_project, create_version
 from utils.io import remove_tree, create_file
@@ -31,7 +32,12 @@ class TestCompilePatterns:
         create_file(join(self.compile.original_sources_paths[0], self.misuse.location.file))
 
         self.misuse_compile = self.misuse.get_misuse_compile(self.compile_base_path)
-        self.misuse.get_misuse_compile = lambda *_: self.misuse_compile
+        get_misuse_compile = Misuse.get_misuse_compile
+        self.get_misuse_compile_patch = patch.object(
+            Misuse, "get_misuse_compile", autospec=True,
+            side_effect=lambda misuse, base_path: self.misuse_compile if misuse is self.misuse
+            else get_misuse_compile(misuse, base_path))
+        self.get_misuse_compile_patch.start()
 
         self.compile_patch = patch('tasks.implementations.compile_misuse.CompileMisuseTask._compile_correct_usages')
         self.compile_mock = self.compile_patch.start()
@@ -48,6 +54,7 @@ class TestCompilePatterns:
 
     def teardown(self):
         remove_tree(self.temp_dir)
+        self.get_misuse_compile_patch.stop()
         self.compile_patch.stop()
 
     def test_copies_correct_usage_sources(self):
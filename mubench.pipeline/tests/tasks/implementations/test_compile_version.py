@@ -66,9 +66,9 @@ class TestCompileVersion:
 
     def test_skips_if_no_config(self):
         self.mock_with_fake_compile()
-        del self.version._YAML["build"]
+        version = create_version(self.version_path, project=self.project, meta={"revision": "0"}, misuses=[])
 
-        assert_raises(UserWarning, self.uut.run, self.version, self.checkout)
+        assert_raises(UserWarning, self.uut.run, version, self.checkout)
 
     def test_passes_compile_commands(self):
         self.mock_with_fake_compile()
@@ -132,3 +132,12 @@ class TestCompileVersion:
         self.uut.run(self.version, self.checkout)
 
         assert self.uut._compile.call_args_list, "not called"
+
+    @patch("data.version_compile.read_yaml")
+    def test_journal_state_changes_with_compile_without_reading_it(self, read_yaml_mock):
+        state = self.uut.get_journal_state(self.version)
+
+        self.version.get_compile(self.compile_base_path).save(self.run_timestamp)
+
+        assert state != self.uut.get_journal_state(self.version)
+        read_yaml_mock.assert_not_called()
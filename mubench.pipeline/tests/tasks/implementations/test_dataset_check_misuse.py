@@ -1,9 +1,14 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
 from unittest.mock import call, MagicMock, patch
 
 from nose.tools import assert_equals
 
-from tasks.implementations.dataset_check_misuse import MisuseCheckTask
+from data.project_version import ProjectVersion
+from tasks.implementations.dataset_check_misuse import MisuseCheckTask, MisuseCheckCache
 from tests.test_utils.data_util import create_project, create_version, create_misuse
+from utils.io import safe_write
 
 
 @patch('tasks.implementations.dataset_check_misuse.MisuseCheckTask._check_misuse_location_exists')
@@ -320,25 +325,256 @@ class TestDatasetCheckMisuseLocation:
         checkout = MagicMock()
         checkout.exists = MagicMock(return_value=True)
         checkout.base_path = "-checkout_dir-"
-        self.version.get_checkout = MagicMock(return_value=checkout)
+        self.get_checkout_patch = patch.object(ProjectVersion, "get_checkout", MagicMock(return_value=checkout))
+        self.get_checkout_mock = self.get_checkout_patch.start()
+
+    def teardown(self):
+        self.get_checkout_patch.stop()
 
     def test_unknown_location(self, _, __):
         uut = MisuseCheckTask({}, '', '')
-        uut._location_exists = MagicMock(return_value=False)
+        uut._locations_exist = MagicMock(side_effect=lambda paths, file_, methods: [False] * len(methods))
         uut._report_cannot_find_location = MagicMock()
 
         uut.run(self.project, self.version, self.misuse)
+        uut.end()
 
-        uut._location_exists.assert_called_once_with(["-checkout_dir-/-source_dir-"], "-dummy-/-file-", "-method-()")
+        uut._locations_exist.assert_called_once_with(["-checkout_dir-/-source_dir-"], "-dummy-/-file-",
+                                                    ["-method-()"])
         uut._report_cannot_find_location.assert_called_once_with("Location(-dummy-/-file-, -method-())",
                                                                  "-project-/misuses/-misuse-/misuse.yml")
 
     def test_known_location(self, _, __):
         uut = MisuseCheckTask({}, '', '')
-        uut._location_exists = MagicMock(return_value=True)
+        uut._locations_exist = MagicMock(side_effect=lambda paths, file_, methods: [True] * len(methods))
+        uut._report_cannot_find_location = MagicMock()
+
+        uut.run(self.project, self.version, self.misuse)
+        uut.end()
+
+        uut._locations_exist.assert_called_once_with(["-checkout_dir-/-source_dir-"], "-dummy-/-file-",
+                                                    ["-method-()"])
+        uut._report_cannot_find_location.assert_not_called()
+
+    def test_reports_unknown_locations_in_order_of_misuses(self, _, __):
+        misuses = [create_misuse("-m{}-".format(i), version=self.version,
+                                 meta={"location": {"file": "F{}.java".format(i % 2), "method": "m{}()".format(i)}})
+                   for i in range(4)]
+        uut = MisuseCheckTask({}, '', '', location_check_jobs=4)
+        uut._locations_exist = MagicMock(side_effect=lambda paths, file_, methods: [False] * len(methods))
+        uut._report_cannot_find_location = MagicMock()
+
+        for misuse in misuses:
+            uut.run(self.project, self.version, misuse)
+        uut.end()
+
+        assert_equals([call(str(misuse.location), "-project-/misuses/{}/misuse.yml".format(misuse.misuse_id))
+                       for misuse in misuses], uut._report_cannot_find_location.call_args_list)
+
+    def test_reports_unknown_location_with_other_reports_of_misuse(self, _, __):
+        uut = MisuseCheckTask({}, '', '')
+        uut._locations_exist = MagicMock(side_effect=lambda paths, file_, methods: [False] * len(methods))
+        uut._report_cannot_find_location = MagicMock()
+
+        uut.run(self.project, self.version, self.misuse)
+
+        uut._report_cannot_find_location.assert_called_once_with("Location(-dummy-/-file-, -method-())",
+                                                                 "-project-/misuses/-misuse-/misuse.yml")
+
+    def test_reports_unknown_location_if_check_fails(self, _, __):
+        misuses = [create_misuse("-m{}-".format(i), version=self.version,
+                                 meta={"location": {"file": "F{}.java".format(i), "method": "m()"}})
+                   for i in range(2)]
+        uut = MisuseCheckTask({}, '', '', location_check_jobs=2)
+        uut._locations_exist = MagicMock(
+            side_effect=lambda paths, file_, methods: [True] if file_ == "F1.java" else 1 / 0)
+        uut._report_cannot_find_location = MagicMock()
+
+        for misuse in misuses:
+            uut.run(self.project, self.version, misuse)
+        uut.end()
+
+        uut._report_cannot_find_location.assert_called_once_with(str(misuses[0].location),
+                                                                 "-project-/misuses/-m0-/misuse.yml")
+
+    def test_ignores_other_misuses_of_version_without_location(self, _, __):
+        other_misuse = create_misuse("-other-", version=self.version)
+        other_misuse._YAML = {}
+        uut = MisuseCheckTask({}, '', '')
+        uut._locations_exist = MagicMock(side_effect=lambda paths, file_, methods: [True] * len(methods))
         uut._report_cannot_find_location = MagicMock()
 
         uut.run(self.project, self.version, self.misuse)
 
-        uut._location_exists.assert_called_once_with(["-checkout_dir-/-source_dir-"], "-dummy-/-file-", "-method-()")
         uut._report_cannot_find_location.assert_not_called()
+
+    def test_checks_locations_of_all_misuses_of_version_in_batches_per_source_file(self, _, __):
+        version = create_version("-other-version-", meta={"build": {"src": "-source_dir-"}}, project=self.project,
+                                 misuses=[])
+        misuses = [create_misuse("-m{}-".format(i), version=version,
+                                 meta={"location": {"file": "F{}.java".format(i % 2), "method": "m{}()".format(i)}})
+                   for i in range(4)]
+        uut = MisuseCheckTask({}, '', '')
+        uut._check_locations = MagicMock(side_effect=lambda lookups: [True] * len(lookups))
+
+        for misuse in misuses:
+            uut.run(self.project, version, misuse)
+        uut.end()
+
+        assert_equals(2, uut._check_locations.call_count)
+        self.get_checkout_mock.assert_called_once_with('')
+
+
+class TestMisuseCheckCache:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-misuse-check-cache-test_")
+        self.cache_file_path = join(self.temp_dir, "cache.json")
+        self.source_file_path = join(self.temp_dir, "src", "C.java")
+        safe_write("class C { void m() {} }", self.source_file_path, append=False)
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_remembers_location_across_checks(self):
+        uut = MisuseCheckCache(self.cache_file_path)
+        key = uut.get_key([self.source_file_path], "C.java", "m()")
+        uut.add_location(key, True)
+        uut.save()
+
+        assert_equals(True, MisuseCheckCache(self.cache_file_path).get_location(key))
+
+    def test_key_changes_with_file(self):
+        uut = MisuseCheckCache(self.cache_file_path)
+        key = uut.get_key([self.source_file_path], "C.java", "m()")
+
+        safe_write("class C {}", self.source_file_path, append=False)
+
+        assert key != MisuseCheckCache(self.cache_file_path).get_key([self.source_file_path], "C.java", "m()")
+
+    def test_does_not_hash_unchanged_file_again(self):
+        uut = MisuseCheckCache(self.cache_file_path)
+        key = uut.get_key([self.source_file_path])
+        uut.save()
+
+        uut = MisuseCheckCache(self.cache_file_path)
+        with patch('builtins.open', side_effect=AssertionError("reads file")):
+            assert_equals(key, uut.get_key([self.source_file_path]))
+
+    def test_remembers_misuse_reports_across_checks(self):
+        uut = MisuseCheckCache(self.cache_file_path)
+        uut.add_misuse_reports("-key-", [self.source_file_path], ["-report-"])
+        uut.save()
+
+        assert_equals(["-report-"], MisuseCheckCache(self.cache_file_path).get_misuse_reports("-key-"))
+
+    def test_drops_misuse_reports_if_dependency_changes(self):
+        uut = MisuseCheckCache(self.cache_file_path)
+        uut.add_misuse_reports("-key-", [self.source_file_path], ["-report-"])
+        uut.save()
+
+        safe_write("class C {}", self.source_file_path, append=False)
+
+        assert_equals(None, MisuseCheckCache(self.cache_file_path).get_misuse_reports("-key-"))
+
+    def test_drops_misuse_reports_if_dependency_appears(self):
+        missing_file_path = join(self.temp_dir, "src", "D.java")
+        uut = MisuseCheckCache(self.cache_file_path)
+        uut.add_misuse_reports("-key-", [missing_file_path], [])
+        uut.save()
+
+        safe_write("class D {}", missing_file_path, append=False)
+
+        assert_equals(None, MisuseCheckCache(self.cache_file_path).get_misuse_reports("-key-"))
+
+    def test_drops_unused_results(self):
+        uut = MisuseCheckCache(self.cache_file_path)
+        uut.add_location("-key-", True)
+        uut.add_misuse_reports("-key-", [], [])
+        uut.save()
+
+        MisuseCheckCache(self.cache_file_path).save()
+
+        assert_equals(None, MisuseCheckCache(self.cache_file_path).get_location("-key-"))
+        assert_equals(None, MisuseCheckCache(self.cache_file_path).get_misuse_reports("-key-"))
+
+
+@patch('tasks.implementations.dataset_check_misuse._get_all_misuses', return_value=[])
+@patch('tasks.implementations.dataset_check_misuse.Project.repository')
+class TestMisuseCheckTaskWithCache:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-misuse-check-cache-test_")
+        self.cache_file_path = join(self.temp_dir, "cache.json")
+        self.data_path = join(self.temp_dir, "data")
+        safe_write("class C { void m() {} }", join(self.temp_dir, "src", "C.java"), append=False)
+
+        self.project = create_project("-project-", base_path=self.data_path)
+        self.version = create_version("-version-", meta={"build": {"src": "src"}}, project=self.project, misuses=[])
+        self.misuse = create_misuse("-misuse-", project=self.project, version=self.version,
+                                    meta={"location": {"file": "C.java", "method": "m()"}})
+        safe_write("-misuse-", self.misuse.misuse_file, append=False)
+        safe_write("-version-", self.version.version_file, append=False)
+
+        self.checkout = MagicMock(base_path=self.temp_dir)
+        self.checkout.exists = MagicMock(return_value=True)
+        self.get_checkout_patch = patch.object(ProjectVersion, "get_checkout", MagicMock(return_value=self.checkout))
+        self.get_checkout_mock = self.get_checkout_patch.start()
+
+    def teardown(self):
+        self.get_checkout_patch.stop()
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_check_of_changed_misuse_reuses_cached_location(self, _, __):
+        uut = self.__run_check(changed_misuse=True)
+
+        self.first_check._locations_exist.assert_called_once_with([join(self.temp_dir, "src")], "C.java", ["m()"])
+        uut._locations_exist.assert_not_called()
+
+    def test_replays_reports_of_unchanged_misuse(self, _, __):
+        uut = self.__run_check()
+
+        assert_equals(self.__get_reports(self.first_check), self.__get_reports(uut))
+
+    def test_skips_checks_of_unchanged_misuse(self, _, __):
+        uut = self.__run_check()
+
+        uut._check_required_keys_in_misuse_yaml.assert_not_called()
+        uut._locations_exist.assert_not_called()
+        self.get_checkout_mock.assert_called_once_with(self.temp_dir)
+
+    def test_checks_changed_misuse_again(self, _, __):
+        uut = self.__run_check(changed_misuse=True)
+
+        uut._check_required_keys_in_misuse_yaml.assert_called_once_with(self.project, self.misuse)
+
+    def test_checks_misuse_again_once_checkout_exists(self, _, __):
+        self.checkout.exists.return_value = False
+        rmtree(join(self.temp_dir, "src"))
+        self.first_check = self.__check()
+
+        self.checkout.exists.return_value = True
+        safe_write("class C { void m() {} }", join(self.temp_dir, "src", "C.java"), append=False)
+        uut = self.__check()
+
+        uut._locations_exist.assert_called_once_with([join(self.temp_dir, "src")], "C.java", ["m()"])
+
+    def __run_check(self, changed_misuse: bool = False) -> MisuseCheckTask:
+        self.first_check = self.__check()
+        if changed_misuse:
+            safe_write("-changed misuse-", self.misuse.misuse_file, append=False)
+        return self.__check()
+
+    def __check(self) -> MisuseCheckTask:
+        uut = MisuseCheckTask({}, self.temp_dir, self.data_path, MisuseCheckCache(self.cache_file_path))
+        uut._locations_exist = MagicMock(side_effect=lambda paths, file_, methods: [True] * len(methods))
+        uut._check_required_keys_in_misuse_yaml = MagicMock(wraps=uut._check_required_keys_in_misuse_yaml)
+        uut.logger = MagicMock()
+        with patch('tasks.implementations.dataset_check_misuse.logging.getLogger', return_value=uut.logger):
+            uut.run(self.project, self.version, self.misuse)
+            uut.end()
+        return uut
+
+    @staticmethod
+    def __get_reports(uut: MisuseCheckTask):
+        return uut.logger.warning.call_args_list
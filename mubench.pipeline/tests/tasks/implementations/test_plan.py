@@ -0,0 +1,212 @@
+from unittest.mock import MagicMock, patch
+
+from nose.tools import assert_equals
+
+from data.detector_run import DetectorRun
+from data.misuse import Misuse
+from data.project_version import ProjectVersion
+from data.runtime_history import RuntimeHistory
+from tasks.implementations.checkout import CheckoutTask
+from tasks.implementations.compile_misuse import CompileMisuseTask
+from tasks.implementations.compile_version import CompileVersionTask
+from tasks.implementations.detect_all_findings import DetectAllFindingsTask
+from tasks.implementations.detect_provided_correct_usages import DetectProvidedCorrectUsagesTask
+from tasks.implementations.plan import RunPlan, PlanCheckoutTask, PlanCompileVersionTask, PlanCompileMisuseTask, \
+    PlanDetectAllFindingsTask, PlanDetectProvidedCorrectUsagesTask
+from tests.data.stub_detector import StubDetector
+from tests.test_utils.data_util import create_version, create_project, create_misuse
+
+
+class TestRunPlan:
+    def test_tracks_executed_items(self):
+        uut = RunPlan()
+
+        uut.add("checkout", "-version-", True, "missing")
+        uut.add("compile", "-version-", False, "up to date")
+
+        assert uut.is_executed("checkout", "-version-")
+        assert not uut.is_executed("compile", "-version-")
+
+    def test_sums_expected_runtime_of_executed_items(self):
+        uut = RunPlan()
+
+        uut.add("detect", "-v1-", True, "outdated", 10)
+        uut.add("detect", "-v2-", True, "no previous run")
+        uut.add("detect", "-v3-", False, "previous run succeeded", 20)
+
+        assert_equals(10, uut.get_expected_runtime())
+
+
+class TestPlanCheckoutTask:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.version = create_version("-v-", project=create_project("-p-"))
+        self.checkout = MagicMock()
+        self.get_checkout_patch = patch.object(ProjectVersion, "get_checkout", MagicMock(return_value=self.checkout))
+        self.get_checkout_patch.start()
+        self.plan = RunPlan()
+
+    def teardown(self):
+        self.get_checkout_patch.stop()
+
+    def test_plans_missing_checkout(self):
+        self.checkout.exists.return_value = False
+        uut = PlanCheckoutTask(CheckoutTask("-checkouts-", 0, False, False), self.plan)
+
+        assert_equals(self.checkout, uut.run(self.version))
+
+        assert self.plan.is_executed("checkout", self.version)
+        self.checkout.create.assert_not_called()
+
+    def test_skips_existing_checkout(self):
+        self.checkout.exists.return_value = True
+        uut = PlanCheckoutTask(CheckoutTask("-checkouts-", 0, False, False), self.plan)
+
+        uut.run(self.version)
+
+        assert not self.plan.is_executed("checkout", self.version)
+
+    def test_plans_forced_checkout(self):
+        self.checkout.exists.return_value = True
+        uut = PlanCheckoutTask(CheckoutTask("-checkouts-", 0, True, False), self.plan)
+
+        uut.run(self.version)
+
+        assert self.plan.is_executed("checkout", self.version)
+        self.checkout.delete.assert_not_called()
+
+
+class TestPlanCompileVersionTask:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.version = create_version("-v-", project=create_project("-p-"), meta={"build": {"commands": ["-cmd-"]}})
+        self.checkout = MagicMock(timestamp=1)
+        self.version_compile = MagicMock(timestamp=1)
+        self.version_compile.is_outdated.return_value = False
+        self.version_compile.needs_compile.return_value = False
+        self.get_compile_patch = patch.object(ProjectVersion, "get_compile",
+                                              MagicMock(return_value=self.version_compile))
+        self.get_compile_patch.start()
+        self.plan = RunPlan()
+        self.uut = PlanCompileVersionTask(CompileVersionTask("-compiles-", 0, False, False), self.plan)
+
+    def teardown(self):
+        self.get_compile_patch.stop()
+
+    def test_skips_up_to_date_compile(self):
+        assert_equals(self.version_compile, self.uut.run(self.version, self.checkout))
+
+        assert not self.plan.is_executed("compile", self.version)
+
+    def test_plans_missing_compile(self):
+        self.version_compile.needs_compile.return_value = True
+
+        self.uut.run(self.version, self.checkout)
+
+        assert self.plan.is_executed("compile", self.version)
+
+    def test_plans_compile_after_planned_checkout(self):
+        self.plan.add("checkout", self.version, True, "missing")
+
+        self.uut.run(self.version, self.checkout)
+
+        assert self.plan.is_executed("compile", self.version)
+
+    def test_stops_on_version_without_build_configuration(self):
+        del self.version._YAML["build"]
+
+        assert_equals([], self.uut.run(self.version, self.checkout))
+
+
+class TestPlanCompileMisuseTask:
+    def test_plans_compile_after_planned_version_compile(self):
+        version = create_version("-v-", project=create_project("-p-"))
+        misuse = create_misuse("-m-", version=version, correct_usages=[MagicMock()])
+        misuse_compile = MagicMock()
+        misuse_compile.is_outdated.return_value = False
+        misuse_compile.needs_copy_sources.return_value = False
+        misuse_compile.needs_compile.return_value = False
+        plan = RunPlan()
+        plan.add("compile", version, True, "missing")
+        uut = PlanCompileMisuseTask(CompileMisuseTask("-compiles-", 0, False), plan)
+
+        with patch.object(Misuse, "get_misuse_compile", MagicMock(return_value=misuse_compile)):
+            uut.run(version, misuse, MagicMock(timestamp=0))
+
+        assert plan.is_executed("compile correct usages", misuse)
+
+
+@patch("tasks.implementations.plan.DetectorRun")
+class TestPlanDetectAllFindingsTask:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.detector = StubDetector()
+        self.version = create_version("-v-", project=create_project("-p-"))
+        self.version_compile = MagicMock(timestamp=1)
+        self.runtime_history = MagicMock(RuntimeHistory)
+        self.runtime_history.get_version_runtime.return_value = None
+        self.plan = RunPlan()
+        self.uut = PlanDetectAllFindingsTask(DetectAllFindingsTask("-findings-", False, None, 42),
+                                             self.runtime_history, self.plan)
+
+    def test_plans_run_with_previous_runtime(self, detector_run_mock):
+        run = self._mock_run(detector_run_mock, needs_execution=True, runtime=23.0)
+
+        assert_equals(run, self.uut.run(self.detector, self.version, self.version_compile))
+
+        assert self.plan.is_executed("detect", self.version)
+        assert_equals(23.0, self.plan.get_expected_runtime())
+        run.ensure_executed.assert_not_called()
+
+    def test_estimates_runtime_from_history_without_previous_run(self, detector_run_mock):
+        self._mock_run(detector_run_mock, needs_execution=True, result=None)
+        self.runtime_history.get_version_runtime.return_value = 42.0
+
+        self.uut.run(self.detector, self.version, self.version_compile)
+
+        assert_equals(42.0, self.plan.get_expected_runtime())
+
+    def test_skips_up_to_date_run(self, detector_run_mock):
+        self._mock_run(detector_run_mock, needs_execution=False)
+
+        self.uut.run(self.detector, self.version, self.version_compile)
+
+        assert not self.plan.is_executed("detect", self.version)
+
+    def test_expects_new_compile_timestamp_after_planned_compile(self, detector_run_mock):
+        run = self._mock_run(detector_run_mock, needs_execution=True)
+        self.plan.add("compile", self.version, True, "missing")
+
+        self.uut.run(self.detector, self.version, self.version_compile)
+
+        run.needs_execution.assert_called_with(False, 42)
+
+    @staticmethod
+    def _mock_run(detector_run_mock, needs_execution: bool, runtime: float = 0, result="success"):
+        run = MagicMock(DetectorRun)
+        run.needs_execution.return_value = needs_execution
+        run.is_outdated.return_value = False
+        run.is_failure.return_value = False
+        run.runtime = runtime
+        run.result = result
+        detector_run_mock.return_value = run
+        return run
+
+
+@patch("tasks.implementations.plan.DetectorRun")
+class TestPlanDetectProvidedCorrectUsagesTask:
+    def test_plans_run_on_misuse(self, detector_run_mock):
+        version = create_version("-v-", project=create_project("-p-"))
+        misuse = create_misuse("-m-", version=version)
+        run = MagicMock(DetectorRun)
+        run.needs_execution.return_value = True
+        run.is_outdated.return_value = True
+        run.result = None
+        detector_run_mock.return_value = run
+        plan = RunPlan()
+        uut = PlanDetectProvidedCorrectUsagesTask(DetectProvidedCorrectUsagesTask("-findings-", False, None, 42), plan)
+
+        uut.run(StubDetector(), version, misuse, MagicMock(timestamp=1))
+
+        assert plan.is_executed("detect", misuse)
+        run.needs_execution.assert_called_with(False, 1)
@@ -50,6 +50,14 @@ class TestPublishFindingsTask:
 
         self.uut = PublishFindingsTask(self.experiment_id, "/sources", "http://dummy.url", "-username-", "-password-")
 
+        self.snippets_per_finding = dict()
+        self.get_snippets_batch_patch = patch("tasks.implementations.publish_findings.Finding.get_snippets_batch",
+                                              side_effect=self._get_snippets_batch)
+        self.get_snippets_batch_patch.start()
+
+    def teardown(self):
+        self.get_snippets_batch_patch.stop()
+
     def test_post_url(self, post_mock, _):
         self.uut.run(self.project, self.version, self.test_detector_execution, self.test_potential_hits,
                      self.version_compile, self.detector)
@@ -176,8 +184,7 @@ class TestPublishFindingsTask:
     @patch("tasks.implementations.publish_findings.PublishFindingsTask._convert_graphs_to_files")
     def test_publish_successful_run_code_snippets_extraction_fails(self, convert_mock, post_mock, _):
         self.test_detector_execution.is_success = lambda: True
-        finding = self._create_finding({"rank": "42"}, convert_mock)
-        finding.get_snippets = MagicMock(return_value=[])
+        finding = self._create_finding({"rank": "42"}, convert_mock, snippets=[])
         self.test_potential_hits = PotentialHits([finding])
 
         self.uut.run(self.project, self.version, self.test_detector_execution, self.test_potential_hits,
@@ -326,11 +333,14 @@ class TestPublishFindingsTask:
             file_paths = []
 
         finding = Finding(data)
-        finding.get_snippets = lambda source_paths: \
-            snippets if source_paths == ["/sources/-p-/-v-/build/"] else {}["illegal source paths: %s" % source_paths]
+        self.snippets_per_finding[id(finding)] = snippets
 
         if convert_mock is not None:
             self.created_files_per_finding[str(finding)] = file_paths
             convert_mock.side_effect = lambda f, p: self.created_files_per_finding[str(f)]
 
         return finding
+
+    def _get_snippets_batch(self, findings, source_paths):
+        assert_equals(["/sources/-p-/-v-/build/"], source_paths)
+        return [self.snippets_per_finding.get(id(finding), []) for finding in findings]
@@ -1,6 +1,6 @@
 from unittest.mock import patch
 
-from nose.tools import assert_equals
+from nose.tools import assert_equals, assert_raises
 
 from data.correct_usage import CorrectUsage
 from data.snippets import Snippet
@@ -49,6 +49,15 @@ class TestPublishMetadataTask:
         assert_equals(post_mock.call_args[1]["username"], "-username-")
         assert_equals(post_mock.call_args[1]["password"], "-password-")
 
+    def test_rejects_misuse_of_multiple_versions(self, post_mock, snippets_mock):
+        misuse = create_misuse("-m-", project=self.project, version=self.version)
+        create_version("-v2-", project=self.project, misuses=[misuse],
+                       meta={"build": {"src": "", "classes": ""}})
+
+        task = PublishMetadataTask("-checkouts-path-", "http://test.url")
+
+        assert_raises(UserWarning, task.run, self.project, misuse)
+
     def test_publishes_metadata(self, post_mock, snippets_mock):
         misuse = create_misuse("-m-", meta={
             "description": "-description-",
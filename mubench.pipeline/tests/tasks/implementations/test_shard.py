@@ -0,0 +1,139 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest.mock import MagicMock
+
+from nose.tools import assert_equals, assert_raises
+
+from tasks.implementations.shard import CollectShardsTask, FilterShardVersionsTask, Shard, partition
+from tests.test_utils.data_util import create_project, create_version
+from utils.data_entity_lists import DataEntityLists
+from utils.work_queue import WorkQueue
+
+
+class TestCollectShards:
+    def test_collects_shard(self):
+        uut = CollectShardsTask(2, 3)
+
+        shards = uut.run()
+
+        assert_equals([(2, 3, False)], [(shard.index, shard.count, shard.is_stealing) for shard in shards])
+
+    def test_collects_stealing_shard_with_work_queue(self):
+        uut = CollectShardsTask(2, 3, MagicMock())
+
+        shards = uut.run()
+
+        assert_equals([(2, 3, False), (2, 3, True)], [(shard.index, shard.count, shard.is_stealing) for shard in shards])
+
+
+class TestPartition:
+    def test_balances_runtime(self):
+        versions = [create_version(version_id) for version_id in ["-a-", "-b-", "-c-", "-d-"]]
+        runtime_history = RuntimeHistoryStub({"-project-.-a-": 10, "-project-.-b-": 6, "-project-.-c-": 5,
+                                              "-project-.-d-": 1})
+
+        shards = partition(versions, 2, runtime_history)
+
+        assert_equals([{"-project-.-a-", "-project-.-d-"}, {"-project-.-b-", "-project-.-c-"}], shards)
+
+    def test_expects_median_runtime_without_history(self):
+        versions = [create_version(version_id) for version_id in ["-a-", "-b-", "-c-", "-d-"]]
+        runtime_history = RuntimeHistoryStub({"-project-.-a-": 10, "-project-.-b-": 2, "-project-.-c-": 4})
+
+        shards = partition(versions, 2, runtime_history)
+
+        assert_equals([{"-project-.-a-"}, {"-project-.-b-", "-project-.-c-", "-project-.-d-"}], shards)
+
+    def test_is_deterministic(self):
+        versions = [create_version(version_id) for version_id in ["-a-", "-b-", "-c-"]]
+
+        shards = partition(versions, 2, RuntimeHistoryStub({}))
+        reversed_shards = partition(list(reversed(versions)), 2, RuntimeHistoryStub({}))
+
+        assert_equals(shards, reversed_shards)
+
+
+class TestFilterShardVersions:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.project = create_project("-project-")
+        self.version1 = create_version("-v1-", project=self.project)
+        self.version2 = create_version("-v2-", project=self.project)
+        self.collect_projects = MagicMock()
+        self.collect_projects.run.return_value = [self.project]
+        self.collect_versions = MagicMock()
+        self.collect_versions.run.return_value = [self.version1, self.version2]
+        self.data_entity_lists = DataEntityLists([], [])
+        self.temp_dir = mkdtemp(prefix="mubench-shard-test_")
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_keeps_versions_of_shard(self):
+        uut = FilterShardVersionsTask(self.collect_projects, self.collect_versions, RuntimeHistoryStub({}))
+
+        assert_equals(None, uut.run(Shard(1, 2), self.version1, self.data_entity_lists))
+        assert_equals([], uut.run(Shard(1, 2), self.version2, self.data_entity_lists))
+
+    def test_steals_versions_of_other_shards(self):
+        work_queue = MagicMock()
+        work_queue.share.side_effect = lambda key, value: value
+        work_queue.claim.return_value = True
+        uut = FilterShardVersionsTask(self.collect_projects, self.collect_versions, RuntimeHistoryStub({}), work_queue)
+
+        assert_equals([], uut.run(Shard(1, 2, is_stealing=True), self.version1, self.data_entity_lists))
+        assert_equals(None, uut.run(Shard(1, 2, is_stealing=True), self.version2, self.data_entity_lists))
+
+    def test_skips_versions_claimed_by_other_nodes(self):
+        work_queue = MagicMock()
+        work_queue.share.side_effect = lambda key, value: value
+        work_queue.claim.return_value = False
+        uut = FilterShardVersionsTask(self.collect_projects, self.collect_versions, RuntimeHistoryStub({}), work_queue)
+
+        assert_equals([], uut.run(Shard(1, 2), self.version1, self.data_entity_lists))
+        work_queue.claim.assert_called_once_with(self.version1.id)
+
+
+    def test_uses_partition_of_first_node_from_work_queue(self):
+        queue_path = join(self.temp_dir, "queue.sqlite")
+        first_node = FilterShardVersionsTask(self.collect_projects, self.collect_versions,
+                                             RuntimeHistoryStub({self.version1.id: 1, self.version2.id: 2}),
+                                             WorkQueue(queue_path, "-node1-"))
+        second_node = FilterShardVersionsTask(self.collect_projects, self.collect_versions,
+                                              RuntimeHistoryStub({self.version1.id: 2, self.version2.id: 1}),
+                                              WorkQueue(queue_path, "-node2-"))
+
+        assert_equals([], first_node.run(Shard(1, 2), self.version1, self.data_entity_lists))
+        assert_equals(None, second_node.run(Shard(2, 2), self.version1, self.data_entity_lists))
+
+    def test_uses_partition_of_first_node_from_partition_file(self):
+        partition_path = join(self.temp_dir, "partition.json")
+        first_node = FilterShardVersionsTask(self.collect_projects, self.collect_versions,
+                                             RuntimeHistoryStub({self.version1.id: 1, self.version2.id: 2}),
+                                             partition_file_path=partition_path)
+        second_node = FilterShardVersionsTask(self.collect_projects, self.collect_versions,
+                                              RuntimeHistoryStub({self.version1.id: 2, self.version2.id: 1}),
+                                              partition_file_path=partition_path)
+
+        assert_equals([], first_node.run(Shard(1, 2), self.version1, self.data_entity_lists))
+        assert_equals(None, second_node.run(Shard(2, 2), self.version1, self.data_entity_lists))
+
+    def test_fails_on_shared_partition_of_other_versions(self):
+        partition_path = join(self.temp_dir, "partition.json")
+        FilterShardVersionsTask(self.collect_projects, self.collect_versions, RuntimeHistoryStub({}),
+                                partition_file_path=partition_path).run(Shard(1, 2), self.version1,
+                                                                        self.data_entity_lists)
+        self.collect_versions.run.return_value = [self.version1]
+        uut = FilterShardVersionsTask(self.collect_projects, self.collect_versions, RuntimeHistoryStub({}),
+                                      partition_file_path=partition_path)
+
+        assert_raises(ValueError, uut.run, Shard(1, 2), self.version1, self.data_entity_lists)
+
+
+class RuntimeHistoryStub:
+    def __init__(self, runtimes):
+        self.runtimes = runtimes
+
+    def get_version_runtime(self, version_id):
+        return self.runtimes.get(version_id, None)
@@ -0,0 +1,183 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest.mock import MagicMock
+
+from nose.tools import assert_equals
+
+from tasks.run_journal import RunJournal, get_journal_file_name, get_file_state
+from tasks.task_runner import TaskRunner
+from tests.tasks.test_task_runner import VoidTask, MockTask, AggregatingTask
+from tests.test_utils.data_util import create_project, create_version
+from utils.io import safe_write
+from data.detector import Detector
+from data.project_version import ProjectVersion
+
+
+class TestRunJournal:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-journal-test_")
+        self.journal_path = join(self.temp_dir, "journals", "journal.jsonl")
+        self.project = create_project("-project-")
+        self.version = create_version("-version-", project=self.project)
+        self.tasks = [VoidTask(), VoidTask()]
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_no_key_without_entity(self):
+        uut = RunJournal(self.journal_path)
+
+        assert_equals(None, uut.get_branch_key(self.tasks, 1, ["-string-"]))
+
+    def test_key_identifies_task_and_entity(self):
+        uut = RunJournal(self.journal_path)
+
+        key = uut.get_branch_key(self.tasks, 1, [self.project, self.version])
+
+        assert key.startswith("1:VoidTask:-project-.-version-:")
+
+    def test_key_changes_with_tasks(self):
+        uut = RunJournal(self.journal_path)
+
+        key = uut.get_branch_key(self.tasks, 1, [self.version])
+        other_key = uut.get_branch_key([VoidTask(), VersionConsumingTask()], 1, [self.version])
+
+        assert key.split(":")[-1] != other_key.split(":")[-1]
+
+    def test_key_changes_with_detector_release(self):
+        uut = RunJournal(self.journal_path)
+        detector = MagicMock(spec=Detector, id="-detector-", md5="-md5-", jar_path=join(self.temp_dir, "-d-.jar"))
+
+        key = uut.get_branch_key(self.tasks, 1, [detector, self.version])
+        detector.md5 = "-other-md5-"
+        other_key = uut.get_branch_key(self.tasks, 1, [detector, self.version])
+
+        assert key != other_key
+
+    def test_key_changes_with_task_state(self):
+        uut = RunJournal(self.journal_path)
+        task = StatefulVersionTask()
+
+        key = uut.get_branch_key([VoidTask(), task], 1, [self.version])
+        task.state = 1
+        other_key = uut.get_branch_key([VoidTask(), task], 1, [self.version])
+
+        assert key != other_key
+
+    def test_resumes_recorded_branches(self):
+        RunJournal(self.journal_path).record("-key-")
+
+        uut = RunJournal(self.journal_path, resume=True)
+
+        assert uut.is_completed("-key-")
+
+    def test_starts_new_journal(self):
+        RunJournal(self.journal_path).record("-key-")
+
+        uut = RunJournal(self.journal_path)
+
+        assert not uut.is_completed("-key-")
+
+    def test_ignores_incomplete_record(self):
+        RunJournal(self.journal_path).record("-key-")
+        with open(self.journal_path, 'a') as file:
+            file.write('{"compl')
+
+        uut = RunJournal(self.journal_path, resume=True)
+
+        assert uut.is_completed("-key-")
+
+    def test_journal_file_name_ignores_resume(self):
+        assert_equals(get_journal_file_name(["run", "ex1", "-detector-"]),
+                      get_journal_file_name(["run", "ex1", "-detector-", "--resume"]))
+
+    def test_file_state_changes_with_file(self):
+        file_path = join(self.temp_dir, "-file-")
+        missing_file_state = get_file_state(file_path)
+        safe_write("-content-", file_path, append=False)
+        file_state = get_file_state(file_path)
+        safe_write("-other-content-", file_path, append=False)
+
+        assert_equals(3, len({missing_file_state, file_state, get_file_state(file_path)}))
+
+
+class TestTaskRunnerWithJournal:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-journal-test_")
+        self.journal_path = join(self.temp_dir, "journal.jsonl")
+        project = create_project("-project-")
+        self.version1 = create_version("-v1-", project=project)
+        self.version2 = create_version("-v2-", project=project)
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_skips_completed_branches(self):
+        TaskRunner([VoidTask([self.version1, self.version2]), VersionConsumingTask()],
+                   journal=RunJournal(self.journal_path)).run()
+        version_task = VersionConsumingTask()
+
+        TaskRunner([VoidTask([self.version1, self.version2]), version_task],
+                   journal=RunJournal(self.journal_path, resume=True)).run()
+
+        version_task.assert_not_called()
+
+    def test_reruns_failed_branches(self):
+        TaskRunner([VoidTask([self.version1, self.version2]), VersionConsumingTask(failing_version=self.version1)],
+                   journal=RunJournal(self.journal_path)).run()
+        version_task = VersionConsumingTask()
+
+        TaskRunner([VoidTask([self.version1, self.version2]), version_task],
+                   journal=RunJournal(self.journal_path, resume=True)).run()
+
+        assert_equals([(self.version1,)], version_task.calls)
+
+    def test_does_not_skip_branches_of_aggregating_tasks(self):
+        TaskRunner([VoidTask([self.version1]), VersionAggregatingTask()], journal=RunJournal(self.journal_path)).run()
+        aggregating_task = VersionAggregatingTask()
+
+        TaskRunner([VoidTask([self.version1]), aggregating_task],
+                   journal=RunJournal(self.journal_path, resume=True)).run()
+
+        aggregating_task.assert_called_once_with(self.version1)
+
+    def test_skips_branches_whose_state_changed_by_completing(self):
+        state_task = StatefulVersionTask()
+        TaskRunner([VoidTask([self.version1]), state_task], journal=RunJournal(self.journal_path)).run()
+
+        TaskRunner([VoidTask([self.version1]), state_task], journal=RunJournal(self.journal_path, resume=True)).run()
+
+        assert_equals([(self.version1,)], state_task.calls)
+
+
+class VersionConsumingTask(MockTask):
+    def __init__(self, failing_version: ProjectVersion = None):
+        super().__init__()
+        self.failing_version = failing_version
+
+    def run(self, version: ProjectVersion):
+        self.calls.append((version,))
+        if version is self.failing_version:
+            raise ValueError()
+        return self.results
+
+
+class VersionAggregatingTask(VersionConsumingTask):
+    def end(self):
+        pass
+
+
+class StatefulVersionTask(VersionConsumingTask):
+    def __init__(self):
+        super().__init__()
+        self.state = 0
+
+    def run(self, version: ProjectVersion):
+        self.state += 1
+        return super().run(version)
+
+    def get_journal_state(self, entity):
+        return self.state if isinstance(entity, ProjectVersion) else None
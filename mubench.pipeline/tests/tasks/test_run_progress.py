@@ -0,0 +1,237 @@
+import json
+import logging
+import time
+from io import StringIO
+from os import remove
+from os.path import join, exists
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from nose.tools import assert_equals
+
+from tasks.run_progress import RunProgress, ProgressRecorder, _StatusLine
+from tasks.staged_task_runner import StagedTaskRunner, Stage
+from tasks.task_runner import TaskRunner
+from tests.tasks.test_task_runner import VoidTask, StringConsumingTask, AggregatingTask, GeneratingTask, \
+    FailingStringConsumingTask
+
+
+class TestRunProgress:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-progress-test_")
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_counts_completed_runs(self):
+        uut = RunProgress([TaskDummy(), TaskDummy()])
+
+        uut.record(0, 2)
+        uut.record(1, 1)
+
+        assert_equals([1, 1], uut.runs)
+
+    def test_extrapolates_expected_runs_from_results_so_far(self):
+        uut = RunProgress([TaskDummy(), TaskDummy(), TaskDummy()])
+
+        uut.record(0, 4)
+        uut.record(1, 3)
+
+        assert_equals([1, 4, 12], uut.get_expected_runs())
+
+    def test_expected_runs_are_unknown_before_previous_task_ran(self):
+        uut = RunProgress([TaskDummy(), TaskDummy(), TaskDummy()])
+
+        uut.record(0, 4)
+
+        assert_equals([1, 4, None], uut.get_expected_runs())
+
+    def test_counts_skipped_runs(self):
+        uut = RunProgress([TaskDummy(), TaskDummy()])
+
+        uut.record(0, 2)
+        uut.record(1, 0, is_skipped=True)
+
+        assert_equals([0, 1], uut.skips)
+
+    def test_estimates_remaining_time_from_expected_runtime(self):
+        uut = RunProgress([TaskDummy(), TaskDummy()], expected_runtime=60, parallelism=2)
+
+        uut.record(0, 10)
+
+        assert 299 < uut.get_remaining_time() <= 301
+
+    def test_estimates_remaining_time_from_completed_runs(self):
+        uut = RunProgress([TaskDummy(), TaskDummy()])
+        uut.start_time -= 100
+
+        uut.record(0, 4)
+        uut.record(1, 1)
+
+        assert 299 < uut.get_remaining_time() < 301
+
+    def test_no_remaining_time_without_estimate(self):
+        uut = RunProgress([TaskDummy(), TaskDummy()])
+
+        uut.record(0, 4)
+
+        assert_equals(None, uut.get_remaining_time())
+
+    def test_adds_recorded_events(self):
+        recorder = ProgressRecorder()
+        recorder.record(0, 3)
+        uut = RunProgress([TaskDummy(), TaskDummy()])
+
+        uut.add_events(recorder.pop_events())
+
+        assert_equals([1, 3], uut.get_expected_runs())
+        assert_equals([], recorder.events)
+
+    def test_writes_status_file(self):
+        status_file_path = join(self.temp_dir, "status.json")
+        uut = RunProgress([TaskDummy(), TaskDummy()], status_file_path=status_file_path, interval=0)
+
+        uut.record(0, 2)
+
+        with open(status_file_path) as status_file:
+            status = json.load(status_file)
+        assert_equals([{"task": "TaskDummy", "completed": 1, "skipped": 0, "expected": 1},
+                       {"task": "TaskDummy", "completed": 0, "skipped": 0, "expected": 2}], status["stages"])
+        assert not exists(status_file_path + ".tmp")
+
+    def test_updates_status_file_periodically(self):
+        status_file_path = join(self.temp_dir, "status.json")
+        uut = RunProgress([TaskDummy()], status_file_path=status_file_path, interval=0.01)
+
+        try:
+            for _ in range(500):
+                if exists(status_file_path):
+                    break
+                time.sleep(0.01)
+            assert exists(status_file_path)
+        finally:
+            uut.end()
+
+    def test_stops_periodic_updates_on_end(self):
+        status_file_path = join(self.temp_dir, "status.json")
+        uut = RunProgress([TaskDummy()], status_file_path=status_file_path, interval=0.01)
+
+        uut.end()
+        remove(status_file_path)
+        time.sleep(0.05)
+
+        assert not exists(status_file_path)
+
+    def test_status_line(self):
+        uut = RunProgress([TaskDummy(), VoidTask()])
+
+        uut.record(0, 2)
+
+        assert uut.get_status_line().startswith("Void 0/2 | ")
+
+
+class TestStatusLine:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.stream = StringIO()
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setLevel(logging.INFO)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        self.root_logger = logging.getLogger()
+        self.root_logger.addHandler(self.handler)
+        self.root_level = self.root_logger.level
+        self.root_logger.setLevel(logging.DEBUG)
+        self.logger = logging.getLogger("test.status_line")
+
+    def teardown(self):
+        self.root_logger.removeHandler(self.handler)
+        self.root_logger.setLevel(self.root_level)
+
+    def test_shows_status(self):
+        uut = _StatusLine(self.stream)
+
+        uut.show("-status-")
+        uut.end()
+
+        assert_equals("\r\x1b[K-status-\r\n", self.stream.getvalue())
+
+    def test_redraws_status_after_log_record(self):
+        uut = _StatusLine(self.stream)
+        uut.show("-status-")
+
+        self.logger.info("-record-")
+        uut.end()
+
+        assert_equals("\r\x1b[K-status-\r\r\x1b[K-record-\n-status-\r\n", self.stream.getvalue())
+
+    def test_ignores_records_the_handler_does_not_log(self):
+        uut = _StatusLine(self.stream)
+        uut.show("-status-")
+
+        self.logger.debug("-record-")
+        uut.end()
+
+        assert_equals("\r\x1b[K-status-\r\n", self.stream.getvalue())
+
+    def test_restores_handler(self):
+        uut = _StatusLine(self.stream)
+        uut.end()
+
+        self.logger.info("-record-")
+
+        assert self.handler in self.root_logger.handlers
+        assert uut not in self.root_logger.handlers
+        assert_equals("\n-record-\n", self.stream.getvalue())
+
+
+class TestTaskRunnerWithProgress:
+    def test_records_task_runs(self):
+        progress = RunProgress([TaskDummy(), TaskDummy()])
+        uut = TaskRunner([VoidTask([":a:", ":b:"]), StringConsumingTask([1])], progress=progress)
+
+        uut.run()
+
+        assert_equals([1, 2], progress.runs)
+        assert_equals([2, 2], progress.results)
+
+    def test_records_failed_task_runs(self):
+        progress = RunProgress([TaskDummy(), TaskDummy()])
+        uut = TaskRunner([VoidTask([":a:", ":b:"]), FailingStringConsumingTask()], progress=progress)
+
+        uut.run()
+
+        assert_equals([1, 2], progress.runs)
+        assert_equals([2, 0], progress.results)
+
+    def test_counts_generated_results(self):
+        progress = RunProgress([TaskDummy(), TaskDummy()])
+        uut = TaskRunner([GeneratingTask([], [":a:", ":b:", ":c:"]), StringConsumingTask([1])], progress=progress)
+
+        uut.run()
+
+        assert_equals([3, 3], progress.results)
+
+    def test_records_task_runs_of_parallel_branches(self):
+        progress = RunProgress([TaskDummy(), TaskDummy(), TaskDummy()])
+        uut = TaskRunner([VoidTask([":a:", ":b:"]), StringConsumingTask([1]), AggregatingTask()], jobs=2,
+                         progress=progress)
+
+        uut.run()
+
+        assert_equals([1, 2, 2], progress.runs)
+
+
+    def test_records_task_runs_of_stages(self):
+        progress = RunProgress([TaskDummy(), TaskDummy()])
+        uut = StagedTaskRunner([VoidTask([":a:", ":b:"]), StringConsumingTask([1])],
+                               [Stage("second", (StringConsumingTask,), 2)], progress=progress)
+
+        uut.run()
+
+        assert_equals([1, 2], progress.runs)
+
+
+class TaskDummy:
+    def run(self):
+        pass
@@ -0,0 +1,143 @@
+from threading import Event, Barrier, BrokenBarrierError
+
+from nose.tools import assert_equals, assert_raises, assert_true
+
+from tasks.staged_task_runner import StagedTaskRunner, Stage
+from tasks.task_runner import TaskParameterUnavailableWarning
+from tests.tasks.test_task_runner import VoidTask, StringConsumingTask, StringAndIntConsumingTask, AggregatingTask, \
+    MockTask, FailingStringConsumingTask
+
+
+class TestStagedTaskRunner:
+    def test_runs_tasks_in_stages(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        second_task = StringConsumingTask([42])
+        third_task = StringAndIntConsumingTask()
+        uut = StagedTaskRunner([first_task, second_task, third_task], [
+            Stage("second", (StringConsumingTask,)),
+            Stage("third", (StringAndIntConsumingTask,))
+        ])
+
+        uut.run()
+
+        third_task.assert_has_calls([(":some string:", 42), (":other string:", 42)])
+
+    def test_overlaps_stages(self):
+        first_result_processed = Event()
+        first_task = VoidTask([":some string:", ":other string:"])
+        second_task = BlockingStringConsumingTask(":other string:", first_result_processed, [42])
+        third_task = SignalingStringAndIntConsumingTask(first_result_processed)
+        uut = StagedTaskRunner([first_task, second_task, third_task], [
+            Stage("second", (BlockingStringConsumingTask,)),
+            Stage("third", (SignalingStringAndIntConsumingTask,))
+        ])
+
+        uut.run()
+
+        assert_true(second_task.was_unblocked)
+        third_task.assert_has_calls([(":some string:", 42), (":other string:", 42)])
+
+    def test_runs_stage_concurrently(self):
+        both_results_started = Barrier(2, timeout=5)
+        first_task = VoidTask([":some string:", ":other string:"])
+        second_task = SynchronizingStringConsumingTask(both_results_started)
+        uut = StagedTaskRunner([first_task, second_task], [Stage("second", (SynchronizingStringConsumingTask,), 2)])
+
+        uut.run()
+
+        assert_true(second_task.was_synchronized)
+
+    def test_passes_initial_parameter_values(self):
+        task = StringConsumingTask()
+        uut = StagedTaskRunner([task], [Stage("first", (StringConsumingTask,))])
+
+        uut.run("-string-")
+
+        task.assert_called_once_with("-string-")
+
+    def test_calls_end_once_after_all_branches(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        aggregating_task = AggregatingTask()
+        uut = StagedTaskRunner([first_task, StringConsumingTask([42]), aggregating_task],
+                               [Stage("second", (StringConsumingTask,), 2)])
+
+        uut.run()
+
+        assert_equals([2], aggregating_task.ends)
+
+    def test_runs_aggregating_tasks_in_a_single_stage(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        aggregating_task = AggregatingTask()
+        uut = StagedTaskRunner([first_task, StringConsumingTask([42]), aggregating_task],
+                               [Stage("aggregate", (AggregatingTask,), 2)])
+
+        uut.run()
+
+        aggregating_task.assert_has_calls([(":some string:", 42), (":other string:", 42)])
+
+    def test_ignores_stages_without_tasks(self):
+        task = StringConsumingTask()
+        uut = StagedTaskRunner([task], [Stage("unknown", (AggregatingTask,))])
+
+        uut.run("-string-")
+
+        task.assert_called_once_with("-string-")
+
+    def test_continues_with_next_input_if_task_fails(self):
+        first_task = VoidTask(["-some string-", "-some other string-"])
+        second_task = FailingStringConsumingTask("-error-")
+        uut = StagedTaskRunner([first_task, second_task], [Stage("second", (FailingStringConsumingTask,))])
+
+        uut.run()
+
+        second_task.assert_has_calls([("-some string-",), ("-some other string-",)])
+
+    def test_reports_if_a_task_requires_an_unavailable_parameter(self):
+        uut = StagedTaskRunner([VoidTask([42, 43]), StringConsumingTask()], [Stage("second", (StringConsumingTask,))])
+
+        assert_raises(TaskParameterUnavailableWarning, uut.run)
+
+    def test_handles_empty_tasks(self):
+        uut = StagedTaskRunner([], [])
+        uut.run()
+
+
+class BlockingStringConsumingTask(MockTask):
+    def __init__(self, blocking_s: str, event: Event, results=None):
+        super().__init__(results)
+        self.blocking_s = blocking_s
+        self.event = event
+        self.was_unblocked = False
+
+    def run(self, s: str):
+        self.calls.append((s,))
+        if s == self.blocking_s:
+            # blocks unless the downstream stage processes the previous result meanwhile
+            self.was_unblocked = self.event.wait(5)
+        return self.results
+
+
+class SignalingStringAndIntConsumingTask(MockTask):
+    def __init__(self, event: Event):
+        super().__init__()
+        self.event = event
+
+    def run(self, s: str, i: int):
+        self.calls.append((s, i))
+        self.event.set()
+        return self.results
+
+
+class SynchronizingStringConsumingTask(MockTask):
+    def __init__(self, barrier: Barrier):
+        super().__init__()
+        self.barrier = barrier
+        self.was_synchronized = True
+
+    def run(self, s: str):
+        self.calls.append((s,))
+        try:
+            self.barrier.wait()
+        except BrokenBarrierError:
+            self.was_synchronized = False
+        return self.results
@@ -0,0 +1,115 @@
+import json
+from os.path import join, exists
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Thread
+
+from nose.tools import assert_equals
+
+from tasks.task_profiler import TaskProfiler, TaskMeasurement
+from tests.test_utils.data_util import create_project, create_version, create_misuse
+from utils.shell import Shell
+
+
+class TestTaskProfiler:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-profile-test_")
+        self.uut = TaskProfiler(join(self.temp_dir, "profile"))
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_measures_task(self):
+        with self.uut.measure(TaskDummy(), []):
+            pass
+
+        measurement = self.uut.measurements[0]
+        assert_equals("TaskDummy", measurement.task)
+        assert measurement.wall_time >= 0
+        assert measurement.cpu_time >= 0
+        assert_equals(0, measurement.peak_rss)
+        assert measurement.process_peak_rss > 0
+
+    def test_measures_child_processes_of_task(self):
+        with self.uut.measure(TaskDummy(), []):
+            Shell.exec("echo test")
+
+        assert self.uut.measurements[0].peak_rss > 0
+
+    def test_excludes_child_processes_of_other_threads(self):
+        thread = Thread(target=Shell.exec, args=("echo test",))
+
+        with self.uut.measure(TaskDummy(), []):
+            thread.start()
+            thread.join()
+
+        assert_equals(0, self.uut.measurements[0].peak_rss)
+
+    def test_measures_failing_task(self):
+        try:
+            with self.uut.measure(TaskDummy(), []):
+                raise ValueError()
+        except ValueError:
+            pass
+
+        assert_equals(1, len(self.uut.measurements))
+
+    def test_keys_by_most_specific_entity(self):
+        project = create_project("-p-")
+        version = create_version("-v-", project=project)
+        misuse = create_misuse("-m-", project=project, version=version)
+
+        with self.uut.measure(TaskDummy(), [project, version, misuse, "-other-"]):
+            pass
+
+        assert_equals(misuse.id, self.uut.measurements[0].entity)
+
+    def test_entity_is_none_without_entity(self):
+        with self.uut.measure(TaskDummy(), ["-other-"]):
+            pass
+
+        assert_equals(None, self.uut.measurements[0].entity)
+
+    def test_sums_wall_time_by_entity(self):
+        self.uut.add_measurements([TaskMeasurement("A", "-e1-", 1, 0, 0, 0), TaskMeasurement("B", "-e2-", 2, 0, 0, 0),
+                                   TaskMeasurement("B", "-e1-", 3, 0, 0, 0)])
+
+        assert_equals([("-e1-", 4), ("-e2-", 2)], list(self.uut.get_wall_time_by_entity().items()))
+
+    def test_sums_wall_time_by_task(self):
+        self.uut.add_measurements([TaskMeasurement("A", "-e1-", 1, 0, 0, 0), TaskMeasurement("B", "-e2-", 2, 0, 0, 0),
+                                   TaskMeasurement("B", "-e1-", 3, 0, 0, 0)])
+
+        assert_equals([("B", 5), ("A", 1)], list(self.uut.get_wall_time_by_task().items()))
+
+    def test_pops_measurements(self):
+        measurement = TaskMeasurement("A", "-e-", 1, 0, 0, 0)
+        self.uut.add_measurements([measurement])
+
+        assert_equals([measurement], self.uut.pop_measurements())
+        assert_equals([], self.uut.measurements)
+
+    def test_writes_reports(self):
+        self.uut.add_measurements([TaskMeasurement("A", "-e-", 1.5, 0.5, 42, 84)])
+
+        self.uut.end()
+
+        with open(join(self.temp_dir, "profile.json")) as file:
+            assert_equals({"measurements": [{"task": "A", "entity": "-e-", "wall_time": 1.5, "cpu_time": 0.5,
+                                             "peak_rss": 42, "process_peak_rss": 84}]}, json.load(file))
+        with open(join(self.temp_dir, "profile.csv")) as file:
+            assert_equals(["task,entity,wall_time,cpu_time,peak_rss,process_peak_rss", "A,-e-,1.5,0.5,42,84"],
+                          file.read().splitlines())
+
+    def test_skips_reports_without_path(self):
+        uut = TaskProfiler()
+
+        uut.end()
+
+        assert not exists(join(self.temp_dir, "profile.json"))
+
+
+class TaskDummy:
+    def run(self):
+        pass
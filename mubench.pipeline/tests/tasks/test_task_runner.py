@@ -1,10 +1,13 @@
-from typing import List, Tuple, Any
+import logging
+from inspect import Signature
+from typing import List, Tuple, Any, Optional, Union, Iterable
 from unittest.mock import MagicMock
 
 from nose.tools import assert_in, assert_raises, assert_equals
 
+from tasks.task_profiler import TaskProfiler
 from tasks.task_runner import TaskRunner, TaskParameterUnavailableWarning, TaskParameterDuplicateTypeWarning, \
-    TaskRequestsDuplicateTypeWarning, Continue
+    TaskRequestsDuplicateTypeWarning, Continue, _get_result_type, _UNDECLARED, _NO_RESULTS
 
 
 class TestTaskRunner:
@@ -105,6 +108,53 @@ class TestTaskRunner:
         actual_message = str(context.exception)
         assert_equals("Task DuplicateIntRequestingTask requests multiple parameters of type int", actual_message)
 
+    def test_reports_duplicate_type_requests_before_running_tasks(self):
+        first_task = VoidTask([42])
+        uut = TaskRunner([first_task, DuplicateIntRequestingTask()])
+
+        assert_raises(TaskRequestsDuplicateTypeWarning, uut.run)
+
+        first_task.assert_not_called()
+
+    def test_runs_long_task_chains(self):
+        tasks = [VoidTask([":some string:"])] + [NoneReturningTask() for _ in range(2000)] + [StringConsumingTask()]
+        uut = TaskRunner(tasks)
+
+        uut.run()
+
+        tasks[-1].assert_called_once_with(":some string:")
+
+    def test_runs_results_in_order(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        second_task = StringConsumingTask([1, 2])
+        third_task = StringAndIntConsumingTask()
+        uut = TaskRunner([first_task, second_task, third_task])
+
+        uut.run()
+
+        assert_equals([(":some string:", 1), (":some string:", 2), (":other string:", 1), (":other string:", 2)],
+                      third_task.calls)
+
+    def test_runs_next_task_on_generated_results_lazily(self):
+        calls = []
+        first_task = GeneratingTask(calls, [":some string:", ":other string:"])
+        second_task = RecordingStringConsumingTask(calls)
+        uut = TaskRunner([first_task, second_task])
+
+        uut.run()
+
+        assert_equals(["generate :some string:", "consume :some string:", "generate :other string:",
+                       "consume :other string:"], calls)
+
+    def test_resolves_parameters_of_different_result_types(self):
+        first_task = VoidTask([":some string:", 42])
+        second_task = ObjectConsumingTask()
+        uut = TaskRunner([first_task, second_task])
+
+        uut.run()
+
+        second_task.assert_has_calls([(":some string:",), (42,)])
+
     def test_continues_with_next_input_if_task_fails(self):
         first_task = VoidTask(results=["-some string-", "-some other string-"])
         second_task = FailingStringConsumingTask("-error-")
@@ -186,6 +236,167 @@ class TestTaskRunner:
         uut = TaskRunner([])
         uut.run()
 
+    def test_passes_results_by_declared_types(self):
+        first_task = StringDeclaringTask([":some string:"])
+        second_task = NoneDeclaringTask()
+        third_task = StringAndIntConsumingTask()
+        uut = TaskRunner([first_task, second_task, third_task])
+
+        uut.run(42)
+
+        third_task.assert_called_once_with(":some string:", 42)
+
+    def test_reports_unavailable_declared_parameter_before_running_tasks(self):
+        first_task = StringDeclaringTask([":some string:"])
+        uut = TaskRunner([first_task, StringAndIntConsumingTask()])
+
+        with assert_raises(TaskParameterUnavailableWarning) as context:
+            uut.run()
+
+        assert_equals("Missing parameter i for task StringAndIntConsumingTask", str(context.exception))
+        first_task.assert_not_called()
+
+    def test_reports_duplicate_declared_type_request_when_planning(self):
+        assert_raises(TaskRequestsDuplicateTypeWarning, TaskRunner,
+                      [StringDeclaringTask(), StringAndObjectConsumingTask()])
+
+    def test_passes_results_if_task_returns_other_results_than_declared(self):
+        first_task = StringDeclaringTask([":some string:"])
+        second_task = NoneDeclaringTask(42)
+        third_task = StringConsumingTask()
+        uut = TaskRunner([first_task, second_task, third_task])
+
+        uut.run()
+
+        third_task.assert_called_once_with(":some string:")
+
+    def test_passes_results_after_task_without_declared_type(self):
+        first_task = StringDeclaringTask([":some string:"])
+        second_task = OptionalIntDeclaringTask(42)
+        third_task = IntAndStringConsumingTask()
+        uut = TaskRunner([first_task, second_task, third_task])
+
+        uut.run()
+
+        third_task.assert_called_once_with(42, ":some string:")
+
+    def test_profiles_each_task_run(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        profiler = TaskProfiler()
+        uut = TaskRunner([first_task, StringConsumingTask()], profiler=profiler)
+
+        uut.run()
+
+        assert_equals(["StringConsumingTask", "StringConsumingTask", "VoidTask"],
+                      sorted(measurement.task for measurement in profiler.measurements))
+
+
+class TestDeclaredResultType:
+    def test_single_result(self):
+        assert_equals(str, _get_result_type(str))
+
+    def test_list_of_results(self):
+        assert_equals(str, _get_result_type(List[str]))
+        assert_equals(str, _get_result_type(Iterable[str]))
+
+    def test_no_result(self):
+        assert_equals(None, _get_result_type(None))
+
+    def test_only_empty_lists(self):
+        assert _get_result_type(List) is _NO_RESULTS
+        assert_equals(None, _get_result_type(Optional[List]))
+
+    def test_single_result_or_empty_list(self):
+        assert_equals(str, _get_result_type(Union[str, List]))
+
+    def test_undeclared(self):
+        assert _get_result_type(Optional[str]) is _UNDECLARED
+        assert _get_result_type(Union[str, int]) is _UNDECLARED
+        assert _get_result_type(list) is _UNDECLARED
+        assert _get_result_type(Signature.empty) is _UNDECLARED
+
+
+class TestParallelTaskRunner:
+    def test_runs_branches_in_parallel(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        second_task = StringConsumingTask([42])
+        aggregating_task = AggregatingTask()
+        uut = TaskRunner([first_task, second_task, aggregating_task], jobs=2)
+
+        uut.run()
+
+        aggregating_task.assert_has_calls([(":some string:", 42), (":other string:", 42)])
+
+    def test_runs_branches_of_nested_results_in_parallel(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        second_task = StringConsumingTask([1, 2])
+        aggregating_task = AggregatingTask()
+        uut = TaskRunner([first_task, second_task, aggregating_task], jobs=2)
+
+        uut.run()
+
+        aggregating_task.assert_has_calls([(":some string:", 1), (":some string:", 2),
+                                           (":other string:", 1), (":other string:", 2)])
+
+    def test_calls_end_once_after_all_branches(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        aggregating_task = AggregatingTask()
+        uut = TaskRunner([first_task, StringConsumingTask([42]), aggregating_task], jobs=2)
+
+        uut.run()
+
+        assert_equals([2], aggregating_task.ends)
+
+    def test_passes_initial_parameter_values(self):
+        aggregating_task = AggregatingTask()
+        uut = TaskRunner([StringConsumingTask([42]), aggregating_task], jobs=2)
+
+        uut.run("-string-")
+
+        aggregating_task.assert_called_once_with("-string-", 42)
+
+    def test_reports_if_a_task_requires_an_unavailable_parameter(self):
+        uut = TaskRunner([VoidTask([42, 43]), StringConsumingTask(), AggregatingTask()], jobs=2)
+
+        with assert_raises(TaskParameterUnavailableWarning) as context:
+            uut.run()
+
+        assert_equals("Missing parameter s for task StringConsumingTask", str(context.exception))
+
+    def test_collects_profile_of_branches(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        profiler = TaskProfiler()
+        uut = TaskRunner([first_task, StringConsumingTask([42]), AggregatingTask()], jobs=2, profiler=profiler)
+
+        uut.run()
+
+        assert_equals(["AggregatingTask", "AggregatingTask", "StringConsumingTask", "StringConsumingTask", "VoidTask"],
+                      sorted(measurement.task for measurement in profiler.measurements))
+
+    def test_replays_log_of_branches(self):
+        first_task = VoidTask([":some string:", ":other string:"])
+        uut = TaskRunner([first_task, LoggingStringConsumingTask([42]), AggregatingTask()], jobs=2)
+
+        logging.getLogger("test.logging_task").setLevel(logging.INFO)
+        handler = RecordingLogHandler()
+        logging.getLogger().addHandler(handler)
+        try:
+            uut.run()
+        finally:
+            logging.getLogger().removeHandler(handler)
+
+        actual_messages = sorted(record.getMessage() for record in handler.records if record.name == "test.logging_task")
+        assert_equals(["-:other string:-", "-:some string:-"], actual_messages)
+
+
+class RecordingLogHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
 
 class MockTask:
     def __init__(self, results: List = None):
@@ -227,6 +438,36 @@ class IntAndStringConsumingTask(MockTask):
         return self.results
 
 
+class StringAndObjectConsumingTask(MockTask):
+    def run(self, s: str, o: object):
+        self.calls.append((s, o))
+        return self.results
+
+
+class StringDeclaringTask(MockTask):
+    def run(self) -> List[str]:
+        self.calls.append(())
+        return self.results
+
+
+class NoneDeclaringTask(MockTask):
+    def __init__(self, result=None):
+        super().__init__()
+        self.result = result
+
+    def run(self) -> None:
+        return self.result
+
+
+class OptionalIntDeclaringTask(MockTask):
+    def __init__(self, result: Optional[int]):
+        super().__init__()
+        self.result = result
+
+    def run(self) -> Optional[int]:
+        return self.result
+
+
 class ListConsumingTask(MockTask):
     def run(self, l: List):
         self.calls.append((l,))
@@ -273,6 +514,51 @@ class NoneReturningTask(MockTask):
         return None
 
 
+class AggregatingTask(MockTask):
+    def __init__(self):
+        super().__init__()
+        self.ends = []
+
+    def run(self, s: str, i: int):
+        self.calls.append((s, i))
+        return self.results
+
+    def end(self):
+        self.ends.append(len(self.calls))
+
+
+class LoggingStringConsumingTask(MockTask):
+    def run(self, s: str):
+        logging.getLogger("test.logging_task").info("-%s-", s)
+        return self.results
+
+
+class ObjectConsumingTask(MockTask):
+    def run(self, o: object):
+        self.calls.append((o,))
+        return self.results
+
+
+class GeneratingTask(MockTask):
+    def __init__(self, calls: List, results: List):
+        super().__init__(results)
+        self.calls = calls
+
+    def run(self):
+        for result in self.results:
+            self.calls.append("generate {}".format(result))
+            yield result
+
+
+class RecordingStringConsumingTask(MockTask):
+    def __init__(self, calls: List):
+        super().__init__()
+        self.calls = calls
+
+    def run(self, s: str):
+        self.calls.append("consume {}".format(s))
+
+
 class AsteriskTask(MockTask):
     def run(self, *args: Tuple[Any]):
         self.calls.append(args)
@@ -182,6 +182,98 @@ def test_fails_on_negative_limit():
     assert_raises(SystemExit, parser.parse_args, ['publish', 'ex2', 'DemoDetector', '-s', 'site', '--limit', '-1'])
 
 
+def test_jobs_defaults_to_one():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert_equals(1, parser.parse_args(['run', 'ex2', 'valid-detector']).jobs)
+
+
+def test_jobs():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert_equals(4, parser.parse_args(['run', 'ex2', 'valid-detector', '--jobs', '4']).jobs)
+
+
+def test_fails_on_zero_jobs():
+    parser = _get_command_line_parser([], [], [])
+    assert_raises(SystemExit, parser.parse_args, ['checkout', '--jobs', '0'])
+
+
+def test_memory_budget_defaults_to_none():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert_equals(None, parser.parse_args(['run', 'ex2', 'valid-detector']).memory_budget)
+
+
+def test_memory_budget():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    result = parser.parse_args(['run', 'ex2', 'valid-detector', '--memory-budget', '16G'])
+    assert_equals(16 * 1024 ** 3, result.memory_budget)
+
+
+def test_fails_on_invalid_memory_budget():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert_raises(SystemExit, parser.parse_args, ['run', 'ex2', 'valid-detector', '--memory-budget', 'lots'])
+
+
+def test_profile_defaults_to_none():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert_equals(None, parser.parse_args(['run', 'ex2', 'valid-detector']).profile)
+
+
+def test_profile_lists_ten_slowest_by_default():
+    parser = _get_command_line_parser([], [], [])
+    assert_equals(10, parser.parse_args(['checkout', '--profile']).profile)
+
+
+def test_profile():
+    parser = _get_command_line_parser([], [], [])
+    assert_equals(3, parser.parse_args(['checkout', '--profile', '3']).profile)
+
+
+def test_resume_defaults_to_false():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert not parser.parse_args(['run', 'ex2', 'valid-detector']).resume
+
+
+def test_resume():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert parser.parse_args(['run', 'ex2', 'valid-detector', '--resume']).resume
+
+
+def test_shard_defaults_to_none():
+    parser = _get_command_line_parser([], [], [])
+    assert_equals(None, parser.parse_args(['checkout']).shard)
+
+
+def test_shard():
+    parser = _get_command_line_parser([], [], [])
+    assert_equals((2, 3), parser.parse_args(['checkout', '--shard', '2/3']).shard)
+
+
+def test_fails_on_shard_out_of_range():
+    parser = _get_command_line_parser([], [], [])
+    assert_raises(SystemExit, parser.parse_args, ['checkout', '--shard', '4/3'])
+
+
+def test_fails_on_invalid_shard():
+    parser = _get_command_line_parser([], [], [])
+    assert_raises(SystemExit, parser.parse_args, ['checkout', '--shard', '2'])
+
+
+def test_pipeline_defaults_to_none():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert_equals(None, parser.parse_args(['run', 'ex2', 'valid-detector']).pipeline)
+
+
+def test_pipeline():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    result = parser.parse_args(['run', 'ex2', 'valid-detector', '--pipeline', 'compile=2', 'detect'])
+    assert_equals([('compile', 2), ('detect', 1)], result.pipeline)
+
+
+def test_fails_on_zero_stage_concurrency():
+    parser = _get_command_line_parser([], [], [])
+    assert_raises(SystemExit, parser.parse_args, ['checkout', '--pipeline', 'checkout=0'])
+
+
 def test_requires_review_site_username():
     parser = _get_command_line_parser(['DemoDetector'], [], [])
     assert_raises(SystemExit, parser.parse_args, ['publish', 'ex2', 'DemoDetector', '-s'])
@@ -203,3 +295,66 @@ def test_overrides_default_values(get_default_mock):
     result = parser.parse_args(['run', 'ex1', 'valid-detector', '--java-options',
                                 'agentlib:jdwp=transport=dt_socket,server=y,suspend=y,address=5005'])
     assert_equals(['agentlib:jdwp=transport=dt_socket,server=y,suspend=y,address=5005'], result.java_options)
+
+
+def test_plan_defaults_to_false():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert not parser.parse_args(['run', 'ex2', 'valid-detector']).plan
+
+
+def test_plan():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert parser.parse_args(['run', 'ex1', 'valid-detector', '--plan']).plan
+
+
+def test_longest_first_defaults_to_false():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert not parser.parse_args(['run', 'ex2', 'valid-detector']).longest_first
+
+
+def test_longest_first():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert parser.parse_args(['run', 'ex2', 'valid-detector', '--longest-first']).longest_first
+
+
+def test_progress_defaults_to_off():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    config = parser.parse_args(['run', 'ex2', 'valid-detector'])
+    assert not config.progress
+    assert_equals(None, config.status_file)
+
+
+def test_status_file():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert_equals("status.json", parser.parse_args(['checkout', '--status-file', 'status.json']).status_file)
+
+
+def test_where():
+    parser = _get_command_line_parser([], [], [])
+    assert_equals("crash and api=java.util.Iterator",
+                  str(parser.parse_args(['info', '--where', 'crash and api=java.util.Iterator']).where))
+
+
+def test_fails_on_invalid_where():
+    parser = _get_command_line_parser([], [], [])
+    assert_raises(SystemExit, parser.parse_args, ['info', '--where', 'crash and'])
+
+
+def test_snippet_cache_defaults_to_enabled():
+    parser = _get_command_line_parser(['valid-detector'], [], [])
+    assert not parser.parse_args(['publish', 'ex1', 'valid-detector', '-s', 'site', '-u', 'user']).no_snippet_cache
+
+
+def test_no_snippet_cache():
+    parser = _get_command_line_parser([], [], [])
+    assert parser.parse_args(['check', 'dataset', '--no-snippet-cache']).no_snippet_cache
+
+
+def test_java_method_index_defaults_to_disabled():
+    parser = _get_command_line_parser([], [], [])
+    assert not parser.parse_args(['check', 'dataset']).java_method_index
+
+
+def test_java_method_index():
+    parser = _get_command_line_parser([], [], [])
+    assert parser.parse_args(['check', 'dataset', '--java-method-index']).java_method_index
@@ -27,3 +27,16 @@ class TestDataEntityLists:
 
         expected = ["p.v2.m1", "p.v2.m2"]
         assert_equals(expected, actual)
+
+    def test_no_version_ids_for_other_project(self):
+        uut = DataEntityLists(["p.v1", "p"], [])
+
+        actual = uut.get_version_white_list("other")
+
+        assert_equals([], actual)
+
+    def test_checks_blacklisted_ids(self):
+        uut = DataEntityLists([], ["p.v"])
+
+        assert uut.is_blacklisted("p.v")
+        assert not uut.is_blacklisted("p")
@@ -29,3 +29,11 @@ class TestDataFilter:
     def test_filters_blacklisted_by_prefix(self):
         uut = DataFilter([], ["-project-"])
         assert uut.is_filtered("-project-.-version-")
+
+    def test_does_not_filter_whitelisted_id(self):
+        uut = DataFilter(["-a-", "-project-.-version-"], [])
+        assert not uut.is_filtered("-project-.-version-")
+
+    def test_does_not_filter_id_sharing_prefix_with_blacklisted_id(self):
+        uut = DataFilter([], ["-project-.-version-"])
+        assert not uut.is_filtered("-project-.-other-")
@@ -1,5 +1,5 @@
 import zipfile
-from os import makedirs
+from os import makedirs, listdir
 from os.path import join, dirname, exists, isfile
 from shutil import rmtree
 from tempfile import mkdtemp
@@ -8,7 +8,7 @@ import yaml
 from nose.tools import assert_raises, assert_equals
 
 from utils.io import create_file, create_file_path, safe_open, safe_write, remove_tree, copy_tree, write_yaml, \
-    zip_dir_contents, safe_read
+    zip_dir_contents, safe_read, YamlCache, yaml_cache, read_yaml, write_once
 
 
 class TestIo:
@@ -39,6 +39,12 @@ class TestIo:
         with open(self.test_file) as actual_file:
             assert actual_file.read() == some_content + '\n'
 
+    def test_writes_once(self):
+        write_once("-content-", self.test_file)
+
+        assert_equals("-content-", write_once("-other-content-", self.test_file))
+        assert_equals(["some-file.txt"], listdir(dirname(self.test_file)))
+
     def test_removes_folder_completely(self):
         create_file(join(self.temp_dir, "dir1", "dir2", "file1"))
         create_file(join(self.temp_dir, "dir1", "file2"))
@@ -172,3 +178,59 @@ class TestIOYaml:
     def test_reads_dot_graph(self):
         data = yaml.load("graph: |\n  digraph \"foo\" {\n   1 [label=\"A\"]\n  }\n")
         assert_equals({"graph": "digraph \"foo\" {\n 1 [label=\"A\"]\n}\n"}, data)
+
+
+class TestYamlCache:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp()
+        self.file = join(self.temp_dir, "file.yml")
+        write_yaml({"foo": "bar"}, self.file)
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_parses_file_once(self):
+        uut = YamlCache()
+
+        uut.read(self.file)
+        document = uut.read(self.file)
+
+        assert_equals({"foo": "bar"}, document)
+        assert_equals(1, uut.hits)
+        assert_equals(1, uut.misses)
+
+    def test_returns_copies(self):
+        uut = YamlCache()
+
+        uut.read(self.file)["foo"] = "-modified-"
+
+        assert_equals({"foo": "bar"}, uut.read(self.file))
+
+    def test_parses_changed_file_again(self):
+        uut = YamlCache()
+        uut.read(self.file)
+        safe_write("foo: other", self.file, append=False)
+
+        assert_equals({"foo": "other"}, uut.read(self.file))
+        assert_equals(2, uut.misses)
+
+    def test_evicts_least_recently_read_file(self):
+        other_file = join(self.temp_dir, "other.yml")
+        write_yaml({}, other_file)
+        uut = YamlCache(max_size=1)
+
+        uut.read(self.file)
+        uut.read(other_file)
+        uut.read(self.file)
+
+        assert_equals(3, uut.misses)
+        assert_equals(1, len(uut))
+
+    def test_write_invalidates_read_file(self):
+        read_yaml(self.file)
+
+        write_yaml({"foo": "baz"}, self.file)
+
+        assert_equals({"foo": "baz"}, read_yaml(self.file))
+        yaml_cache.clear()
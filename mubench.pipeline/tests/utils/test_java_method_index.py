@@ -0,0 +1,216 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from nose.tools import assert_equals, assert_raises
+
+from utils.io import safe_write
+from utils.java_method_index import JavaMethodIndex, UnsupportedJavaSourceError, get_java_method_index
+
+
+def assert_finds_method(code: str, method_signature: str, expected_code: str):
+    output = JavaMethodIndex(code).extract(method_signature)
+    assert_equals(expected_code, output.split(":", 2)[2])
+
+
+class TestJavaMethodIndex:
+    def test_finds_method_by_name(self):
+        assert_finds_method("class C {\n"
+                            "  public void m() {\n"
+                            "  }\n"
+                            "}",
+                            "m()",
+                            "  public void m() {\n"
+                            "  }")
+
+    def test_finds_method_by_signature(self):
+        assert_finds_method("class C{\n"
+                            "  void m(int i) {}\n"
+                            "  void m(Object o) {}\n"
+                            "}",
+                            "m(int)",
+                            "  void m(int i) {}")
+
+    def test_finds_method_by_signature_simple_type_name(self):
+        assert_finds_method("class C{\n"
+                            "  void m(java.lang.List l) {}\n"
+                            "  void m(Object o) {}\n"
+                            "}",
+                            "m(List)",
+                            "  void m(java.lang.List l) {}")
+
+    def test_finds_method_by_multiple_parameter_signature(self):
+        assert_finds_method("class C{\n  void m(A a, B b) {}\n}", "m(A, B)", "  void m(A a, B b) {}")
+
+    def test_finds_method_with_array_parameter(self):
+        assert_finds_method("class C{\n  void m(int[] is) {}\n}", "m(int[])", "  void m(int[] is) {}")
+
+    def test_finds_method_with_array_parameter_alternative_syntax(self):
+        assert_finds_method("class C{\n  void m(int is[]) {}\n}", "m(int[])", "  void m(int is[]) {}")
+
+    def test_finds_method_with_var_args_parameter(self):
+        assert_finds_method("class C{\n  void m(int... is) {}\n}", "m(int[])", "  void m(int... is) {}")
+
+    def test_finds_method_with_generic_parameter(self):
+        assert_finds_method("class C{\n  void m(A<B> a) {}\n}", "m(A)", "  void m(A<B> a) {}")
+        assert_finds_method("class C{\n  void m(A<B> a) {}\n}", "m(A<B>)", "  void m(A<B> a) {}")
+        assert_finds_method("class C{\n  void m(A a) {}\n}", "m(A<B>)", "  void m(A a) {}")
+
+    def test_finds_method_with_inner_type_parameter(self):
+        assert_finds_method("class C {\n  class I {}\n  void m(I i) {}\n}", "m(C$I)", "  void m(I i) {}")
+
+    def test_finds_method_with_annotated_final_parameter(self):
+        assert_finds_method("class C {\n  void m(@Named(\"a\") final A a) {}\n}", "m(A)",
+                            "  void m(@Named(\"a\") final A a) {}")
+
+    def test_finds_constructor(self):
+        assert_finds_method("class C{\n  C() {}\n}", "C()", "  C() {}")
+        assert_finds_method("class C{\n  C() {}\n}", "<init>()", "  C() {}")
+
+    def test_finds_constructor_of_non_static_inner_class(self):
+        assert_finds_method("class C {\n  class I {\n    I() {}\n  }\n}", "I(C)", "    I() {}")
+
+    def test_finds_method_in_anonymous_class(self):
+        assert_finds_method("class C {\n"
+                            "  C() {\n"
+                            "    new Object() {\n"
+                            "      void n() {}\n"
+                            "    };\n"
+                            "  }\n"
+                            "}",
+                            "n()",
+                            "      void n() {}")
+
+    def test_finds_method_in_anonymous_class_in_field_initializer(self):
+        assert_finds_method("class C {\n"
+                            "  Runnable r = new Runnable() {\n"
+                            "    public void run() {}\n"
+                            "  };\n"
+                            "}",
+                            "run()",
+                            "    public void run() {}")
+
+    def test_finds_method_in_enum_constant(self):
+        assert_finds_method("enum E {\n"
+                            "  A(1) {\n"
+                            "    void m() {}\n"
+                            "  }, B(2);\n"
+                            "  E(int i) {}\n"
+                            "}",
+                            "m()",
+                            "    void m() {}")
+
+    def test_finds_abstract_method(self):
+        assert_finds_method("interface I {\n  void m(String s);\n}", "m(String)", "  void m(String s);")
+
+    def test_ignores_braces_in_strings_and_comments(self):
+        assert_finds_method("class C {\n"
+                            "  void m() {\n"
+                            "    String s = \"}\"; // }\n"
+                            "    char c = '{'; /* { */\n"
+                            "  }\n"
+                            "}",
+                            "m()",
+                            "  void m() {\n"
+                            "    String s = \"}\"; // }\n"
+                            "    char c = '{'; /* { */\n"
+                            "  }")
+
+    def test_returns_declaring_type(self):
+        output = JavaMethodIndex("class C {\n  class I {\n    void m() {}\n  }\n  void n() {}\n}").extract("m()")
+        assert_equals("C.I", output.split(":", 2)[1])
+
+    def test_returns_declaring_type_after_inner_type(self):
+        output = JavaMethodIndex("class C {\n  class I {}\n  void m() {}\n}").extract("m()")
+        assert_equals("C", output.split(":", 2)[1])
+
+    def test_includes_comment(self):
+        assert_equals("2:C:  /**\n   * comment\n   */\n  public void m() {}",
+                      JavaMethodIndex("class C {\n  /**\n   * comment\n   */\n  public void m() {}\n}").extract("m()"))
+
+    def test_excludes_comment_before_empty_line(self):
+        index = JavaMethodIndex("class C {\n  // comment\n\n  void m() {}\n}")
+        assert_equals("4:C:  void m() {}", index.extract("m()"))
+
+    def test_excludes_line_comment_of_preceding_code(self):
+        index = JavaMethodIndex("class C {\n  int i; // comment\n  void m() {}\n}")
+        assert_equals("3:C:  void m() {}", index.extract("m()"))
+
+    def test_returns_all_candidates(self):
+        assert_equals("2:C:  void m(){}\n===\n4:C.I:    void m(){}",
+                      JavaMethodIndex("class C {\n  void m(){}\n  class I {\n    void m(){}\n  }\n}").extract("m()"))
+
+    def test_handles_generics_in_parameter_type(self):
+        assert_finds_method("class Tarjan<T> {\n    private void run(T v) {}\n}", "run(Object)",
+                            "    private void run(T v) {}")
+
+    def test_handles_generic_array_types(self):
+        assert_finds_method("class Utils {\n"
+                            "    public static XmlClass[] classesToXmlClasses(Class<?>[] classes) {}\n"
+                            "}",
+                            "classesToXmlClasses(Class[])",
+                            "    public static XmlClass[] classesToXmlClasses(Class<?>[] classes) {}")
+
+    def test_handles_nested_type_parameters(self):
+        assert_finds_method("class C {\n    void foo(Object<T1<?>, T2>[] c) {}\n}", "foo(Object[])",
+                            "    void foo(Object<T1<?>, T2>[] c) {}")
+
+    def test_handles_static_initialization_block(self):
+        assert_finds_method("class C {\n    static {}\n}", "<clinit>()", "    static {}")
+        assert_finds_method("class C {\n    static {}\n}", "static()", "    static {}")
+
+    def test_handles_default_constructor(self):
+        assert_equals("1:C:C() { /* compiler-generated default constructor -- "
+                      "may contain field initialization code */ }",
+                      JavaMethodIndex("class C {}").extract("<init>()"))
+
+    def test_accepts_enum_as_identifier(self):
+        assert_finds_method("class C {\n"
+                            "    void foo() {\n"
+                            "        Object enum;\n"
+                            "    }\n"
+                            "}",
+                            "foo()",
+                            "    void foo() {\n"
+                            "        Object enum;\n"
+                            "    }")
+
+    def test_falls_back_to_matching_only_by_method_name(self):
+        assert_finds_method("class C {\n    void foo(int i) {\n    }\n}", "foo()", "    void foo(int i) {\n    }")
+
+    def test_finds_nothing(self):
+        assert_equals("", JavaMethodIndex("class C {\n  void m() {}\n}").extract("n()"))
+
+    def test_lists_signatures(self):
+        index = JavaMethodIndex("class C<T> {\n  static {}\n  C(int i) {}\n  void m(T t, String... s) {}\n}")
+
+        assert_equals(["<clinit>()", "<init>(int)", "m(Object, String[])"], index.get_signatures())
+
+    def test_rejects_unbalanced_braces(self):
+        assert_raises(UnsupportedJavaSourceError, JavaMethodIndex, "class C {\n  void m() {\n}")
+
+    def test_rejects_unicode_escapes(self):
+        assert_raises(UnsupportedJavaSourceError, JavaMethodIndex, "class C {\n  char c = '\\u0041';\n}")
+
+
+class TestGetJavaMethodIndex:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-test-java-method-index_")
+        self.file = join(self.temp_dir, "C.java")
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_indexes_file(self):
+        safe_write("class C {\n  void m() {}\n}", self.file, append=False)
+
+        assert_equals("2:C:  void m() {}", get_java_method_index(self.file).extract("m()"))
+
+    def test_reuses_index_of_unchanged_file(self):
+        safe_write("class C {}", self.file, append=False)
+
+        assert get_java_method_index(self.file) is get_java_method_index(self.file)
+
+    def test_rejects_missing_file(self):
+        assert_raises(UnsupportedJavaSourceError, get_java_method_index, join(self.temp_dir, "-missing-"))
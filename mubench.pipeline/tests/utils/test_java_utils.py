@@ -0,0 +1,157 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Barrier
+from unittest.mock import patch, MagicMock
+
+from nose.tools import assert_equals, assert_raises
+
+from utils.io import safe_write
+from utils.java_utils import MethodExtractorServer, MethodExtractorServerPool
+from utils.shell import CommandFailedError
+
+# answers requests like the server of the utils, echoing the requested method, and crashes on request of `-crash-`
+FAKE_SERVER = """
+import sys
+print("READY", flush=True)
+for request in sys.stdin:
+    file, *methods = request.rstrip("\\n").split("\\t")
+    if "-crash-" in methods:
+        sys.exit(1)
+    for method in methods:
+        if method == "-error-":
+            print("ERROR -message-", flush=True)
+        else:
+            print("OK 2\\n1:C:{}\\n{}".format(method, file), flush=True)
+    print("END", flush=True)
+"""
+
+
+class TestMethodExtractorServer:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-test-java-utils_")
+        self.starts_file = join(self.temp_dir, "starts")
+        self.uut = None
+
+    def teardown(self):
+        if self.uut:
+            self.uut.stop()
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_server(self, script: str = FAKE_SERVER):
+        def command():
+            safe_write("start", self.starts_file, append=True)
+            return [sys.executable, "-c", script]
+
+        self.uut = MethodExtractorServer(command)
+        return self.uut
+
+    def count_starts(self):
+        with open(self.starts_file) as file:
+            return len(file.readlines())
+
+    def test_extracts_methods(self):
+        uut = self.create_server()
+
+        assert_equals("1:C:m()\n-file-", uut.extract("-file-", "m()"))
+
+    def test_extracts_several_methods_at_once(self):
+        uut = self.create_server()
+
+        assert_equals(["1:C:m()\n-file-", "1:C:n()\n-file-"], uut.extract_all("-file-", ["m()", "n()"]))
+
+    def test_starts_server_once(self):
+        uut = self.create_server()
+
+        uut.extract("-file-", "m()")
+        uut.extract("-file-", "n()")
+
+        assert_equals(1, self.count_starts())
+
+    def test_reports_extraction_error(self):
+        uut = self.create_server()
+
+        with assert_raises(ValueError):
+            uut.extract("-file-", "-error-")
+
+        assert_equals("1:C:m()\n-file-", uut.extract("-file-", "m()"))
+
+    def test_reads_entire_answer_on_extraction_error(self):
+        uut = self.create_server()
+
+        with assert_raises(ValueError):
+            uut.extract_all("-file-", ["-error-", "m()"])
+
+        assert_equals(["1:C:n()\n-file-"], uut.extract_all("-file-", ["n()"]))
+        assert_equals(1, self.count_starts())
+
+    def test_restarts_crashed_server(self):
+        uut = self.create_server()
+        uut.extract("-file-", "m()")
+
+        with assert_raises(ValueError):
+            uut.extract("-file-", "-crash-")
+
+        assert_equals("1:C:m()\n-file-", uut.extract("-file-", "m()"))
+
+    @patch("utils.java_utils.exec_util")
+    def test_falls_back_to_single_extractions_without_server(self, exec_util_mock):
+        exec_util_mock.return_value = "-output-"
+        uut = self.create_server("import sys; sys.exit(1)")
+
+        assert_equals("-output-", uut.extract("-file-", "m()"))
+        assert_equals("-output-", uut.extract("-file-", "n()"))
+
+        exec_util_mock.assert_called_with("MethodExtractor", "\"-file-\" \"n()\"")
+        assert_equals(1, self.count_starts())
+
+    @patch("utils.java_utils.exec_util")
+    def test_reports_failing_fallback_as_extraction_error(self, exec_util_mock):
+        exec_util_mock.side_effect = CommandFailedError("-command-", "-output-")
+        uut = self.create_server("import sys; sys.exit(1)")
+
+        with assert_raises(ValueError):
+            uut.extract("-file-", "m()")
+
+
+class TestMethodExtractorServerPool:
+    def test_reuses_idle_server(self):
+        servers = []
+        uut = MethodExtractorServerPool(2, lambda: servers.append(MagicMock()) or servers[-1])
+
+        uut.extract("-file-", "m()")
+        uut.extract("-file-", "n()")
+
+        assert_equals(1, len(servers))
+
+    def test_starts_servers_for_parallel_extractions(self):
+        servers = []
+        both_busy = Barrier(2, timeout=10)
+
+        def extract_all(file, methods):
+            both_busy.wait()
+            return ["-output-"] * len(methods)
+
+        def create_server():
+            server = MagicMock()
+            server.extract_all.side_effect = extract_all
+            servers.append(server)
+            return server
+
+        uut = MethodExtractorServerPool(2, create_server)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda method: uut.extract("-file-", method), ["m()", "n()"]))
+
+        assert_equals(2, len(servers))
+
+    def test_limits_number_of_servers(self):
+        servers = []
+        uut = MethodExtractorServerPool(1, lambda: servers.append(MagicMock()) or servers[-1])
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda method: uut.extract("-file-", method), ["m()"] * 8))
+
+        assert_equals(1, len(servers))
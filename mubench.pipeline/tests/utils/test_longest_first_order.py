@@ -0,0 +1,76 @@
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest.mock import MagicMock
+
+from nose.tools import assert_equals
+
+from data.runtime_history import RuntimeHistory
+from tests.test_utils.data_util import create_project, create_version, create_misuse
+from utils.io import create_file_path
+from utils.longest_first_order import LongestFirstOrder
+
+
+class TestLongestFirstOrder:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.compiles_path = mkdtemp(prefix="mubench-longest-first-test_")
+        self.runtimes = {}
+        self.misuse_runtimes = {}
+        self.runtime_history = MagicMock(RuntimeHistory)
+        self.runtime_history.get_version_runtime.side_effect = lambda version_id: self.runtimes.get(version_id)
+        self.runtime_history.get_misuse_runtime.side_effect = lambda misuse_id: self.misuse_runtimes.get(misuse_id)
+        self.uut = LongestFirstOrder(self.runtime_history, self.compiles_path)
+
+    def teardown(self):
+        rmtree(self.compiles_path, ignore_errors=True)
+
+    def test_sorts_versions_by_descending_runtime(self):
+        project = create_project("-p-")
+        v1 = create_version("-v1-", project=project, meta={})
+        v2 = create_version("-v2-", project=project, meta={})
+        v3 = create_version("-v3-", project=project, meta={})
+        self.runtimes = {v1.id: 1, v2.id: 3, v3.id: 2}
+
+        assert_equals([v2, v3, v1], self.uut.sort_versions([v1, v2, v3]))
+
+    def test_estimates_runtime_from_classes_size(self):
+        project = create_project("-p-")
+        v1 = create_version("-v1-", project=project, meta={})
+        v2 = create_version("-v2-", project=project, meta={})
+        self.runtimes = {v1.id: 10}
+        self.write_classes(v1, 100)
+        self.write_classes(v2, 1000)
+
+        assert_equals([v2, v1], self.uut.sort_versions([v1, v2]))
+        assert_equals(100, self.uut.get_expected_version_runtime(v2))
+
+    def test_keeps_order_of_versions_without_estimate(self):
+        project = create_project("-p-")
+        v1 = create_version("-v1-", project=project, meta={})
+        v2 = create_version("-v2-", project=project, meta={})
+
+        assert_equals([v1, v2], self.uut.sort_versions([v1, v2]))
+
+    def test_sorts_projects_by_longest_version(self):
+        p1 = create_project("-p1-")
+        v11 = create_version("-v1-", project=p1, meta={})
+        v12 = create_version("-v2-", project=p1, meta={})
+        p2 = create_project("-p2-")
+        v21 = create_version("-v1-", project=p2, meta={})
+        self.runtimes = {v11.id: 2, v12.id: 2, v21.id: 3}
+
+        assert_equals([p2, p1], self.uut.sort_projects([p1, p2]))
+
+    def test_sorts_misuses_by_descending_runtime(self):
+        m1 = create_misuse("-m1-")
+        m2 = create_misuse("-m2-")
+        m3 = create_misuse("-m3-")
+        self.misuse_runtimes = {m1.id: 1, m3.id: 3}
+
+        assert_equals([m3, m2, m1], self.uut.sort_misuses([m1, m2, m3]))
+
+    def write_classes(self, version, size: int):
+        classpath = version.get_compile(self.compiles_path).original_classpath
+        create_file_path(classpath)
+        with open(classpath, 'wb') as file:
+            file.write(b"0" * size)
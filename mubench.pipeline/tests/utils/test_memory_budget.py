@@ -0,0 +1,95 @@
+from threading import Thread
+
+from nose.tools import assert_equals, assert_raises
+
+from utils.memory_budget import MemoryBudget, parse_memory_size, get_max_heap_size, get_physical_memory
+
+
+class TestParseMemorySize:
+    def test_parses_bytes(self):
+        assert_equals(42, parse_memory_size("42"))
+
+    def test_parses_units(self):
+        assert_equals(4 * 1024 ** 3, parse_memory_size("4G"))
+
+    def test_parses_lower_case_units(self):
+        assert_equals(512 * 1024 ** 2, parse_memory_size("512m"))
+
+    def test_fails_on_invalid_size(self):
+        assert_raises(ValueError, parse_memory_size, "-size-")
+
+
+class TestGetMaxHeapSize:
+    def test_reads_xmx(self):
+        assert_equals(8 * 1024 ** 3, get_max_heap_size(["-d64", "-Xmx8G"]))
+
+    def test_reads_max_heap_size(self):
+        assert_equals(2 * 1024 ** 3, get_max_heap_size(["-XX:MaxHeapSize=2g"]))
+
+    def test_last_option_wins(self):
+        assert_equals(2 * 1024 ** 3, get_max_heap_size(["-Xmx8G", "-Xmx2G"]))
+
+    def test_defaults_to_quarter_of_physical_memory(self):
+        assert_equals(get_physical_memory() // 4, get_max_heap_size(["-d64"]))
+
+
+class TestMemoryBudget:
+    def test_admits_within_budget(self):
+        uut = MemoryBudget(8)
+
+        uut.acquire(4)
+        uut.acquire(4)
+
+        assert_equals(8, uut.get_reserved())
+
+    def test_releases(self):
+        uut = MemoryBudget(8)
+        uut.acquire(4)
+
+        uut.release(4)
+
+        assert_equals(0, uut.get_reserved())
+
+    def test_admits_oversized_reservation_alone(self):
+        uut = MemoryBudget(8)
+
+        uut.acquire(16)
+
+        assert_equals(8, uut.get_reserved())
+
+    def test_waits_for_release(self):
+        uut = MemoryBudget(8)
+        uut.acquire(6)
+        waiting = Thread(target=uut.acquire, args=(4,))
+
+        waiting.start()
+        waiting.join(0.1)
+        assert waiting.is_alive()
+
+        uut.release(6)
+        waiting.join(5)
+        assert not waiting.is_alive()
+        assert_equals(4, uut.get_reserved())
+
+    def test_admits_higher_priority_first(self):
+        uut = MemoryBudget(8)
+        uut.acquire(8)
+        admitted = []
+
+        def acquire(name, priority):
+            uut.acquire(8, priority)
+            admitted.append(name)
+
+        short_run = Thread(target=acquire, args=("short", 1))
+        short_run.start()
+        short_run.join(0.1)
+        long_run = Thread(target=acquire, args=("long", 100))
+        long_run.start()
+        long_run.join(0.1)
+
+        uut.release(8)
+        long_run.join(5)
+        uut.release(8)
+        short_run.join(5)
+
+        assert_equals(["long", "short"], admitted)
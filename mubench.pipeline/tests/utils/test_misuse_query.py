@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+from nose.tools import assert_equals, assert_raises
+
+from tests.test_utils.data_util import create_misuse
+from utils.misuse_query import MisuseIndex, MisuseQuery
+
+
+class TestMisuseQuery:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.iterator_misuse = create_misuse("-m1-", meta={"api": ["java.util.Iterator"], "crash": True,
+                                                           "violations": ["missing/condition/null_check"],
+                                                           "source": {"name": "-source-"}},
+                                             correct_usages=[MagicMock()])
+        self.list_misuse = create_misuse("-m2-", meta={"api": ["java.util.List"], "crash": False,
+                                                       "violations": ["missing/call"], "internal": True})
+        self.index = MisuseIndex([self.iterator_misuse, self.list_misuse])
+
+    def test_selects_by_api(self):
+        assert_equals({self.iterator_misuse.id}, MisuseQuery("api=java.util.Iterator").select(self.index))
+
+    def test_compares_values_case_insensitively(self):
+        assert_equals({self.iterator_misuse.id}, MisuseQuery("source=-SOURCE-").select(self.index))
+
+    def test_selects_by_flags(self):
+        assert_equals({self.iterator_misuse.id}, MisuseQuery("crash").select(self.index))
+        assert_equals({self.list_misuse.id}, MisuseQuery("internal").select(self.index))
+        assert_equals({self.iterator_misuse.id}, MisuseQuery("correct-usages").select(self.index))
+
+    def test_combines_conditions(self):
+        query = MisuseQuery("api=java.util.Iterator and violation=missing/condition/null_check and correct-usages")
+
+        assert_equals({self.iterator_misuse.id}, query.select(self.index))
+
+    def test_selects_alternatives(self):
+        query = MisuseQuery("violation=missing/call or api=java.util.Iterator")
+
+        assert_equals({self.iterator_misuse.id, self.list_misuse.id}, query.select(self.index))
+
+    def test_negates_condition(self):
+        assert_equals({self.list_misuse.id}, MisuseQuery("not crash").select(self.index))
+
+    def test_and_binds_stronger_than_or(self):
+        query = MisuseQuery("internal or crash and not correct-usages")
+
+        assert_equals({self.list_misuse.id}, query.select(self.index))
+
+    def test_groups_conditions(self):
+        query = MisuseQuery("(internal or crash) and not correct-usages")
+
+        assert_equals({self.list_misuse.id}, query.select(self.index))
+
+    def test_rejects_unknown_condition(self):
+        assert_raises(ValueError, MisuseQuery, "fixed")
+
+    def test_rejects_unknown_attribute(self):
+        assert_raises(ValueError, MisuseQuery, "project=-p-")
+
+    def test_rejects_incomplete_query(self):
+        assert_raises(ValueError, MisuseQuery, "crash and")
+
+    def test_rejects_unbalanced_parentheses(self):
+        assert_raises(ValueError, MisuseQuery, "(crash")
+        assert_raises(ValueError, MisuseQuery, "crash)")
@@ -3,7 +3,7 @@ import os
 from nose.plugins.attrib import attr
 from nose.tools import assert_equals, assert_raises
 
-from utils.shell import Shell, CommandFailedError
+from utils.shell import Shell, CommandFailedError, record_child_usage, get_process_peak_rss, _CAN_RECORD_CHILD_USAGE
 
 
 class TestShell:
@@ -49,3 +49,24 @@ class TestShell:
         except CommandFailedError as e:
             assert_equals("test" + os.linesep, e.error)
 
+
+    def test_records_child_usage(self):
+        with record_child_usage() as usage:
+            Shell.exec("echo test")
+
+        assert usage.cpu_time >= 0
+        assert usage.peak_rss > 0
+
+    def test_can_record_child_usage(self):
+        # fails if `Popen` no longer provides the private method that `_Process` overrides to record the usage
+        assert _CAN_RECORD_CHILD_USAGE
+
+    def test_gets_process_peak_rss(self):
+        assert get_process_peak_rss() > 0
+
+    def test_records_child_usage_in_outer_context(self):
+        with record_child_usage() as outer_usage:
+            with record_child_usage():
+                Shell.exec("echo test")
+
+        assert outer_usage.peak_rss > 0
@@ -0,0 +1,40 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from nose.tools import assert_equals
+
+from utils.work_queue import WorkQueue
+
+
+class TestWorkQueue:
+    # noinspection PyAttributeOutsideInit
+    def setup(self):
+        self.temp_dir = mkdtemp(prefix="mubench-work-queue-test_")
+        self.database_path = join(self.temp_dir, "queue", "queue.sqlite")
+
+    def teardown(self):
+        rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_claims(self):
+        uut = WorkQueue(self.database_path, "-node-")
+
+        assert uut.claim("-item-")
+
+    def test_does_not_claim_item_of_other_node(self):
+        WorkQueue(self.database_path, "-other-node-").claim("-item-")
+        uut = WorkQueue(self.database_path, "-node-")
+
+        assert not uut.claim("-item-")
+
+    def test_reclaims_own_item(self):
+        WorkQueue(self.database_path, "-node-").claim("-item-")
+        uut = WorkQueue(self.database_path, "-node-")
+
+        assert uut.claim("-item-")
+
+    def test_shares_value_of_first_node(self):
+        WorkQueue(self.database_path, "-other-node-").share("-key-", "-value-")
+        uut = WorkQueue(self.database_path, "-node-")
+
+        assert_equals("-value-", uut.share("-key-", "-other-value-"))
@@ -11,6 +11,8 @@ from data.detector import get_available_detector_ids, Detector
 from tasks.implementations import stats
 from utils.dataset_util import get_available_dataset_ids
 from utils.io import read_yaml
+from utils.memory_budget import parse_memory_size
+from utils.misuse_query import MisuseQuery
 
 MUBENCH_ROOT_PATH = abspath(join(dirname(abspath(__file__)), os.pardir, os.pardir))
 __DATA_PATH = join(MUBENCH_ROOT_PATH, "data")
@@ -145,6 +147,7 @@ def __add_check_dataset_subprocess(available_datasets: List[str], subparsers) ->
                                                              "are already checked out. Run `checkout` first, to ensure "
                                                              "this check.")
     __setup_filter_arguments(dataset_check_parser, available_datasets)
+    __setup_snippet_arguments(dataset_check_parser)
 
 
 def __add_info_subprocess(available_datasets: List[str], subparsers) -> None:
@@ -173,6 +176,11 @@ def __add_checkout_subprocess(available_datasets: List[str], subparsers) -> None
                                                         "Places checkouts in `checkouts`.")
     __setup_filter_arguments(checkout_parser, available_datasets)
     __setup_checkout_arguments(checkout_parser)
+    __setup_parallelization_arguments(checkout_parser)
+    __setup_profiling_arguments(checkout_parser)
+    __setup_progress_arguments(checkout_parser)
+    __setup_resume_arguments(checkout_parser)
+    __setup_sharding_arguments(checkout_parser)
 
 
 def __add_compile_subprocess(available_datasets: List[str], subparsers) -> None:
@@ -186,6 +194,11 @@ def __add_compile_subprocess(available_datasets: List[str], subparsers) -> None:
     __setup_filter_arguments(compile_parser, available_datasets)
     __setup_compile_arguments(compile_parser)
     __setup_checkout_arguments(compile_parser)
+    __setup_parallelization_arguments(compile_parser)
+    __setup_profiling_arguments(compile_parser)
+    __setup_progress_arguments(compile_parser)
+    __setup_resume_arguments(compile_parser)
+    __setup_sharding_arguments(compile_parser)
 
 
 def __add_run_subprocess(available_detectors: List[str], available_datasets: List[str], subparsers) -> None:
@@ -219,6 +232,13 @@ def __add_run_ex1_subprocess(available_detectors: List[str], available_datasets:
     __setup_checkout_arguments(experiment_parser)
     __setup_compile_arguments(experiment_parser)
     __setup_run_arguments(experiment_parser, available_detectors)
+    __setup_snippet_arguments(experiment_parser)
+    __setup_parallelization_arguments(experiment_parser)
+    __setup_profiling_arguments(experiment_parser)
+    __setup_progress_arguments(experiment_parser)
+    __setup_resume_arguments(experiment_parser)
+    __setup_sharding_arguments(experiment_parser)
+    __setup_plan_arguments(experiment_parser)
 
 
 def __add_run_ex2_subprocess(available_detectors: List[str], available_datasets: List[str], subparsers) -> None:
@@ -232,6 +252,13 @@ def __add_run_ex2_subprocess(available_detectors: List[str], available_datasets:
     __setup_checkout_arguments(experiment_parser)
     __setup_compile_arguments(experiment_parser)
     __setup_run_arguments(experiment_parser, available_detectors)
+    __setup_snippet_arguments(experiment_parser)
+    __setup_parallelization_arguments(experiment_parser)
+    __setup_profiling_arguments(experiment_parser)
+    __setup_progress_arguments(experiment_parser)
+    __setup_resume_arguments(experiment_parser)
+    __setup_sharding_arguments(experiment_parser)
+    __setup_plan_arguments(experiment_parser)
     __setup_publish_precision_arguments(experiment_parser)
 
 
@@ -246,6 +273,13 @@ def __add_run_ex3_subprocess(available_detectors: List[str], available_datasets:
     __setup_checkout_arguments(experiment_parser)
     __setup_compile_arguments(experiment_parser)
     __setup_run_arguments(experiment_parser, available_detectors)
+    __setup_snippet_arguments(experiment_parser)
+    __setup_parallelization_arguments(experiment_parser)
+    __setup_profiling_arguments(experiment_parser)
+    __setup_progress_arguments(experiment_parser)
+    __setup_resume_arguments(experiment_parser)
+    __setup_sharding_arguments(experiment_parser)
+    __setup_plan_arguments(experiment_parser)
 
 
 def __add_publish_subprocess(available_detectors: List[str], available_datasets: List[str], subparsers) -> None:
@@ -279,6 +313,12 @@ def __add_publish_metadata(available_datasets, publish_subparsers) -> None:
     __setup_filter_arguments(publish_metadata_parser, available_datasets)
     __setup_checkout_arguments(publish_metadata_parser)
     __setup_publish_arguments(publish_metadata_parser)
+    __setup_snippet_arguments(publish_metadata_parser)
+    __setup_parallelization_arguments(publish_metadata_parser)
+    __setup_profiling_arguments(publish_metadata_parser)
+    __setup_progress_arguments(publish_metadata_parser)
+    __setup_resume_arguments(publish_metadata_parser)
+    __setup_sharding_arguments(publish_metadata_parser)
 
 
 def __add_publish_ex1_subprocess(available_detectors: List[str], available_datasets: List[str], subparsers) -> None:
@@ -296,6 +336,12 @@ def __add_publish_ex1_subprocess(available_detectors: List[str], available_datas
     __setup_checkout_arguments(experiment_parser)
     __setup_compile_arguments(experiment_parser)
     __setup_run_arguments(experiment_parser, available_detectors)
+    __setup_snippet_arguments(experiment_parser)
+    __setup_parallelization_arguments(experiment_parser)
+    __setup_profiling_arguments(experiment_parser)
+    __setup_progress_arguments(experiment_parser)
+    __setup_resume_arguments(experiment_parser)
+    __setup_sharding_arguments(experiment_parser)
     __setup_publish_arguments(experiment_parser)
 
 
@@ -312,6 +358,12 @@ def __add_publish_ex2_subprocess(available_detectors: List[str], available_datas
     __setup_checkout_arguments(experiment_parser)
     __setup_compile_arguments(experiment_parser)
     __setup_run_arguments(experiment_parser, available_detectors)
+    __setup_snippet_arguments(experiment_parser)
+    __setup_parallelization_arguments(experiment_parser)
+    __setup_profiling_arguments(experiment_parser)
+    __setup_progress_arguments(experiment_parser)
+    __setup_resume_arguments(experiment_parser)
+    __setup_sharding_arguments(experiment_parser)
     __setup_publish_arguments(experiment_parser)
     __setup_publish_precision_arguments(experiment_parser)
 
@@ -332,6 +384,12 @@ def __add_publish_ex3_subprocess(available_detectors: List[str], available_datas
     __setup_checkout_arguments(experiment_parser)
     __setup_compile_arguments(experiment_parser)
     __setup_run_arguments(experiment_parser, available_detectors)
+    __setup_snippet_arguments(experiment_parser)
+    __setup_parallelization_arguments(experiment_parser)
+    __setup_profiling_arguments(experiment_parser)
+    __setup_progress_arguments(experiment_parser)
+    __setup_resume_arguments(experiment_parser)
+    __setup_sharding_arguments(experiment_parser)
     __setup_publish_arguments(experiment_parser)
 
 
@@ -348,6 +406,19 @@ def __setup_filter_arguments(parser: ArgumentParser, available_datasets: List[st
                         help="process only misuses in the specified data set(s) (case insensitive)",
                         type=str.lower)
 
+    def misuse_query(x):
+        try:
+            return MisuseQuery(x)
+        except ValueError as e:
+            raise ArgumentTypeError(str(e))
+
+    parser.add_argument('--where', metavar='QUERY', type=misuse_query, dest='where',
+                        default=__get_default('where', None),
+                        help="process only misuses that match the query, which combines `api=<name>`, "
+                             "`violation=<name>`, `source=<name>`, `crash`, `internal`, and `correct-usages` with "
+                             "`and`, `or`, `not`, and parentheses (example: `--where \"api=java.util.Iterator and "
+                             "violation=missing/condition/null_check and correct-usages\"`)")
+
 
 def __setup_checkout_arguments(parser: ArgumentParser) -> None:
     parser.add_argument('--force-checkout', dest='force_checkout', action='store_true',
@@ -382,10 +453,118 @@ def __setup_run_arguments(parser: ArgumentParser, available_detectors: List[str]
                         default=__get_default('java-options', []), action=ExtendAction,
                         help="pass options to the java subprocess running the detector "
                              "(example: `--java-options Xmx4G` runs `java -Xmx4G`)")
+
+    def memory_size(x):
+        try:
+            return parse_memory_size(x)
+        except ValueError as e:
+            raise ArgumentTypeError(str(e))
+
+    parser.add_argument('--memory-budget', type=memory_size, default=__get_default('memory-budget', None),
+                        metavar='size', dest='memory_budget',
+                        help="start detector processes only while the sum of their maximum heap sizes (`Xmx`) stays"
+                             " within the given size (example: `--memory-budget 16G`)")
     parser.add_argument('--tag', dest='requested_release', default=__get_default('requested_release', Detector.DEFAULT_RELEASE),
                         metavar='rel', help="use a specific detector release by tag (case insensitive)", type=str.lower)
 
 
+def __setup_snippet_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument('--no-snippet-cache', dest='no_snippet_cache', action='store_true',
+                        default=__get_default('no-snippet-cache', False),
+                        help="extract all code snippets anew, instead of reusing the snippets that previous runs"
+                             " extracted from unchanged source files")
+    parser.add_argument('--java-method-index', dest='java_method_index', action='store_true',
+                        default=__get_default('java-method-index', False),
+                        help="locate methods in Java sources without starting a JVM, falling back to the utils only for"
+                             " sources that the index does not handle (experimental)")
+
+
+def __setup_parallelization_arguments(parser: ArgumentParser) -> None:
+    def jobs(x):
+        number_of_jobs = int(x)
+        if number_of_jobs < 1:
+            raise ArgumentTypeError("invalid value: {}, must be at least 1".format(number_of_jobs))
+        return number_of_jobs
+
+    parser.add_argument('--jobs', type=jobs, default=__get_default('jobs', 1), metavar='n', dest='jobs',
+                        help="process up to n project versions or misuses in parallel. Defaults to 1.")
+
+    def stage_concurrency(x):
+        name, separator, concurrency = x.partition('=')
+        if not separator:
+            return name, 1
+        try:
+            number_of_threads = int(concurrency)
+        except ValueError:
+            raise ArgumentTypeError("invalid value: {}, must be STAGE or STAGE=n".format(x))
+        if number_of_threads < 1:
+            raise ArgumentTypeError("invalid value: {}, n must be at least 1".format(x))
+        return name, number_of_threads
+
+    parser.add_argument('--pipeline', type=stage_concurrency, nargs='*', default=__get_default('pipeline', None),
+                        metavar='STAGE=n', dest='pipeline',
+                        help="overlap the checkout, compile, detect, and publish stages, running each stage on up to"
+                             " n project versions or misuses concurrently. Stages default to n=1.")
+    parser.add_argument('--longest-first', dest='longest_first', action='store_true',
+                        default=__get_default('longest-first', False),
+                        help="process project versions and misuses in the order of their expected detector runtime,"
+                             " longest first, according to previous runs or the size of their compiled classes")
+
+
+def __setup_profiling_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument('--profile', type=int, nargs='?', const=10, default=__get_default('profile', None),
+                        metavar='n', dest='profile',
+                        help="measure the time and memory of every task on every project, version, and misuse, write"
+                             " a report to the logs, and list the n slowest of them. Defaults to n=10.")
+
+
+def __setup_progress_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument('--progress', dest='progress', action='store_true', default=__get_default('progress', False),
+                        help="show the number of project versions and misuses each task completed, the throughput,"
+                             " and the expected remaining time in a status line")
+    parser.add_argument('--status-file', default=__get_default('status-file', None), metavar='file',
+                        dest='status_file',
+                        help="periodically write the progress of the run to the given JSON file")
+
+
+def __setup_resume_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument('--resume', dest='resume', action='store_true', default=False,
+                        help="skip all project versions and misuses that a previous, interrupted run with the same"
+                             " arguments completed")
+
+
+def __setup_sharding_arguments(parser: ArgumentParser) -> None:
+    def shard(x):
+        index, separator, count = x.partition('/')
+        try:
+            index, count = int(index), int(count)
+        except ValueError:
+            raise ArgumentTypeError("invalid value: {}, must be i/n".format(x))
+        if not separator or count < 1 or not 1 <= index <= count:
+            raise ArgumentTypeError("invalid value: {}, must be i/n with 1 <= i <= n".format(x))
+        return index, count
+
+    parser.add_argument('--shard', type=shard, default=__get_default('shard', None), metavar='i/n', dest='shard',
+                        help="split the project versions into n shards of about the same expected runtime and only"
+                             " process the i-th shard (example: `--shard 2/3`)")
+    parser.add_argument('--shard-queue', default=__get_default('shard-queue', None), metavar='file',
+                        dest='shard_queue',
+                        help="with --shard, coordinate the shards via a queue in the given file on a shared file"
+                             " system, such that nodes that finished their shard take over unprocessed project"
+                             " versions of other shards")
+    parser.add_argument('--shard-partition', default=__get_default('shard-partition', None), metavar='file',
+                        dest='shard_partition',
+                        help="with --shard, share the partition of the project versions into shards via the given"
+                             " file on a shared file system, such that all nodes use the partition of the first node,"
+                             " even if their runtime histories differ (default: via the --shard-queue, if any)")
+
+
+def __setup_plan_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument('--plan', dest='plan', action='store_true', default=False,
+                        help="only list the checkouts, compiles, and detector runs that the run would execute or skip,"
+                             " with the expected detector runtime from previous runs")
+
+
 def __setup_publish_arguments(parser: ArgumentParser) -> None:
     default_review_site = __get_default('review-site', None)
     parser.add_argument("-s", "--review-site", required=(not default_review_site), metavar="URL",
@@ -1,41 +1,51 @@
-from typing import List
+from typing import List, Dict, Set
 
 
 class DataEntityLists:
     def __init__(self, white_list: List[str], black_list: List[str]):
         self.__project_whitelist = DataEntityLists.__get_project_white_list(white_list)
-        self.__version_whitelist = DataEntityLists.__get_version_white_list(white_list)
-        self.__misuse_whitelist = DataEntityLists.__get_misuse_white_list(white_list)
+        # white lists by project and version, such that collecting the entities of a project or version does not
+        # search the entire white list, which may be large when it comes from datasets
+        self.__version_whitelists = DataEntityLists.__get_version_white_lists(white_list)
+        self.__misuse_whitelists = DataEntityLists.__get_misuse_white_lists(white_list)
         self.__black_list = black_list
+        self.__black_list_ids = set(black_list)  # type: Set[str]
 
     def get_project_white_list(self) -> List[str]:
         return self.__project_whitelist
 
     def get_version_white_list(self, project_id: str) -> List[str]:
-        return [version_id for version_id in self.__version_whitelist if version_id.split('.')[0] == project_id]
+        return self.__version_whitelists.get(project_id, [])
 
     def get_misuse_white_list(self, version_id: str) -> List[str]:
-        return [misuse_id for misuse_id in self.__misuse_whitelist if misuse_id.rsplit('.', 1)[0] == version_id]
+        return self.__misuse_whitelists.get(version_id, [])
 
     @property
     def black_list(self) -> List[str]:
         return self.__black_list
 
+    def is_blacklisted(self, id_: str) -> bool:
+        return id_ in self.__black_list_ids
+
     @staticmethod
     def __get_project_white_list(ids: List[str]) -> List[str]:
         return [id.partition('.')[0] for id in ids]
 
     @staticmethod
-    def __get_version_white_list(ids: List[str]) -> List[str]:
-        result = []
+    def __get_version_white_lists(ids: List[str]) -> Dict[str, List[str]]:
+        result = {}
         for id in ids:
             split = id.split('.')
             if len(split) > 1:
                 project_id = split[0]
                 version_id = split[1]
-                result.append("{}.{}".format(project_id, version_id))
+                result.setdefault(project_id, []).append("{}.{}".format(project_id, version_id))
         return result
 
     @staticmethod
-    def __get_misuse_white_list(ids: List[str]) -> List[str]:
-        return [id for id in ids if len(id.split('.')) > 2]
+    def __get_misuse_white_lists(ids: List[str]) -> Dict[str, List[str]]:
+        result = {}
+        for id in ids:
+            if len(id.split('.')) > 2:
+                result.setdefault(id.rsplit('.', 1)[0], []).append(id)
+        return result
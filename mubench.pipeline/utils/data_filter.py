@@ -1,10 +1,12 @@
-from typing import List
+from typing import List, Dict
 
 
 class DataFilter:
     def __init__(self, white_list: List[str], black_list: List[str]):
         self.white_list = white_list
         self.black_list = black_list
+        self.__white_list_trie = _PrefixTrie(white_list)
+        self.__black_list_trie = _PrefixTrie(black_list)
 
     def is_filtered(self, id_: str):
         blacklisted = self._is_blacklisted(id_)
@@ -12,8 +14,42 @@ class DataFilter:
         return blacklisted or not whitelisted
 
     def _is_blacklisted(self, id_: str):
-        return any(id_.startswith(blacklisted) for blacklisted in self.black_list)
+        return self.__black_list_trie.contains_prefix_of(id_)
 
     def _is_whitelisted(self, id_: str):
-        return any(id_.startswith(whitelisted) for whitelisted in self.white_list) or \
-               any(whitelisted.startswith(id_) for whitelisted in self.white_list)
+        return self.__white_list_trie.contains_prefix_of(id_) or self.__white_list_trie.contains_extension_of(id_)
+
+
+class _PrefixTrie:
+    """
+    Character trie of a list of ids, which answers whether the list contains a prefix or an extension of an id in time
+    linear in the length of the id, independent of the length of the list.
+    """
+
+    __END = None
+
+    def __init__(self, ids: List[str]):
+        self.__root = {}  # type: Dict
+        for id_ in ids:
+            node = self.__root
+            for character in id_:
+                node = node.setdefault(character, {})
+            node[_PrefixTrie.__END] = True
+
+    def contains_prefix_of(self, id_: str) -> bool:
+        node = self.__root
+        for character in id_:
+            if _PrefixTrie.__END in node:
+                return True
+            node = node.get(character, None)
+            if node is None:
+                return False
+        return _PrefixTrie.__END in node
+
+    def contains_extension_of(self, id_: str) -> bool:
+        node = self.__root
+        for character in id_:
+            node = node.get(character, None)
+            if node is None:
+                return False
+        return bool(node)
@@ -1,10 +1,14 @@
 import logging
+import pickle
 import zipfile
-from os import makedirs, chmod, remove, listdir, readlink, symlink, stat, walk
+from collections import OrderedDict
+from os import makedirs, chmod, remove, listdir, readlink, symlink, stat, walk, link, fdopen
 from os.path import dirname, exists, isfile, join, isdir, basename, islink, relpath
 from shutil import rmtree, copy
 from stat import S_IWRITE
-from typing import Dict, List
+from tempfile import mkstemp
+from threading import Lock
+from typing import Dict, List, Tuple
 
 import yaml
 
@@ -34,6 +38,26 @@ def create_file_path(file_path: str) -> None:
     makedirs(dirname(file_path), exist_ok=True)
 
 
+def write_once(content: str, file_path: str) -> str:
+    """
+    Writes the content to the file, unless the file exists, and returns the content of the file. Of several processes
+    that write the same file at once, also on different machines on a shared file system, exactly one writes its
+    content and all read that content.
+    """
+    create_file_path(file_path)
+    handle, temp_path = mkstemp(dir=dirname(file_path), prefix=basename(file_path), suffix=".tmp")
+    try:
+        with fdopen(handle, 'w', encoding="utf-8") as file:
+            file.write(content)
+        # creating a hard link fails atomically if the file exists
+        link(temp_path, file_path)
+    except FileExistsError:
+        pass
+    finally:
+        remove(temp_path)
+    return safe_read(file_path)
+
+
 def create_file(file_path: str, truncate: bool = False) -> None:
     create_file_path(file_path)
     mode = 'w+' if truncate else 'a+'
@@ -96,6 +120,7 @@ def write_yamls(data: List[Dict], file: str = None):
 def __write_yaml(data, dump, file):
     data = __escape_str(data)
     if file:
+        yaml_cache.invalidate(file)
         create_file(file)
         with open(file, "w", encoding="utf-8") as stream:
             return dump(data, stream, Dumper=Dumper, default_flow_style=False, encoding="utf-8")
@@ -120,9 +145,58 @@ def __escape_str(data):
         return data
 
 
+class YamlCache:
+    """
+    Keeps the most recently read YAML documents, identified by their path, modification time, and size, such that
+    repeated reads of an unchanged file do not parse it again. Reads return a fresh copy of the document, since callers
+    may modify it.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__documents = OrderedDict()  # type: OrderedDict[str, Tuple[Tuple[int, int], bytes]]
+        self.__lock = Lock()
+
+    def read(self, file: str):
+        file_stat = stat(file)
+        file_stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+        with self.__lock:
+            cached = self.__documents.get(file, None)
+            if cached is not None and cached[0] == file_stamp:
+                self.hits += 1
+                self.__documents.move_to_end(file)
+                return pickle.loads(cached[1])
+            self.misses += 1
+
+        with open(file, 'rU', encoding="utf-8") as stream:
+            document = yaml.load(stream, Loader=Loader)
+
+        with self.__lock:
+            self.__documents[file] = (file_stamp, pickle.dumps(document, pickle.HIGHEST_PROTOCOL))
+            self.__documents.move_to_end(file)
+            while len(self.__documents) > self.max_size:
+                self.__documents.popitem(last=False)
+        return document
+
+    def invalidate(self, file: str):
+        with self.__lock:
+            self.__documents.pop(file, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__documents.clear()
+
+    def __len__(self):
+        return len(self.__documents)
+
+
+yaml_cache = YamlCache()
+
+
 def read_yaml(file: str):
-    with open(file, 'rU', encoding="utf-8") as stream:
-        return yaml.load(stream, Loader=Loader)
+    return yaml_cache.read(file)
 
 
 def read_yaml_if_exists(file: str):
@@ -136,7 +210,7 @@ class open_yamls:
 
     def __enter__(self):
         self._file = open(self.filename, 'rU', encoding="utf-8")
-        return yaml.load_all(self._file)
+        return yaml.load_all(self._file, Loader=Loader)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._file.close()
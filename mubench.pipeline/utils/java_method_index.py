@@ -0,0 +1,626 @@
+import re
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
+from os import stat
+from threading import Lock
+from typing import List, Optional, Tuple, Dict
+
+_CONSTRUCTOR_ID = ".ctor"
+_BYTECODE_STATIC_INITIALIZER_ID = "<clinit>()"
+_SOURCECODE_STATIC_INITIALIZER_ID = "static()"
+_DEFAULT_CONSTRUCTOR_CODE = "{}() {{ /* compiler-generated default constructor -- " \
+                            "may contain field initialization code */ }}"
+
+_MODIFIERS = {"public", "protected", "private", "static", "final", "abstract", "native", "synchronized", "transient",
+              "volatile", "strictfp", "default"}
+
+_TOKEN_PATTERN = re.compile(r"""
+     (?P<space>[ \t\f\n]+)
+    |(?P<line_comment>//[^\n]*)
+    |(?P<block_comment>/\*.*?\*/)
+    |(?P<text_block>\"\"\")
+    |(?P<string>"(?:[^"\\\n]|\\.)*")
+    |(?P<char>'(?:[^'\\\n]|\\.)+')
+    |(?P<identifier>(?:[^\W\d]|\$)(?:\w|\$)*)
+    |(?P<number>\.?\d(?:[eEpP][+-]|[\w.])*)
+    |(?P<operator>\.\.\.|->|::|[{}()\[\];,.@=<>!~?:&|+\-*/^%])
+    """, re.VERBOSE | re.DOTALL)
+
+_Token = namedtuple("_Token", ["kind", "text", "line", "offset"])
+_Comment = namedtuple("_Comment", ["is_line_comment", "begin_line", "end_line", "offset"])
+_Parameter = namedtuple("_Parameter", ["type_name", "is_var_args"])
+_Declaration = namedtuple("_Declaration", ["name", "parameters", "first_line", "last_line"])
+
+
+class UnsupportedJavaSourceError(ValueError):
+    pass
+
+
+class JavaMethodIndex:
+    """
+    Locates methods in Java source code without a JVM, by tokenizing the code and tracking its braces, rather than
+    parsing it. It finds the same methods and produces the same output as the MethodExtractor of the utils, including
+    its handling of inner and anonymous types, bytecode signatures, and default constructors. For code that it does
+    not handle, such as unbalanced braces or syntax that the MethodExtractor does not parse, it raises an
+    `UnsupportedJavaSourceError`, in which case the MethodExtractor should extract the methods instead.
+    """
+
+    # identifies the output of the index, change it whenever the output changes
+    VERSION = "1"
+
+    def __init__(self, code: str):
+        # read the lines like the MethodExtractor does, which joins them with "\n" before parsing
+        self.lines = re.split(r"\r\n|\r|\n", code)
+        if self.lines[-1] == "":
+            self.lines.pop()
+        tokens, comments = _tokenize("\n".join(self.lines))
+        self.__events = _JavaSourceScanner(tokens, comments).scan()
+
+    @staticmethod
+    def from_file(file_path: str) -> 'JavaMethodIndex':
+        try:
+            with open(file_path, "rb") as file:
+                code = file.read().decode("utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            raise UnsupportedJavaSourceError("cannot read {}: {}".format(file_path, e))
+        return JavaMethodIndex(code)
+
+    def get_signatures(self) -> List[str]:
+        """The signatures of all methods, constructors, and static initializers, in the order of the code."""
+        signatures = []
+        type_parameters = []
+        for event in self.__events:
+            if event[0] == "type_parameter":
+                type_parameters.append(event[1])
+            elif event[0] == "method":
+                signatures.append(_get_signature(event[1].name, event[1].parameters, type_parameters))
+            elif event[0] == "constructor":
+                signatures.append(_get_signature("<init>", event[1].parameters, type_parameters))
+            elif event[0] == "initializer" and event[2]:
+                signatures.append(_BYTECODE_STATIC_INITIALIZER_ID)
+        return signatures
+
+    def extract(self, method_signature: str) -> str:
+        """Extracts the methods with the given signature, in the output format of the MethodExtractor."""
+        method_signature = _normalize(method_signature)
+        fragments = self.__find(method_signature, False)
+        if not fragments:
+            fragments = self.__find(method_signature, True)
+        return "\n===\n".join(self.__to_string(fragment) for fragment in fragments)
+
+    def __find(self, method_signature: str, ignore_parameters: bool) -> List[Tuple[int, int, str, bool]]:
+        fragments = []  # type: List[Tuple[int, int, str, bool]]
+        enclosing_types = []  # type: List[str]
+        type_parameters = []  # type: List[str]
+        index = 0
+        while index < len(self.__events):
+            event = self.__events[index]
+            index += 1
+            kind = event[0]
+            if kind == "type_start":
+                enclosing_types.append(event[1])
+            elif kind == "type_end":
+                if method_signature == _CONSTRUCTOR_ID + "()" and not fragments:
+                    fragments.append((event[2], event[2], event[1], True))
+                enclosing_types.pop()
+            elif kind == "type_parameter":
+                type_parameters.append(event[1])
+            elif kind == "method":
+                signature = _get_signature(event[1].name, event[1].parameters, type_parameters)
+                if _is_same_signature(method_signature, signature, ignore_parameters):
+                    fragments.append(self.__get_fragment(event[1], enclosing_types))
+            elif kind == "constructor":
+                if self.__is_matching_constructor(method_signature, event[1], enclosing_types, type_parameters):
+                    fragments.append(self.__get_fragment(event[1], enclosing_types))
+                    # like the MethodExtractor, skip the body of the matching constructor
+                    index = event[2]
+            elif kind == "initializer":
+                if method_signature in (_BYTECODE_STATIC_INITIALIZER_ID, _SOURCECODE_STATIC_INITIALIZER_ID) \
+                        and event[2]:
+                    fragments.append(self.__get_fragment(event[1], enclosing_types))
+        return fragments
+
+    @staticmethod
+    def __is_matching_constructor(method_signature: str, constructor: _Declaration, enclosing_types: List[str],
+                                  type_parameters: List[str]) -> bool:
+        parameters = list(constructor.parameters)
+        type_nesting_depth = len(enclosing_types)
+        while True:
+            if method_signature in (_get_signature(_CONSTRUCTOR_ID, parameters, type_parameters),
+                                    _get_signature(constructor.name, parameters, type_parameters)):
+                return True
+            # constructors of non-static inner classes take instances of the enclosing types in bytecode
+            if type_nesting_depth - 2 >= 0:
+                parameters.insert(0, _Parameter(enclosing_types[type_nesting_depth - 2], False))
+            type_nesting_depth -= 1
+            if type_nesting_depth < 0:
+                return False
+
+    @staticmethod
+    def __get_fragment(declaration: _Declaration, enclosing_types: List[str]) -> Tuple[int, int, str, bool]:
+        return declaration.first_line, declaration.last_line, ".".join(enclosing_types), False
+
+    def __to_string(self, fragment: Tuple[int, int, str, bool]) -> str:
+        first_line, last_line, declaring_type, is_default_constructor = fragment
+        if is_default_constructor:
+            code = _DEFAULT_CONSTRUCTOR_CODE.format(declaring_type)
+        else:
+            code = "\n".join(self.lines[first_line - 1:last_line])
+        return "{}:{}:{}".format(first_line, declaring_type, code)
+
+
+_index_cache = OrderedDict()  # type: Dict[str, Tuple[Tuple[int, int], JavaMethodIndex]]
+_index_cache_lock = Lock()
+_INDEX_CACHE_SIZE = 32
+
+
+def get_java_method_index(file_path: str) -> JavaMethodIndex:
+    """Returns the index of the given file, reusing the index of recently indexed files that did not change since."""
+    try:
+        file_stat = stat(file_path)
+    except OSError as e:
+        raise UnsupportedJavaSourceError("cannot read {}: {}".format(file_path, e))
+    file_stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+
+    with _index_cache_lock:
+        entry = _index_cache.get(file_path)
+        if entry is not None and entry[0] == file_stamp:
+            _index_cache.move_to_end(file_path)
+            return entry[1]
+
+    index = JavaMethodIndex.from_file(file_path)
+    with _index_cache_lock:
+        _index_cache[file_path] = (file_stamp, index)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def _normalize(method_signature: str) -> str:
+    if method_signature in (_BYTECODE_STATIC_INITIALIZER_ID, _SOURCECODE_STATIC_INITIALIZER_ID):
+        return method_signature
+    method_signature = re.sub(r"[^ (]+\$", "", method_signature)
+    if method_signature.startswith("<init>"):
+        method_signature = _CONSTRUCTOR_ID + method_signature[6:]
+    return re.sub(r"<[^>]+>", "", method_signature)
+
+
+def _get_signature(name: str, parameters: List[_Parameter], type_parameters: List[str]) -> str:
+    return "{}({})".format(name, ", ".join(_get_parameter_type_name(parameter, type_parameters)
+                                           for parameter in parameters))
+
+
+def _get_parameter_type_name(parameter: _Parameter, type_parameters: List[str]) -> str:
+    # the same steps, including their quirks, as the MethodExtractor, to match the same methods
+    type_name = parameter.type_name
+    type_name = type_name[type_name.rfind(".") + 1:]
+    start_of_type_parameters = type_name.find("<")
+    end_of_type_parameters = type_name.rfind(">")
+    if start_of_type_parameters > -1 and end_of_type_parameters > -1:
+        type_name = type_name[:start_of_type_parameters] + type_name[end_of_type_parameters + 1:]
+    for type_parameter in type_parameters:
+        if type_name.startswith(type_parameter):
+            type_name = re.sub(type_parameter, "Object", type_name, count=1)
+    if parameter.is_var_args:
+        type_name += "[]"
+    return type_name
+
+
+def _is_same_signature(method_signature1: str, method_signature2: str, ignore_parameters: bool) -> bool:
+    if ignore_parameters:
+        end_of_name = method_signature1.find("(")
+        if end_of_name < 0 or end_of_name > len(method_signature2):
+            # the MethodExtractor fails on such signatures
+            raise ValueError("cannot compare names of {} and {}".format(method_signature1, method_signature2))
+        return method_signature1[:end_of_name] == method_signature2[:end_of_name]
+    return method_signature1 == method_signature2
+
+
+def _tokenize(code: str) -> Tuple[List[_Token], List[_Comment]]:
+    if "\\u" in code:
+        raise UnsupportedJavaSourceError("unicode escapes")
+
+    tokens = []
+    comments = []
+    line = 1
+    offset = 0
+    while offset < len(code):
+        match = _TOKEN_PATTERN.match(code, offset)
+        if match is None:
+            raise UnsupportedJavaSourceError("unexpected character {!r} in line {}".format(code[offset], line))
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "text_block":
+            raise UnsupportedJavaSourceError("text block in line {}".format(line))
+        if kind in ("line_comment", "block_comment"):
+            comments.append(_Comment(kind == "line_comment", line, line + text.count("\n"), offset))
+        elif kind != "space":
+            tokens.append(_Token(kind, text, line, offset))
+        line += text.count("\n")
+        offset = match.end()
+    return tokens, comments
+
+
+class _JavaSourceScanner:
+    """
+    Scans the tokens for declarations and emits events in the order in which the JavaParser visitor of the
+    MethodExtractor visits them, such that the index can replay its search for any method signature.
+    """
+
+    def __init__(self, tokens: List[_Token], comments: List[_Comment]):
+        self.tokens = tokens
+        self.comments = comments
+        self.comment_offsets = [comment.offset for comment in comments]
+        self.position = 0
+        self.events = []  # type: List[list]
+
+    def scan(self) -> List[list]:
+        self.__members("top")
+        return self.events
+
+    def __peek(self, lookahead: int = 0) -> Optional[_Token]:
+        position = self.position + lookahead
+        return self.tokens[position] if position < len(self.tokens) else None
+
+    def __peek_text(self, lookahead: int = 0) -> Optional[str]:
+        token = self.__peek(lookahead)
+        return token.text if token is not None else None
+
+    def __next(self) -> _Token:
+        token = self.__peek()
+        if token is None:
+            raise UnsupportedJavaSourceError("unexpected end of code")
+        self.position += 1
+        return token
+
+    def __expect(self, text: str) -> _Token:
+        token = self.__next()
+        if token.text != text:
+            raise UnsupportedJavaSourceError("expected '{}' in line {}, found '{}'".format(
+                text, token.line, token.text))
+        return token
+
+    def __is_keyword(self, lookahead: int, keyword: str) -> bool:
+        token = self.__peek(lookahead)
+        return token is not None and token.kind == "identifier" and token.text == keyword
+
+    def __is_identifier(self, lookahead: int) -> bool:
+        token = self.__peek(lookahead)
+        return token is not None and token.kind == "identifier"
+
+    def __members(self, kind: str):
+        if kind == "enum":
+            self.__enum_constants()
+        while True:
+            token = self.__peek()
+            if token is None:
+                if kind == "top":
+                    return
+                raise UnsupportedJavaSourceError("unbalanced braces")
+            if token.text == "}":
+                if kind == "top":
+                    raise UnsupportedJavaSourceError("unbalanced braces in line {}".format(token.line))
+                self.__next()
+                return
+            if token.text == ";":
+                self.__next()
+                continue
+            self.__member(kind)
+
+    def __member(self, kind: str):
+        first = self.position
+        header = []  # type: List[_Token]
+        parameters = None  # type: Optional[List[_Parameter]]
+        name = None  # type: Optional[_Token]
+        type_parameters = []  # type: List[str]
+        while True:
+            token = self.__peek()
+            if token is None:
+                raise UnsupportedJavaSourceError("unexpected end of code")
+            text = token.text
+            if text == "@" and self.__is_keyword(1, "interface"):
+                self.position += 2
+                self.__type_declaration("annotation", first)
+                return
+            elif text == "@":
+                self.__skip_annotation()
+            elif self.__is_type_declaration(header):
+                self.__next()
+                self.__type_declaration(text, first)
+                return
+            elif text == ";":
+                end = self.__next()
+                if parameters is not None and kind != "annotation":
+                    self.__callable(first, header, name, parameters, type_parameters, end)
+                return
+            elif text == "=" or (kind == "annotation" and text == "default"):
+                self.__next()
+                self.__code({";"})
+                return
+            elif text == "(":
+                if parameters is not None or not header or header[-1].kind != "identifier":
+                    raise UnsupportedJavaSourceError("unexpected '(' in line {}".format(token.line))
+                name = header[-1]
+                parameters = self.__parameters()
+            elif text == "{":
+                if parameters is not None and kind != "annotation":
+                    self.__callable(first, header, name, parameters, type_parameters, None)
+                elif [header_token.text for header_token in header] in ([], ["static"]):
+                    self.__initializer(first, bool(header))
+                else:
+                    raise UnsupportedJavaSourceError("unexpected '{{' in line {}".format(token.line))
+                return
+            elif text in ("}", ")"):
+                raise UnsupportedJavaSourceError("unexpected '{}' in line {}".format(text, token.line))
+            elif text == "<" and all(header_token.text in _MODIFIERS for header_token in header):
+                type_parameters = self.__type_parameters()
+            else:
+                header.append(self.__next())
+
+    def __is_type_declaration(self, header: List[_Token]) -> bool:
+        token = self.__peek()
+        if token.kind != "identifier" or (header and header[-1].text == "."):
+            return False
+        if token.text in ("class", "interface"):
+            return self.__is_identifier(1)
+        if token.text == "enum":
+            # `enum` may be an identifier in old code
+            return self.__is_identifier(1) and self.__peek_text(2) in ("{", "implements")
+        return False
+
+    def __type_declaration(self, keyword: str, first: int):
+        name = self.__next()
+        if name.kind != "identifier":
+            raise UnsupportedJavaSourceError("expected type name in line {}".format(name.line))
+        type_parameters = self.__type_parameters() if self.__peek_text() == "<" else []
+        while self.__peek_text() != "{":
+            if self.__peek_text() == "@":
+                self.__skip_annotation()
+            elif self.__peek_text() in (None, ";", "(", ")", "}"):
+                raise UnsupportedJavaSourceError("unexpected type declaration in line {}".format(name.line))
+            else:
+                self.__next()
+        self.__next()
+
+        if keyword in ("class", "interface"):
+            # the MethodExtractor tracks only classes and interfaces as the declaring types of methods
+            self.events.append(["type_start", name.text])
+            self.events.extend(["type_parameter", type_parameter] for type_parameter in type_parameters)
+            self.__members(keyword)
+            self.events.append(["type_end", name.text, self.tokens[first].line])
+        else:
+            self.__members(keyword)
+
+    def __enum_constants(self):
+        while True:
+            token = self.__peek()
+            if token is None or token.text == "}":
+                return
+            if token.text == ";":
+                self.__next()
+                return
+            if token.text == "@":
+                self.__skip_annotation()
+            elif token.text == ",":
+                self.__next()
+            elif token.kind == "identifier":
+                self.__next()
+                if self.__peek_text() == "(":
+                    self.__next()
+                    self.__code({")"})
+                if self.__peek_text() == "{":
+                    self.__next()
+                    self.__members("anonymous")
+            else:
+                raise UnsupportedJavaSourceError("unexpected enum constant in line {}".format(token.line))
+
+    def __callable(self, first: int, header: List[_Token], name: _Token, parameters: List[_Parameter],
+                   type_parameters: List[str], end: Optional[_Token]):
+        is_constructor = all(token.text in _MODIFIERS for token in header[:header.index(name)])
+        event = ["constructor" if is_constructor else "method", None, None]
+        self.events.append(event)
+        if end is None:
+            self.__expect("{")
+            end = self.__code({"}"})
+        # the JavaParser visits the type parameters of methods and constructors after their bodies
+        self.events.extend(["type_parameter", type_parameter] for type_parameter in type_parameters)
+        event[1] = _Declaration(name.text, parameters, self.__get_first_line(first), end.line)
+        if is_constructor:
+            event[2] = len(self.events)
+
+    def __initializer(self, first: int, is_static: bool):
+        event = ["initializer", None, is_static]
+        self.events.append(event)
+        self.__expect("{")
+        end = self.__code({"}"})
+        event[1] = _Declaration("static" if is_static else "", [], self.__get_first_line(first), end.line)
+
+    def __get_first_line(self, first: int) -> int:
+        # the JavaParser attributes to a declaration the comment right before it, unless there are lines between them or
+        # it is a line comment on the same line as the preceding code
+        declaration_start = self.tokens[first]
+        preceding_token = self.tokens[first - 1] if first > 0 else None
+        start = bisect_right(self.comment_offsets, preceding_token.offset) if preceding_token is not None else 0
+        end = bisect_right(self.comment_offsets, declaration_start.offset)
+        attributed_comment = None
+        for comment in self.comments[start:end]:
+            if comment.is_line_comment and preceding_token is not None and comment.begin_line == preceding_token.line:
+                attributed_comment = None
+            else:
+                attributed_comment = comment
+        if attributed_comment is not None and declaration_start.line <= attributed_comment.end_line + 1:
+            return attributed_comment.begin_line
+        return declaration_start.line
+
+    def __parameters(self) -> List[_Parameter]:
+        self.__expect("(")
+        parameters = []
+        parameter_tokens = []  # type: List[_Token]
+        depth = 0
+        while True:
+            token = self.__peek()
+            if token is None:
+                raise UnsupportedJavaSourceError("unexpected end of code")
+            if token.text == "@":
+                self.__skip_annotation()
+                continue
+            self.__next()
+            if token.text in ("<", "("):
+                depth += 1
+            elif token.text == ">":
+                depth -= 1
+            elif token.text == ")" and depth > 0:
+                depth -= 1
+            elif token.text == ")" or (token.text == "," and depth == 0):
+                if parameter_tokens:
+                    parameters.append(self.__parameter(parameter_tokens))
+                elif token.text == ",":
+                    raise UnsupportedJavaSourceError("empty parameter in line {}".format(token.line))
+                parameter_tokens = []
+                if token.text == ")":
+                    return parameters
+                continue
+            parameter_tokens.append(token)
+
+    @staticmethod
+    def __parameter(tokens: List[_Token]) -> _Parameter:
+        tokens = [token for token in tokens if token.text != "final"]
+        dimensions = 0
+        while len(tokens) > 2 and tokens[-1].text == "]" and tokens[-2].text == "[":
+            dimensions += 1
+            tokens = tokens[:-2]
+        if len(tokens) < 2 or tokens[-1].kind != "identifier" or tokens[-1].text == "this":
+            raise UnsupportedJavaSourceError("unexpected parameter in line {}".format(tokens[0].line))
+        is_var_args = tokens[-2].text == "..."
+        type_tokens = tokens[:-2] if is_var_args else tokens[:-1]
+        if not type_tokens:
+            raise UnsupportedJavaSourceError("unexpected parameter in line {}".format(tokens[0].line))
+        return _Parameter(_to_type_name(type_tokens) + "[]" * dimensions, is_var_args)
+
+    def __type_parameters(self) -> List[str]:
+        self.__expect("<")
+        names = []
+        depth = 1
+        expects_name = True
+        while depth > 0:
+            if self.__peek_text() == "@":
+                self.__skip_annotation()
+                continue
+            token = self.__next()
+            if token.text == "<":
+                depth += 1
+            elif token.text == ">":
+                depth -= 1
+            elif token.text == "," and depth == 1:
+                expects_name = True
+            elif token.kind == "identifier" and expects_name and depth == 1:
+                names.append(token.text)
+                expects_name = False
+            elif token.text in ("(", ")", "{", "}", ";"):
+                raise UnsupportedJavaSourceError("unexpected type parameters in line {}".format(token.line))
+        return names
+
+    def __skip_annotation(self):
+        self.__expect("@")
+        self.__next()
+        while self.__peek_text() == "." and self.__is_identifier(1):
+            self.position += 2
+        if self.__peek_text() == "(":
+            self.__next()
+            self.__code({")"})
+
+    def __code(self, terminators: set) -> _Token:
+        """Skips code up to and including the next of the terminators on the same nesting level."""
+        while True:
+            token = self.__peek()
+            if token is None:
+                raise UnsupportedJavaSourceError("unbalanced braces")
+            text = token.text
+            if text in terminators:
+                return self.__next()
+            elif text in ("}", ")", "]"):
+                raise UnsupportedJavaSourceError("unexpected '{}' in line {}".format(text, token.line))
+            elif text in ("{", "(", "["):
+                self.__next()
+                self.__code({{"{": "}", "(": ")", "[": "]"}[text]})
+            elif token.kind != "identifier":
+                self.__next()
+            elif text == "new":
+                self.__instance_creation()
+            elif text == "class" and self.__is_local_type_declaration():
+                first = self.position
+                while first > 0 and self.tokens[first - 1].text in _MODIFIERS:
+                    first -= 1
+                self.__next()
+                self.__type_declaration("class", first)
+            elif text in ("interface", "enum", "record") and self.__is_local_type_declaration() \
+                    and self.__peek_text(2) in ("{", "(", "<", "extends", "implements"):
+                raise UnsupportedJavaSourceError("local {} in line {}".format(text, token.line))
+            else:
+                self.__next()
+
+    def __is_local_type_declaration(self) -> bool:
+        return self.__is_identifier(1) and (self.position == 0 or self.tokens[self.position - 1].text != ".")
+
+    def __instance_creation(self):
+        self.__expect("new")
+        start = len(self.events)
+        while True:
+            text = self.__peek_text()
+            if text == "@":
+                self.__skip_annotation()
+            elif text == "<":
+                self.__skip_type_arguments()
+            elif text == "." or self.__is_identifier(0):
+                self.__next()
+            else:
+                break
+
+        if self.__peek_text() == "[":
+            while self.__peek_text() == "[":
+                self.__next()
+                self.__code({"]"})
+            if self.__peek_text() == "{":
+                self.__next()
+                self.__code({"}"})
+        elif self.__peek_text() == "(":
+            self.__next()
+            self.__code({")"})
+            if self.__peek_text() == "{":
+                # the JavaParser visits the body of an anonymous class before the arguments of its creation
+                argument_events = self.events[start:]
+                del self.events[start:]
+                self.__next()
+                self.__members("anonymous")
+                self.events.extend(argument_events)
+        else:
+            token = self.__peek()
+            raise UnsupportedJavaSourceError("unexpected instance creation in line {}".format(
+                token.line if token is not None else "?"))
+
+    def __skip_type_arguments(self):
+        self.__expect("<")
+        depth = 1
+        while depth > 0:
+            token = self.__next()
+            if token.text == "<":
+                depth += 1
+            elif token.text == ">":
+                depth -= 1
+            elif token.text in ("(", ")", "{", "}", ";"):
+                raise UnsupportedJavaSourceError("unexpected type arguments in line {}".format(token.line))
+
+
+def _to_type_name(tokens: List[_Token]) -> str:
+    # the type name as the JavaParser prints it
+    type_name = ""
+    for token in tokens:
+        if token.text == ",":
+            type_name += ", "
+        elif token.text in ("extends", "super", "&"):
+            type_name += " {} ".format(token.text)
+        elif token.text == "@" or (token.kind != "identifier" and token.text not in ("<", ">", ".", "[", "]", "?")):
+            raise UnsupportedJavaSourceError("unexpected type in line {}".format(token.line))
+        else:
+            type_name += token.text
+    return type_name
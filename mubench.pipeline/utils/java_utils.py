@@ -1,9 +1,14 @@
+import atexit
+import logging
+import os
 from os import remove
 from os.path import dirname, join, exists
-from typing import Optional
+from subprocess import Popen, PIPE, DEVNULL
+from threading import Lock, Condition
+from typing import Optional, List, Callable
 from urllib.error import URLError
 
-from utils.shell import Shell
+from utils.shell import Shell, CommandFailedError
 from utils.web_util import is_valid_file, download_file
 
 __UTILS_VERSION = "0.0.4"
@@ -11,9 +16,15 @@ __UTILS_JAR_NAME = "mubench.utils-{}-jar-with-dependencies.jar".format(__UTILS_V
 __UTILS_JAR_URL = "http://www.st.informatik.tu-darmstadt.de/artifacts/mubench/mvn/" \
                   "de/tu-darmstadt/stg/mubench/mubench.utils/{}/{}".format(__UTILS_VERSION, __UTILS_JAR_NAME)
 __UTILS_JAR_MD5 = "846a8f841c86d6634da1499cc2144983"
+__UTILS_PACKAGE = "de.tu_darmstadt.stg.mubench.utils"
 
 
 def exec_util(main: str, args: str = "", timeout: Optional[int] = None):
+    return Shell.exec("java -cp \"{}\" {}.{} {}".format(_get_utils_jar_path(), __UTILS_PACKAGE, main, args),
+                      timeout=timeout)
+
+
+def _get_utils_jar_path() -> str:
     base_path = dirname(__file__)
     utils_jar_path = join(base_path, __UTILS_JAR_NAME)
 
@@ -26,5 +37,182 @@ def exec_util(main: str, args: str = "", timeout: Optional[int] = None):
         except (URLError, ValueError, FileNotFoundError) as e:
             raise ValueError("utils unavailable: {}".format(e))
 
-    return Shell.exec("java -cp \"{}\" de.tu_darmstadt.stg.mubench.utils.{} {}".format(utils_jar_path, main, args),
-                      timeout=timeout)
+    return utils_jar_path
+
+
+def _get_method_extractor_server_command() -> List[str]:
+    return ["java", "-cp", _get_utils_jar_path(), "{}.MethodExtractorServer".format(__UTILS_PACKAGE)]
+
+
+class MethodExtractorServer:
+    """
+    Runs the MethodExtractor of the utils in a single JVM, which it starts on the first extraction and restarts if it
+    crashes, such that extractions do not pay for starting a JVM each. If the utils do not provide the server, it
+    falls back to running the MethodExtractor once per extraction. A server runs one extraction at a time, the
+    `MethodExtractorServerPool` runs several servers for parallel extractions.
+    """
+
+    READY = "READY"
+    END = "END"
+
+    def __init__(self, command=_get_method_extractor_server_command):
+        self.__command = command
+        self.__process = None  # type: Optional[Popen]
+        self.__process_owner = None  # type: Optional[int]
+        self.__is_available = True
+        self.__lock = Lock()
+
+    def extract(self, file: str, method: str) -> str:
+        return self.extract_all(file, [method])[0]
+
+    def extract_all(self, file: str, methods: List[str]) -> List[str]:
+        """Extracts several methods from the same file, parsing the file only once."""
+        with self.__lock:
+            if self.__is_available and self.__ensure_started():
+                try:
+                    return self.__request(file, methods)
+                except (OSError, EOFError):
+                    # the server crashed, retry once with a new server, in case the crash was not due to this request
+                    self.__stop()
+                    if self.__ensure_started():
+                        try:
+                            return self.__request(file, methods)
+                        except (OSError, EOFError) as e:
+                            self.__stop()
+                            raise ValueError("method extractor crashed: {}".format(e))
+
+        try:
+            return [exec_util("MethodExtractor", "\"{}\" \"{}\"".format(file, method)) for method in methods]
+        except CommandFailedError as e:
+            # the MethodExtractor fails, e.g., if the file does not exist, like the server reports an error
+            raise ValueError(str(e))
+
+    def __ensure_started(self) -> bool:
+        # a forked process must not talk to its parent's server
+        if self.__process is not None and self.__process_owner == os.getpid() and self.__process.poll() is None:
+            return True
+
+        self.__process = None
+        command = self.__command()
+        logging.getLogger("utils.method_extractor").debug("Start method extractor: %s", command)
+        try:
+            process = Popen(command, stdin=PIPE, stdout=PIPE, stderr=DEVNULL, encoding="utf-8")
+        except OSError as e:
+            logging.getLogger("utils.method_extractor").debug("Method extractor server unavailable: %s", e)
+            self.__is_available = False
+            return False
+
+        if process.stdout.readline().rstrip("\n") != MethodExtractorServer.READY:
+            logging.getLogger("utils.method_extractor").debug("Method extractor server unavailable.")
+            process.kill()
+            process.wait()
+            self.__is_available = False
+            return False
+
+        self.__process = process
+        self.__process_owner = os.getpid()
+        return True
+
+    def __request(self, file: str, methods: List[str]) -> List[str]:
+        self.__process.stdin.write("\t".join([file] + methods) + "\n")
+        self.__process.stdin.flush()
+
+        # read the entire answer up to its end, even after an error, such that the next request reads its own answer
+        outputs = []
+        error = None
+        for line in iter(self.__readline, MethodExtractorServer.END):
+            status, _, detail = line.partition(" ")
+            if status == "ERROR":
+                error = detail
+            elif status == "OK":
+                outputs.append("\n".join(self.__readline() for _ in range(int(detail))))
+            else:
+                raise EOFError("unexpected response: {}".format(line))
+
+        if error is not None:
+            raise ValueError(error)
+        if len(outputs) != len(methods):
+            raise EOFError("expected {} outputs, got {}".format(len(methods), len(outputs)))
+        return outputs
+
+    def __readline(self) -> str:
+        line = self.__process.stdout.readline()
+        if not line:
+            raise EOFError("method extractor terminated")
+        return line.rstrip("\n")
+
+    def stop(self):
+        with self.__lock:
+            self.__stop()
+
+    def __stop(self):
+        process = self.__process
+        self.__process = None
+        if process is not None and self.__process_owner == os.getpid():
+            try:
+                process.stdin.close()
+                process.wait(timeout=10)
+            except Exception:
+                process.kill()
+
+
+class MethodExtractorServerPool:
+    """
+    Hands each extraction to an idle server, such that parallel extractions do not wait for each other. It starts
+    servers only when all others are busy, up to `size` servers, each in its own JVM.
+    """
+
+    def __init__(self, size: int = os.cpu_count() or 1,
+                 create_server: Callable[[], MethodExtractorServer] = MethodExtractorServer):
+        self.size = size
+        self.__create_server = create_server
+        self.__servers = []  # type: List[MethodExtractorServer]
+        self.__idle_servers = []  # type: List[MethodExtractorServer]
+        self.__condition = Condition()
+
+    def extract(self, file: str, method: str) -> str:
+        return self.extract_all(file, [method])[0]
+
+    def extract_all(self, file: str, methods: List[str]) -> List[str]:
+        server = self.__acquire()
+        try:
+            return server.extract_all(file, methods)
+        finally:
+            self.__release(server)
+
+    def __acquire(self) -> MethodExtractorServer:
+        with self.__condition:
+            while not self.__idle_servers and len(self.__servers) >= self.size:
+                self.__condition.wait()
+            if self.__idle_servers:
+                return self.__idle_servers.pop()
+            server = self.__create_server()
+            self.__servers.append(server)
+            return server
+
+    def __release(self, server: MethodExtractorServer):
+        with self.__condition:
+            self.__idle_servers.append(server)
+            self.__condition.notify()
+
+    def stop(self):
+        with self.__condition:
+            servers = list(self.__servers)
+        for server in servers:
+            server.stop()
+
+
+method_extractor = MethodExtractorServerPool()
+atexit.register(method_extractor.stop)
+
+
+def get_method_extractor_version() -> str:
+    return __UTILS_VERSION
+
+
+def extract_methods(file: str, method: str) -> str:
+    return method_extractor.extract(file, method)
+
+
+def extract_all_methods(file: str, methods: List[str]) -> List[str]:
+    return method_extractor.extract_all(file, methods)
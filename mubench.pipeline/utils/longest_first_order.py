@@ -0,0 +1,64 @@
+from os.path import getsize, exists
+from statistics import median
+from typing import List, Optional
+
+from data.misuse import Misuse
+from data.project import Project
+from data.project_version import ProjectVersion
+from data.runtime_history import RuntimeHistory
+
+
+class LongestFirstOrder:
+    """
+    Orders projects, versions, and misuses by descending expected detector runtime, such that the longest runs start
+    first and do not dominate the end of parallel runs. The expected runtime of a version is the runtime recorded by
+    previous runs. Without such a record, it is estimated from the size of the version's compiled classes, at the
+    median runtime per byte of the versions with a record. Projects are ordered by their longest version.
+    """
+
+    def __init__(self, runtime_history: RuntimeHistory, compiles_path: str):
+        self.runtime_history = runtime_history
+        self.compiles_path = compiles_path
+        self.__runtime_per_byte = None  # type: Optional[float]
+
+    def sort_projects(self, projects: List[Project]) -> List[Project]:
+        self.__ensure_runtime_per_byte([version for project in projects for version in project.versions])
+        return sorted(projects, key=lambda project: -max([self.get_expected_version_runtime(version)
+                                                          for version in project.versions], default=0))
+
+    def sort_versions(self, versions: List[ProjectVersion]) -> List[ProjectVersion]:
+        self.__ensure_runtime_per_byte(versions)
+        return sorted(versions, key=lambda version: -self.get_expected_version_runtime(version))
+
+    def sort_misuses(self, misuses: List[Misuse]) -> List[Misuse]:
+        runtimes = {misuse.id: self.runtime_history.get_misuse_runtime(misuse.id) for misuse in misuses}
+        recorded_runtimes = [runtime for runtime in runtimes.values() if runtime is not None]
+        default_runtime = median(recorded_runtimes) if recorded_runtimes else 0
+        return sorted(misuses, key=lambda misuse: -(default_runtime if runtimes[misuse.id] is None
+                                                    else runtimes[misuse.id]))
+
+    def get_expected_version_runtime(self, version: ProjectVersion) -> float:
+        runtime = self.runtime_history.get_version_runtime(version.id)
+        if runtime is not None:
+            return runtime
+
+        classes_size = self.__get_classes_size(version)
+        if classes_size is not None and self.__runtime_per_byte:
+            return classes_size * self.__runtime_per_byte
+        return 0
+
+    def __ensure_runtime_per_byte(self, versions: List[ProjectVersion]):
+        if self.__runtime_per_byte is not None:
+            return
+
+        runtimes_per_byte = []
+        for version in versions:
+            runtime = self.runtime_history.get_version_runtime(version.id)
+            classes_size = self.__get_classes_size(version)
+            if runtime is not None and classes_size:
+                runtimes_per_byte.append(runtime / classes_size)
+        self.__runtime_per_byte = median(runtimes_per_byte) if runtimes_per_byte else 0
+
+    def __get_classes_size(self, version: ProjectVersion) -> Optional[int]:
+        classpath = version.get_compile(self.compiles_path).original_classpath
+        return getsize(classpath) if exists(classpath) else None
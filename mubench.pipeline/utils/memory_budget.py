@@ -0,0 +1,94 @@
+import os
+import re
+from heapq import heappush, heappop
+from itertools import count
+from multiprocessing.managers import BaseManager
+from threading import Condition
+from typing import List, Optional
+
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+_SIZE_PATTERN = re.compile(r"^(\d+)([kmgt]?)b?$", re.IGNORECASE)
+_MAX_HEAP_SIZE_PATTERN = re.compile(r"^-?(?:Xmx|XX:MaxHeapSize=)(.+)$")
+
+
+def parse_memory_size(size: str) -> int:
+    match = _SIZE_PATTERN.match(size.strip())
+    if not match:
+        raise ValueError("invalid memory size: {}".format(size))
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).lower()]
+
+
+def get_max_heap_size(java_options: List[str]) -> int:
+    max_heap_size = None
+    for option in java_options:
+        match = _MAX_HEAP_SIZE_PATTERN.match(option)
+        if match:
+            # like the JVM, the last occurrence wins
+            max_heap_size = parse_memory_size(match.group(1))
+
+    if max_heap_size is None:
+        # the JVM's default maximum heap size is a quarter of the physical memory
+        max_heap_size = get_physical_memory() // 4
+    return max_heap_size
+
+
+def get_physical_memory() -> int:
+    return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+
+class MemoryBudget:
+    """
+    Admits memory reservations while their sum stays within the budget. Waiting reservations are admitted in order of
+    descending priority, e.g., the expected runtime of a detector run, such that long runs start early. A reservation
+    that exceeds the entire budget is admitted once no other reservation is active.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.__reserved = 0
+        self.__waiting = []
+        self.__sequence = count()
+        self.__condition = Condition()
+
+    def acquire(self, size: int, priority: float = 0) -> None:
+        size = min(size, self.total)
+        with self.__condition:
+            ticket = (-priority, next(self.__sequence))
+            heappush(self.__waiting, ticket)
+            while self.__waiting[0] != ticket or self.__reserved + size > self.total:
+                self.__condition.wait()
+            heappop(self.__waiting)
+            self.__reserved += size
+            self.__condition.notify_all()
+
+    def release(self, size: int) -> None:
+        size = min(size, self.total)
+        with self.__condition:
+            self.__reserved -= size
+            self.__condition.notify_all()
+
+    def get_reserved(self) -> int:
+        with self.__condition:
+            return self.__reserved
+
+
+class _MemoryBudgetManager(BaseManager):
+    pass
+
+
+_MemoryBudgetManager.register('MemoryBudget', MemoryBudget)
+
+
+def create_memory_budget(total: Optional[int], shared: bool = False) -> Optional[MemoryBudget]:
+    """
+    Creates a memory budget of the given size in bytes, or `None`, if there is no budget. A shared budget lives in a
+    separate process, such that it may be used across the worker processes of a parallel run.
+    """
+    if total is None:
+        return None
+    if not shared:
+        return MemoryBudget(total)
+
+    manager = _MemoryBudgetManager()
+    manager.start()
+    return manager.MemoryBudget(total)
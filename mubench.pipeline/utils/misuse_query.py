@@ -0,0 +1,145 @@
+import re
+from os import listdir
+from os.path import exists, join
+from typing import Dict, Iterable, List, Set
+
+from data.entity_registry import get_entity
+from data.misuse import Misuse
+from data.project import Project
+
+
+class MisuseIndex:
+    """
+    Inverted indexes from the APIs, violations, sources, and properties of misuses to the ids of the misuses, such that
+    queries select misuses by set operations instead of checking each misuse.
+    """
+
+    ATTRIBUTES = ["api", "violation", "source"]
+    FLAGS = ["crash", "internal", "correct-usages"]
+
+    def __init__(self, misuses: Iterable[Misuse]):
+        self.ids = set()  # type: Set[str]
+        self.__values = {attribute: {} for attribute in MisuseIndex.ATTRIBUTES}  # type: Dict[str, Dict[str, Set[str]]]
+        self.__flags = {flag: set() for flag in MisuseIndex.FLAGS}  # type: Dict[str, Set[str]]
+        for misuse in misuses:
+            self.__add(misuse)
+
+    def __add(self, misuse: Misuse):
+        self.ids.add(misuse.id)
+        for api in misuse.apis or []:
+            self.__add_value("api", api, misuse)
+        for violation in misuse.violations or []:
+            self.__add_value("violation", violation, misuse)
+        if misuse.source:
+            self.__add_value("source", misuse.source, misuse)
+        if MisuseIndex.__is_crash(misuse):
+            self.__flags["crash"].add(misuse.id)
+        if misuse.is_apis_are_internal:
+            self.__flags["internal"].add(misuse.id)
+        if misuse.correct_usages:
+            self.__flags["correct-usages"].add(misuse.id)
+
+    @staticmethod
+    def __is_crash(misuse: Misuse) -> bool:
+        try:
+            return bool(misuse.is_crash)
+        except KeyError:
+            return False
+
+    def __add_value(self, attribute: str, value: str, misuse: Misuse):
+        self.__values[attribute].setdefault(str(value).lower(), set()).add(misuse.id)
+
+    def get_ids_with_value(self, attribute: str, value: str) -> Set[str]:
+        return self.__values[attribute].get(value.lower(), set())
+
+    def get_ids_with_flag(self, flag: str) -> Set[str]:
+        return self.__flags[flag]
+
+    @staticmethod
+    def from_dataset(data_path: str) -> 'MisuseIndex':
+        project_ids = sorted(listdir(data_path)) if exists(data_path) else []
+        projects = [get_entity(Project, data_path, project_id) for project_id in project_ids
+                    if Project.is_project(join(data_path, project_id))]
+        return MisuseIndex(misuse for project in projects for version in project.versions
+                           for misuse in version.misuses)
+
+
+class MisuseQuery:
+    """
+    A filter expression over misuses, such as `api=java.util.Iterator and crash and not correct-usages`. It combines the
+    conditions `api=<name>`, `violation=<name>`, `source=<name>`, `crash`, `internal`, and `correct-usages` with `and`,
+    `or`, `not`, and parentheses. Values compare case insensitively.
+    """
+
+    __TOKEN = re.compile(r"\(|\)|[^\s()]+")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.__tokens = MisuseQuery.__TOKEN.findall(expression)
+        self.__position = 0
+        self.__query = self.__parse_or()
+        if self.__position < len(self.__tokens):
+            raise ValueError("unexpected '{}' in query: {}".format(self.__tokens[self.__position], expression))
+
+    def select(self, index: MisuseIndex) -> Set[str]:
+        return set(self.__query(index))
+
+    def __parse_or(self):
+        operands = [self.__parse_and()]
+        while self.__accept("or"):
+            operands.append(self.__parse_and())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda index: set().union(*[operand(index) for operand in operands])
+
+    def __parse_and(self):
+        operands = [self.__parse_not()]
+        while self.__accept("and"):
+            operands.append(self.__parse_not())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda index: set.intersection(*[operand(index) for operand in operands])
+
+    def __parse_not(self):
+        if self.__accept("not"):
+            operand = self.__parse_not()
+            return lambda index: index.ids - operand(index)
+        if self.__accept("("):
+            query = self.__parse_or()
+            if not self.__accept(")"):
+                raise ValueError("missing ')' in query: {}".format(self.expression))
+            return query
+        return self.__parse_condition()
+
+    def __parse_condition(self):
+        token = self.__next()
+        attribute, separator, value = token.partition("=")
+        if separator:
+            if attribute not in MisuseIndex.ATTRIBUTES or not value:
+                raise ValueError("invalid condition '{}', must be one of {} followed by =<value>".format(
+                    token, ", ".join(MisuseIndex.ATTRIBUTES)))
+            return lambda index: index.get_ids_with_value(attribute, value)
+        if token not in MisuseIndex.FLAGS:
+            raise ValueError("invalid condition '{}', must be one of {}, or <attribute>=<value>".format(
+                token, ", ".join(MisuseIndex.FLAGS)))
+        return lambda index: index.get_ids_with_flag(token)
+
+    def __accept(self, token: str) -> bool:
+        if self.__position < len(self.__tokens) and self.__tokens[self.__position].lower() == token:
+            self.__position += 1
+            return True
+        return False
+
+    def __next(self) -> str:
+        if self.__position >= len(self.__tokens):
+            raise ValueError("incomplete query: {}".format(self.expression))
+        token = self.__tokens[self.__position]
+        self.__position += 1
+        return token
+
+    def __str__(self):
+        return self.expression
+
+
+def select_misuse_ids(query: MisuseQuery, data_path: str) -> List[str]:
+    return sorted(query.select(MisuseIndex.from_dataset(data_path)))
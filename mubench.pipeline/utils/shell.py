@@ -1,10 +1,18 @@
 import locale
 import logging
 import os
+import sys
+from contextlib import contextmanager
 from platform import platform
-from subprocess import PIPE, CalledProcessError, run, TimeoutExpired
+from subprocess import PIPE, CalledProcessError, Popen, TimeoutExpired
+from threading import local
 from typing import Optional
 
+try:
+    import resource
+except ImportError:
+    resource = None
+
 
 class Shell:
     @staticmethod
@@ -32,10 +40,20 @@ class Shell:
 
     @staticmethod
     def __exec(command, cwd, timeout, encoding):
-        cmd = run(command, cwd=cwd, stdout=PIPE, stderr=PIPE, shell=True, check=True, timeout=timeout)
+        with _Process(command, cwd=cwd, stdout=PIPE, stderr=PIPE, shell=True) as process:
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+            except TimeoutExpired:
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                _add_child_usage(process.rusage)
+            if process.returncode:
+                raise CalledProcessError(process.returncode, process.args, stdout, stderr)
         try:
-            stdout = cmd.stdout.decode(encoding)
-            stderr = cmd.stderr.decode(encoding)
+            stdout = stdout.decode(encoding)
+            stderr = stderr.decode(encoding)
         except MemoryError:
             return "Too much output to process..."
         else:
@@ -52,6 +70,78 @@ class Shell:
             return False
 
 
+class ChildUsage:
+    """
+    CPU time (in seconds) and largest peak resident set size (in bytes) of the child processes that a thread executed.
+    """
+
+    def __init__(self):
+        self.cpu_time = 0.0
+        self.peak_rss = 0
+
+    def add(self, cpu_time: float, peak_rss: int):
+        self.cpu_time += cpu_time
+        self.peak_rss = max(self.peak_rss, peak_rss)
+
+
+_child_usage = local()
+
+
+@contextmanager
+def record_child_usage():
+    """
+    Records the resource usage of all commands that the current thread executes through the `Shell` in the context.
+    """
+    usage = ChildUsage()
+    outer_usage = getattr(_child_usage, "current", None)
+    _child_usage.current = usage
+    try:
+        yield usage
+    finally:
+        _child_usage.current = outer_usage
+        if outer_usage:
+            outer_usage.add(usage.cpu_time, usage.peak_rss)
+
+
+def get_process_peak_rss() -> Optional[int]:
+    """The largest resident set size (in bytes) of the current process so far, or None, if the platform lacks it."""
+    if resource is None:
+        return None
+    return _get_peak_rss(resource.getrusage(resource.RUSAGE_SELF))
+
+
+def _add_child_usage(rusage):
+    usage = getattr(_child_usage, "current", None)
+    if usage and rusage:
+        usage.add(rusage.ru_utime + rusage.ru_stime, _get_peak_rss(rusage))
+
+
+def _get_peak_rss(rusage) -> int:
+    # macOS reports bytes, other platforms report kilobytes
+    return rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
+
+
+# `_Process` overrides a private method of `Popen`, which might change between Python versions
+_CAN_RECORD_CHILD_USAGE = hasattr(os, "wait4") and callable(getattr(Popen, "_try_wait", None))
+
+
+class _Process(Popen):
+    # Reaps the process with `wait4`, instead of `waitpid`, to obtain the resource usage of exactly this process, which
+    # `getrusage(RUSAGE_CHILDREN)` cannot separate from that of the processes of concurrent tasks.
+    rusage = None
+
+    def _try_wait(self, wait_flags):
+        if not _CAN_RECORD_CHILD_USAGE:
+            return super()._try_wait(wait_flags)
+        try:
+            pid, status, rusage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            return self.pid, 0
+        if pid:
+            self.rusage = rusage
+        return pid, status
+
+
 class CommandFailedError(Exception):
     def __init__(self, command: str, output: str, error: str = ""):
         self.command = command
@@ -0,0 +1,41 @@
+import sqlite3
+import time
+from contextlib import closing
+
+from utils.io import create_file_path
+
+
+class WorkQueue:
+    """
+    A queue of work items shared by several machines via a SQLite database on a shared file system. Each item is
+    processed by the first node that claims it.
+    """
+
+    def __init__(self, database_path: str, node: str):
+        self.database_path = database_path
+        self.node = node
+        create_file_path(database_path)
+        with closing(self.__connect()) as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS claims "
+                               "(item TEXT PRIMARY KEY, node TEXT NOT NULL, timestamp INTEGER NOT NULL)")
+            connection.execute("CREATE TABLE IF NOT EXISTS shared_values (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def claim(self, item: str) -> bool:
+        with closing(self.__connect()) as connection, connection:
+            cursor = connection.execute("INSERT OR IGNORE INTO claims (item, node, timestamp) VALUES (?, ?, ?)",
+                                        (item, self.node, int(time.time())))
+            if cursor.rowcount == 1:
+                return True
+            # a node may resume its own claims, e.g., after it was interrupted
+            owner = connection.execute("SELECT node FROM claims WHERE item = ?", (item,)).fetchone()
+            return owner is not None and owner[0] == self.node
+
+    def share(self, key: str, value: str) -> str:
+        """Stores the value, unless a node stored a value for the key before, and returns the stored value."""
+        with closing(self.__connect()) as connection, connection:
+            connection.execute("INSERT OR IGNORE INTO shared_values (key, value) VALUES (?, ?)", (key, value))
+            return connection.execute("SELECT value FROM shared_values WHERE key = ?", (key,)).fetchone()[0]
+
+    def __connect(self):
+        # connections are short-lived, since they must not be shared with forked worker processes
+        return sqlite3.connect(self.database_path, timeout=60)
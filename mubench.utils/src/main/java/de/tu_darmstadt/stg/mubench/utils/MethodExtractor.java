@@ -8,6 +8,7 @@ import com.google.common.base.Joiner;
 
 import java.io.*;
 import java.util.ArrayList;
+import java.util.Collections;
 import java.util.List;
 
 import static com.github.javaparser.ParseStart.COMPILATION_UNIT;
@@ -22,15 +23,25 @@ public class MethodExtractor {
 	}
 
 	public String extract(InputStream codeStream, String methodSignature) throws IOException {
+		return extract(codeStream, Collections.singletonList(methodSignature)).get(0);
+	}
+
+	/**
+	 * Extracts several methods from the same code, parsing it only once.
+	 */
+	public List<String> extract(InputStream codeStream, List<String> methodSignatures) throws IOException {
 		List<String> codeLines = readLines(codeStream);
-		List<MethodCodeFragment> methods = findMethods(methodSignature, codeLines);
-		
-		List<String> output = new ArrayList<>();
-		for (MethodCodeFragment fragment : methods) {
-			output.add(fragment.asString(codeLines));
+		CompilationUnit cu = parse(codeLines);
+
+		List<String> outputs = new ArrayList<>();
+		for (String methodSignature : methodSignatures) {
+			List<String> output = new ArrayList<>();
+			for (MethodCodeFragment fragment : findMethods(methodSignature, cu)) {
+				output.add(fragment.asString(codeLines));
+			}
+			outputs.add(Joiner.on("\n===\n").join(output));
 		}
-		
-		return Joiner.on("\n===\n").join(output);
+		return outputs;
 	}
 
 	private List<String> readLines(InputStream codeStream) throws IOException {
@@ -43,11 +54,14 @@ public class MethodExtractor {
 		return lines;
 	}
 
-	private List<MethodCodeFragment> findMethods(String methodSignature, List<String> codeLines) {
-		List<MethodCodeFragment> methods = new ArrayList<>();
+	private CompilationUnit parse(List<String> codeLines) {
 		JavaParser javaParser = new JavaParser(new ParserConfiguration().setLanguageLevel(ParserConfiguration.LanguageLevel.RAW));
 		ParseResult<CompilationUnit> parseResult = javaParser.parse(COMPILATION_UNIT, provider(toStream(codeLines)));
-		CompilationUnit cu = parseResult.getResult().get();
+		return parseResult.getResult().get();
+	}
+
+	private List<MethodCodeFragment> findMethods(String methodSignature, CompilationUnit cu) {
+		List<MethodCodeFragment> methods = new ArrayList<>();
 		new MethodRetriever(methodSignature, false).visit(cu, methods);
 		if (methods.isEmpty())
 			new MethodRetriever(methodSignature, true).visit(cu, methods);
@@ -0,0 +1,61 @@
+package de.tu_darmstadt.stg.mubench.utils;
+
+import java.io.*;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+import java.util.List;
+
+/**
+ * Runs the {@link MethodExtractor} on requests from stdin, such that many extractions share one JVM.
+ *
+ * The server writes <code>READY</code>, when it accepts requests. Each request is a line
+ * <code>&lt;file&gt;\t&lt;method signature&gt;[\t&lt;method signature&gt;...]</code>. The server parses the file once
+ * and answers with a line <code>OK &lt;n&gt;</code> followed by the n lines of the output of the
+ * {@link MethodExtractor} for each requested method, or with a line <code>ERROR &lt;message&gt;</code>. It ends every
+ * answer with a line <code>END</code>, such that clients stay in sync, whatever the answer. It terminates, when stdin
+ * closes.
+ */
+public class MethodExtractorServer {
+	public static void main(String[] args) throws IOException {
+		BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+		PrintStream out = new PrintStream(new FileOutputStream(FileDescriptor.out), false, "UTF-8");
+		// keep the protocol clean of any output of the parser
+		System.setOut(System.err);
+		new MethodExtractorServer().serve(in, out);
+	}
+
+	public void serve(BufferedReader in, PrintStream out) throws IOException {
+		out.print("READY\n");
+		out.flush();
+		for (String request; (request = in.readLine()) != null;) {
+			out.print(handle(request));
+			out.flush();
+		}
+	}
+
+	String handle(String request) {
+		return answer(request) + "END\n";
+	}
+
+	private String answer(String request) {
+		String[] arguments = request.split("\t");
+		if (arguments.length < 2) {
+			return "ERROR invalid request: " + request + "\n";
+		}
+
+		List<String> methodSignatures = Arrays.asList(arguments).subList(1, arguments.length);
+		try (InputStream codeStream = new FileInputStream(arguments[0])) {
+			StringBuilder response = new StringBuilder();
+			for (String output : new MethodExtractor().extract(codeStream, methodSignatures)) {
+				String[] lines = output.isEmpty() ? new String[0] : output.split("\n", -1);
+				response.append("OK ").append(lines.length).append("\n");
+				for (String line : lines) {
+					response.append(line).append("\n");
+				}
+			}
+			return response.toString();
+		} catch (Throwable e) {
+			return "ERROR " + String.valueOf(e).replace("\n", " ") + "\n";
+		}
+	}
+}
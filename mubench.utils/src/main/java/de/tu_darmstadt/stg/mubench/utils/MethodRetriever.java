@@ -67,7 +67,8 @@ class MethodRetriever extends VoidVisitorAdapter<List<MethodExtractor.MethodCode
     @Override
     public void visit(ConstructorDeclaration constructor, List<MethodExtractor.MethodCodeFragment> matchingMethodsCode) {
         String name = constructor.getName().asString();
-        List<Parameter> parameters = constructor.getParameters();
+        // copy, since we add parameters below and several retrievers may visit the same compilation unit
+        List<Parameter> parameters = new ArrayList<>(constructor.getParameters());
 
         int typeNestingDepth = currentEnclosingType.size();
         do {
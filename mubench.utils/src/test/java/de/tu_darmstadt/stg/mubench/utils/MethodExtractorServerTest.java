@@ -0,0 +1,77 @@
+package de.tu_darmstadt.stg.mubench.utils;
+
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertTrue;
+
+import java.io.*;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+
+import org.junit.Test;
+
+public class MethodExtractorServerTest {
+
+	@Test
+	public void answersRequests() throws Exception {
+		File file = createFile("class C {\n"
+				+ "  void m() {\n"
+				+ "  }\n"
+				+ "}");
+
+		String output = serve(file + "\tm()\n" + file + "\tn()\n");
+
+		assertEquals("READY\n"
+				+ "OK 2\n"
+				+ "2:C:  void m() {\n"
+				+ "  }\n"
+				+ "END\n"
+				+ "OK 0\n"
+				+ "END\n", output);
+	}
+
+	@Test
+	public void answersRequestForSeveralMethods() throws Exception {
+		File file = createFile("class C {\n"
+				+ "  void m() {}\n"
+				+ "  void n() {}\n"
+				+ "}");
+
+		String output = serve(file + "\tn()\tm()\n");
+
+		assertEquals("READY\n"
+				+ "OK 1\n"
+				+ "3:C:  void n() {}\n"
+				+ "OK 1\n"
+				+ "2:C:  void m() {}\n"
+				+ "END\n", output);
+	}
+
+	@Test
+	public void reportsErrors() throws Exception {
+		String output = serve("/-unknown-file-\tm()\n");
+
+		assertTrue(output.startsWith("READY\nERROR "));
+		assertTrue(output.endsWith("\nEND\n"));
+	}
+
+	@Test
+	public void reportsInvalidRequests() throws Exception {
+		String output = serve("-request-\n");
+
+		assertEquals("READY\nERROR invalid request: -request-\nEND\n", output);
+	}
+
+	private String serve(String requests) throws Exception {
+		BufferedReader in = new BufferedReader(new StringReader(requests));
+		ByteArrayOutputStream out = new ByteArrayOutputStream();
+		new MethodExtractorServer().serve(in, new PrintStream(out, true, "UTF-8"));
+		return new String(out.toByteArray(), StandardCharsets.UTF_8);
+	}
+
+	private File createFile(String code) throws IOException {
+		File file = File.createTempFile("MethodExtractorServerTest", ".java");
+		file.deleteOnExit();
+		Files.write(file.toPath(), code.getBytes(StandardCharsets.UTF_8));
+		return file;
+	}
+}